@@ -0,0 +1,102 @@
+# BER decoding of messages read off asyncio streams (Python 3.6+)
+import asyncio
+from pyasn1.codec.ber import decoder
+from pyasn1 import error
+
+async def _readExactly(reader, size):
+    try:
+        return await reader.readexactly(size)
+    except asyncio.IncompleteReadError as exc:
+        raise error.SubstrateUnderrunError(
+            'Stream ends %d octets short' % (size - len(exc.partial))
+            )
+
+async def _readHeader(reader):
+    # tag and length octets, empty if stream ends before them
+    header = await reader.read(1)
+    if not header:
+        return header
+    if header[0] & 0x1F == 0x1F:  # long tag
+        while 1:
+            header = header + await _readExactly(reader, 1)
+            if not header[-1] & 0x80:
+                break
+    header = header + await _readExactly(reader, 1)
+    if header[-1] > 0x80:  # long length
+        header = header + await _readExactly(reader, header[-1] & 0x7F)
+    return header
+
+async def readItem(reader, decodeFun=decoder.decode):
+    """Return octets of the next TLV read off asyncio StreamReader
+
+    Just header octets are read first, then as many octets as length
+    octets say or, for indefinite length encoding, nested TLVs up to
+    end-of-octets. Returns empty octets if stream ends before the TLV.
+    Headers are checked against maxLength and maxDepth limits of
+    decodeFun before contents octets are read.
+    """
+    maxLength = getattr(decodeFun, 'maxLength', None)
+    maxDepth = getattr(decodeFun, 'maxDepth', None)
+    substrate = []
+    # number of indefinite length values open
+    depth = 0
+    while 1:
+        header = await _readHeader(reader)
+        if not header:
+            if depth:
+                raise error.SubstrateUnderrunError(
+                    'No EOO seen before stream ends'
+                    )
+            return header
+        substrate.append(header)
+        t, length, size = decoder.decodeHeader(header)
+        if depth and decoder._isEndOfOctets(t, length):
+            depth = depth - 1
+        elif length == -1:
+            if maxDepth is not None and depth >= maxDepth:
+                raise error.LimitExceededError(
+                    'Values nested over %d-deep limit at %s' % (maxDepth, t)
+                    )
+            depth = depth + 1
+        else:
+            if maxLength is not None and length > maxLength:
+                raise error.LimitExceededError(
+                    '%d-octet value exceeds %d-octet limit at %s' %
+                    (length, maxLength, t)
+                    )
+            substrate.append(await _readExactly(reader, length))
+        if not depth:
+            return b''.join(substrate)
+
+async def readMessages(reader, asn1Spec=None, decodeFun=decoder.decode):
+    """Yield values decoded of TLVs read one by one off asyncio StreamReader
+
+    Each TLV is read in full before it is decoded (see readItem()) and
+    the next one is not read till the consumer asks for it, so a slow
+    consumer holds the peer back through StreamReader flow control.
+    Limits of decodeFun apply to headers as they are read.
+    Stops at the end of stream, raises SubstrateUnderrunError if stream
+    ends amid a TLV.
+    """
+    while 1:
+        substrate = await readItem(reader, decodeFun)
+        if not substrate:
+            return
+        value, rest = decodeFun(substrate, asn1Spec=asn1Spec)
+        yield value
+
+async def decodeInSlices(substrate, asn1Spec=None, decodeFun=decoder.decode,
+                         itemsPerStep=1000, timePerStep=None):
+    """Decode substrate in slices, giving way to other tasks in between
+
+    Runs DecodeJob steps of up to itemsPerStep TLVs or timePerStep
+    seconds, so that a large value does not hold the event loop for
+    the whole decoding time. Returns decoded value and remaining
+    substrate.
+    """
+    job = decoder.DecodeJob(
+        substrate, asn1Spec, decodeFun, itemsPerStep, timePerStep
+        )
+    while not job.step():
+        await asyncio.sleep(0)
+    return job.getResult()
@@ -1,18 +1,111 @@
 # BER decoder
 from pyasn1.type import tag, univ, char, useful, tagmap
 from pyasn1.codec.ber import eoo
-from pyasn1.compat.octets import oct2int, isOctetsType
+from pyasn1.compat.octets import oct2int, isOctetsType, isBufferType, \
+     buf2octs, memoryview, null
+from pyasn1.compat.integer import from_bytes
 from pyasn1 import debug, error
+from array import array
+from time import time
+import copy
+
+class Frame:
+    """Value being decoded out of its components
+
+    Holds value built so far, substrate of the next component (None
+    once value is complete) and substrate following the value (None
+    till end-of-octets of indefinite length value is seen).
+    """
+    # number of components set so far
+    count = 0
+    # segments of constructed string value, joined once it is complete
+    segments = None
+    size = 0
+    maxLength = None
+    def __init__(self, value, substrate, length=None):
+        self.value = value
+        self.idx = 0
+        if length is None:  # value complete
+            self.substrate, self.tail = None, substrate
+        elif length == -1:
+            self.substrate, self.tail = substrate, None
+        else:
+            self.substrate, self.tail = substrate[:length], substrate[length:]
 
 class AbstractDecoder:
     protoComponent = None
+    # Decoders of values built of other values implement startFrame()
+    # along with nextComponent(), setComponent() and endFrame() methods,
+    # what lets Decoder handle nested values on explicit stack
+    startFrame = None
     def valueDecoder(self, fullSubstrate, substrate, asn1Spec, tagSet,
                      length, state, decodeFun, substrateFun):
-        raise error.PyAsn1Error('Decoder not implemented for %s' % (tagSet,))
+        if self.startFrame is None:
+            raise error.PyAsn1Error('Decoder not implemented for %s' % (tagSet,))
+        frame = self.startFrame(
+            fullSubstrate, substrate, asn1Spec, tagSet, length, state,
+            decodeFun, substrateFun
+            )
+        while 1:
+            request = self.nextComponent(frame)
+            if request is None:
+                return self.endFrame(frame)
+            substrate, asn1Spec, tagSet, length, state, allowEoo = request
+            component, substrate = decodeFun(
+                substrate, asn1Spec, tagSet, length, state, allowEoo=allowEoo
+                )
+            self.setComponent(frame, component, substrate)
 
     def indefLenValueDecoder(self, fullSubstrate, substrate, asn1Spec, tagSet,
                              length, state, decodeFun, substrateFun):
-        raise error.PyAsn1Error('Indefinite length mode decoder not implemented for %s' % (tagSet,))
+        if self.startFrame is None:
+            raise error.PyAsn1Error('Indefinite length mode decoder not implemented for %s' % (tagSet,))
+        return self.valueDecoder(
+            fullSubstrate, substrate, asn1Spec, tagSet, length, state,
+            decodeFun, substrateFun
+            )
+
+    # Default frame handling collects components till definite length
+    # contents are exhausted or till end-of-octets is seen
+
+    def nextComponent(self, frame):
+        """Return decoder arguments for next component or None if done"""
+        if frame.substrate:
+            frame.asn1Spec = self._getComponentTagMap(frame.value, frame.idx)
+            return frame.substrate, frame.asn1Spec, None, None, \
+                   stDecodeTag, frame.tail is None
+        if frame.substrate is None:
+            return
+        if frame.tail is None:
+            raise error.SubstrateUnderrunError(
+                'No EOO seen before substrate ends'
+                )
+        self._completeValue(frame.value)
+        frame.substrate = None
+
+    def setComponent(self, frame, component, substrate):
+        if frame.tail is None and \
+               eoo.endOfOctets.isSameTypeWith(component) and \
+               component == eoo.endOfOctets:
+            self._completeValue(frame.value)
+            frame.substrate, frame.tail = None, substrate
+        else:
+            frame.value, frame.idx = self._addComponent(
+                frame.value, frame.idx, component, frame.asn1Spec
+                )
+            frame.substrate = substrate
+
+    def endFrame(self, frame):
+        """Return decoded value and substrate past it"""
+        return frame.value, frame.tail
+
+    def _getComponentTagMap(self, r, idx):
+        return self.protoComponent
+
+    def _addComponent(self, r, idx, component, asn1Spec):
+        return r + component, idx + 1
+
+    def _completeValue(self, r): pass
 
 class AbstractSimpleDecoder(AbstractDecoder):
     tagFormats = (tag.tagFormatSimple,)
@@ -25,7 +118,65 @@ class AbstractSimpleDecoder(AbstractDecoder):
             return asn1Spec
         else:
             return asn1Spec.clone(value)
-        
+
+    # Primitive value decoders implementing _decodeContents() can
+    # build Python objects instead of ASN.1 ones (see DecodePlan)
+    _decodeContents = None
+    def nativeValueDecoder(self, substrate, length, decodeFun):
+        """Return primitive value as Python object and substrate past it"""
+        head, tail = substrate[:length], substrate[length:]
+        return self._toNative(self._decodeContents(head, decodeFun)), tail
+
+    def _toNative(self, value): return value
+
+    # Constructed string values are collected segment by segment and
+    # joined once complete, what keeps reassembly linear
+
+    # string values length is measured in these units of octet
+    lengthUnit = 1
+    def _createSegmentsFrame(self, r, substrate, length, decodeFun):
+        frame = Frame(r, substrate, length)
+        frame.segments = []
+        frame.maxLength = getattr(decodeFun, 'maxLength', None)
+        return frame
+
+    def setComponent(self, frame, component, substrate):
+        if frame.tail is None and \
+               eoo.endOfOctets.isSameTypeWith(component) and \
+               component == eoo.endOfOctets:
+            AbstractDecoder.setComponent(self, frame, component, substrate)
+            return
+        frame.size = frame.size + len(component)
+        if frame.maxLength is not None and \
+               frame.size > frame.maxLength * self.lengthUnit:
+            raise error.LimitExceededError(
+                'Segments of %s exceed %d-octet limit' % (
+                    frame.value.__class__.__name__, frame.maxLength
+                    )
+                )
+        frame.segments.append(component)
+        frame.substrate = substrate
+
+    def endFrame(self, frame):
+        if frame.segments is not None:
+            frame.value = self._joinSegments(frame.value, frame.segments)
+            frame.segments = None
+        return frame.value, frame.tail
+
+    def _joinSegments(self, r, segments):
+        return r.clone(
+            null.join([r.asOctets()] + [ x.asOctets() for x in segments ])
+            )
+
+    def _getOctets(self, substrate, decodeFun):
+        # large values may stay as views over (e.g. mmap-ed) substrate
+        threshold = getattr(decodeFun, 'viewThreshold', None)
+        if threshold is not None and isBufferType(substrate) and \
+               len(substrate) >= threshold:
+            return substrate
+        else:
+            return buf2octs(substrate)
+
 class AbstractConstructedDecoder(AbstractDecoder):
     tagFormats = (tag.tagFormatConstructed,)
     def _createComponent(self, asn1Spec, tagSet, value=None):
@@ -35,35 +186,69 @@ class AbstractConstructedDecoder(AbstractDecoder):
             return self.protoComponent.clone(tagSet)
         else:
             return asn1Spec.clone()
+
+    def _getComponentsBounds(self, substrate, length, maxComponents=None):
+        # (start, end) offsets of components within contents octets
+        bounds = []
+        offset = 0
+        if length == -1:
+            while 1:
+                try:
+                    t, l, size = decodeHeader(substrate, offset)
+                except error.SubstrateUnderrunError:
+                    raise error.SubstrateUnderrunError(
+                        'No EOO seen before substrate ends'
+                        )
+                if _isEndOfOctets(t, l):
+                    return substrate[:offset], bounds, substrate[offset+size:]
+                _checkComponentsCount(len(bounds), maxComponents)
+                end = skipItem(substrate, offset)
+                bounds.append((offset, end))
+                offset = end
+        else:
+            head, tail = substrate[:length], substrate[length:]
+            while offset < length:
+                _checkComponentsCount(len(bounds), maxComponents)
+                end = skipItem(head, offset)
+                bounds.append((offset, end))
+                offset = end
+            return head, bounds, tail
                                 
 class ExplicitTagDecoder(AbstractSimpleDecoder):
     protoComponent = univ.Any('')
     tagFormats = (tag.tagFormatConstructed,)
-    def valueDecoder(self, fullSubstrate, substrate, asn1Spec, tagSet,
-                     length, state, decodeFun, substrateFun):
+    def startFrame(self, fullSubstrate, substrate, asn1Spec, tagSet,
+                   length, state, decodeFun, substrateFun):
         if substrateFun:
-            return substrateFun(
+            value, substrate = substrateFun(
                        self._createComponent(asn1Spec, tagSet, ''),
                        substrate, length
                    )
-        head, tail = substrate[:length], substrate[length:]
-        value, _ = decodeFun(head, asn1Spec, tagSet, length)
-        return value, tail
+            return Frame(value, substrate)
+        frame = Frame(None, substrate, length)
+        frame.asn1Spec, frame.tagSet = asn1Spec, tagSet
+        return frame
 
-    def indefLenValueDecoder(self, fullSubstrate, substrate, asn1Spec, tagSet,
-                             length, state, decodeFun, substrateFun):
-        if substrateFun:
-            return substrateFun(
-                       self._createComponent(asn1Spec, tagSet, ''),
-                       substrate, length
-                   )
-        value, substrate = decodeFun(substrate, asn1Spec, tagSet, length)
-        terminator, substrate = decodeFun(substrate, allowEoo=True)
-        if eoo.endOfOctets.isSameTypeWith(terminator) and \
-                terminator == eoo.endOfOctets:
-            return value, substrate
+    def nextComponent(self, frame):
+        if frame.substrate is None:
+            return
+        if frame.idx:
+            return frame.substrate, None, None, None, stDecodeTag, True
+        # inner tags complete the tag set of the value
+        return frame.substrate, frame.asn1Spec, frame.tagSet, None, \
+               stDecodeTag, False
+
+    def setComponent(self, frame, component, substrate):
+        if frame.idx:
+            if not eoo.endOfOctets.isSameTypeWith(component) or \
+                   component != eoo.endOfOctets:
+                raise error.PyAsn1Error('Missing end-of-octets terminator')
+            frame.substrate, frame.tail = None, substrate
+        elif frame.tail is None:
+            frame.value, frame.substrate = component, substrate
+            frame.idx = 1
         else:
-            raise error.PyAsn1Error('Missing end-of-octets terminator')
+            frame.value, frame.substrate = component, None
 
 explicitTagDecoder = ExplicitTagDecoder()
 
@@ -90,108 +275,106 @@ class IntegerDecoder(AbstractSimpleDecoder):
     def valueDecoder(self, fullSubstrate, substrate, asn1Spec, tagSet, length,
                      state, decodeFun, substrateFun):
         head, tail = substrate[:length], substrate[length:]
+        return self._createComponent(
+            asn1Spec, tagSet, self._decodeContents(head, decodeFun)
+            ), tail
+
+    def _decodeContents(self, head, decodeFun):
         if not head:
-            return self._createComponent(asn1Spec, tagSet, 0), tail
-        if head in self.precomputedValues:
-            value = self.precomputedValues[head]
+            return 0
+        if isOctetsType(head) and head in self.precomputedValues:
+            return self.precomputedValues[head]
+        firstOctet = oct2int(head[0])
+        if firstOctet & 0x80:
+            value = -1
         else:
-            firstOctet = oct2int(head[0])
-            if firstOctet & 0x80:
-                value = -1
-            else:
-                value = 0
-            for octet in head:
-                value = value << 8 | oct2int(octet)
-        return self._createComponent(asn1Spec, tagSet, value), tail
+            value = 0
+        for octet in head:
+            value = value << 8 | oct2int(octet)
+        return value
 
 class BooleanDecoder(IntegerDecoder):
     protoComponent = univ.Boolean(0)
     def _createComponent(self, asn1Spec, tagSet, value=None):
         return IntegerDecoder._createComponent(self, asn1Spec, tagSet, value and 1 or 0)
 
+    def _toNative(self, value): return bool(value)
+
 class BitStringDecoder(AbstractSimpleDecoder):
     protoComponent = univ.BitString(())
     tagFormats = (tag.tagFormatSimple, tag.tagFormatConstructed)
-    def valueDecoder(self, fullSubstrate, substrate, asn1Spec, tagSet, length,
-                     state, decodeFun, substrateFun):
+    def startFrame(self, fullSubstrate, substrate, asn1Spec, tagSet, length,
+                   state, decodeFun, substrateFun):
+        if length == -1:
+            r = self._createComponent(asn1Spec, tagSet, '')
+            if substrateFun:
+                return Frame(*substrateFun(r, substrate, length))
+            return self._createSegmentsFrame(r, substrate, length, decodeFun)
         head, tail = substrate[:length], substrate[length:]
         if tagSet[0][1] == tag.tagFormatSimple:    # XXX what tag to check?
-            if not head:
-                raise error.PyAsn1Error('Empty substrate')
-            trailingBits = oct2int(head[0])
-            if trailingBits > 7:
-                raise error.PyAsn1Error(
-                    'Trailing bits overflow %s' % trailingBits
-                    )
-            head = head[1:]
-            lsb = p = 0; l = len(head)-1; b = []
-            while p <= l:
-                if p == l:
-                    lsb = trailingBits
-                j = 7                    
-                o = oct2int(head[p])
-                while j >= lsb:
-                    b.append((o>>j)&0x01)
-                    j = j - 1
-                p = p + 1
-            return self._createComponent(asn1Spec, tagSet, b), tail
+            return Frame(
+                self._createComponent(
+                    asn1Spec, tagSet, self._decodeContents(head, decodeFun)
+                    ), tail
+                )
         r = self._createComponent(asn1Spec, tagSet, ())
         if substrateFun:
-            return substrateFun(r, substrate, length)
-        while head:
-            component, head = decodeFun(head, self.protoComponent)
-            r = r + component
-        return r, tail
+            return Frame(*substrateFun(r, substrate, length))
+        return self._createSegmentsFrame(r, substrate, length, decodeFun)
 
-    def indefLenValueDecoder(self, fullSubstrate, substrate, asn1Spec, tagSet,
-                             length, state, decodeFun, substrateFun):
-        r = self._createComponent(asn1Spec, tagSet, '')
-        if substrateFun:
-            return substrateFun(r, substrate, length)
-        while substrate:
-            component, substrate = decodeFun(substrate, self.protoComponent, allowEoo=True)
-            if eoo.endOfOctets.isSameTypeWith(component) and \
-                    component == eoo.endOfOctets:
-                break
-            r = r + component
-        else:
-            raise error.SubstrateUnderrunError(
-                'No EOO seen before substrate ends'
+    def _decodeContents(self, head, decodeFun):
+        if not head:
+            raise error.PyAsn1Error('Empty substrate')
+        trailingBits = oct2int(head[0])
+        if trailingBits > 7:
+            raise error.PyAsn1Error(
+                'Trailing bits overflow %s' % trailingBits
                 )
-        return r, substrate
+        head = buf2octs(head[1:])
+        if not head:
+            return univ.PackedBits()
+        return univ.PackedBits(
+            from_bytes(head) >> trailingBits, len(head) * 8 - trailingBits
+            )
+
+    def _toNative(self, value): return tuple(value)
+
+    lengthUnit = 8
+    def _joinSegments(self, r, segments):
+        for segment in segments[:-1]:
+            if len(segment) % 8:  # misaligned, join as bit sequences
+                for x in segments:
+                    r = r + x
+                return r
+        segments = [r] + segments
+        # whole octets but in the last segment
+        length = 0
+        for segment in segments:
+            length = length + len(segment)
+        return r.clone(
+            univ.PackedBits(
+                from_bytes(null.join([ x.asOctets() for x in segments ])) \
+                    >> (-length % 8), length
+                )
+            )
 
 class OctetStringDecoder(AbstractSimpleDecoder):
     protoComponent = univ.OctetString('')
     tagFormats = (tag.tagFormatSimple, tag.tagFormatConstructed)
-    def valueDecoder(self, fullSubstrate, substrate, asn1Spec, tagSet, length,
-                     state, decodeFun, substrateFun):
-        head, tail = substrate[:length], substrate[length:]
-        if tagSet[0][1] == tag.tagFormatSimple:    # XXX what tag to check?
-            return self._createComponent(asn1Spec, tagSet, head), tail
+    def startFrame(self, fullSubstrate, substrate, asn1Spec, tagSet, length,
+                   state, decodeFun, substrateFun):
+        if length != -1 and tagSet[0][1] == tag.tagFormatSimple:    # XXX what tag to check?
+            return Frame(
+                self._createComponent(
+                    asn1Spec, tagSet, self._getOctets(substrate[:length], decodeFun)
+                    ), substrate[length:]
+                )
         r = self._createComponent(asn1Spec, tagSet, '')
         if substrateFun:
-            return substrateFun(r, substrate, length)
-        while head:
-            component, head = decodeFun(head, self.protoComponent)
-            r = r + component
-        return r, tail
+            return Frame(*substrateFun(r, substrate, length))
+        return self._createSegmentsFrame(r, substrate, length, decodeFun)
 
-    def indefLenValueDecoder(self, fullSubstrate, substrate, asn1Spec, tagSet,
-                             length, state, decodeFun, substrateFun):
-        r = self._createComponent(asn1Spec, tagSet, '')
-        if substrateFun:
-            return substrateFun(r, substrate, length)
-        while substrate:
-            component, substrate = decodeFun(substrate, self.protoComponent, allowEoo=True)
-            if eoo.endOfOctets.isSameTypeWith(component) and \
-                    component == eoo.endOfOctets:
-                break
-            r = r + component
-        else:
-            raise error.SubstrateUnderrunError(
-                'No EOO seen before substrate ends'
-                )
-        return r, substrate
+    def _decodeContents(self, head, decodeFun): return buf2octs(head)
 
 class NullDecoder(AbstractSimpleDecoder):
     protoComponent = univ.Null('')
@@ -199,22 +382,36 @@ class NullDecoder(AbstractSimpleDecoder):
                      length, state, decodeFun, substrateFun):
         head, tail = substrate[:length], substrate[length:]
         r = self._createComponent(asn1Spec, tagSet)
-        if head:
-            raise error.PyAsn1Error('Unexpected %d-octet substrate for Null' % length)
+        self._decodeContents(head, decodeFun)
         return r, tail
 
+    def _decodeContents(self, head, decodeFun):
+        if head:
+            raise error.PyAsn1Error('Unexpected %d-octet substrate for Null' % len(head))
+
 class ObjectIdentifierDecoder(AbstractSimpleDecoder):
     protoComponent = univ.ObjectIdentifier(())
     def valueDecoder(self, fullSubstrate, substrate, asn1Spec, tagSet, length,
                      state, decodeFun, substrateFun):
         head, tail = substrate[:length], substrate[length:]
+        return self._createComponent(
+            asn1Spec, tagSet, self._decodeContents(head, decodeFun)
+            ), tail
+
+    def _decodeContents(self, head, decodeFun):
         if not head:
             raise error.PyAsn1Error('Empty substrate')
 
+        maxArcs = getattr(decodeFun, 'maxOidArcs', None)
         oid = ()
         index = 0
         substrateLen = len(head)
         while index < substrateLen:
+            # first sub-OID makes up two arcs
+            if maxArcs is not None and len(oid) + 2 > maxArcs:
+                raise error.LimitExceededError(
+                    'OID exceeds %d-arc limit' % maxArcs
+                    )
             subId = oct2int(head[index])
             index += 1
             if subId < 128:
@@ -249,15 +446,25 @@ class ObjectIdentifierDecoder(AbstractSimpleDecoder):
         else:
             raise error.PyAsn1Error('Malformed first OID octet: %s' % head[0])
 
-        return self._createComponent(asn1Spec, tagSet, oid), tail
+        return oid
 
 class RealDecoder(AbstractSimpleDecoder):
     protoComponent = univ.Real()
     def valueDecoder(self, fullSubstrate, substrate, asn1Spec, tagSet,
                      length, state, decodeFun, substrateFun):
         head, tail = substrate[:length], substrate[length:]
+        return self._createComponent(
+            asn1Spec, tagSet, self._decodeContents(head, decodeFun)
+            ), tail
+
+    def _toNative(self, value):
+        if isinstance(value, tuple):
+            return float(value[0] * pow(value[1], value[2]))
+        return float(value)
+
+    def _decodeContents(self, head, decodeFun):
         if not head:
-            return self._createComponent(asn1Spec, tagSet, 0.0), tail
+            return 0.0
         fo = oct2int(head[0]); head = head[1:]
         if fo & 0xc0 == 0x80:  # binary enoding
             if not head:
@@ -296,6 +503,7 @@ class RealDecoder(AbstractSimpleDecoder):
         elif fo & 0xc0 == 0:  # character encoding
             if not head:
                 raise error.PyAsn1Error("Incomplete floating-point value")
+            head = buf2octs(head)
             try:
                 if fo & 0x3 == 0x1:  # NR1
                     value = (int(head), 10, 0)
@@ -315,7 +523,7 @@ class RealDecoder(AbstractSimpleDecoder):
             raise error.SubstrateUnderrunError(
                 'Unknown encoding (tag %s)' % fo
                 )
-        return self._createComponent(asn1Spec, tagSet, value), tail
+        return value
         
 class SequenceDecoder(AbstractConstructedDecoder):
     protoComponent = univ.Sequence()
@@ -327,88 +535,194 @@ class SequenceDecoder(AbstractConstructedDecoder):
 
     def _getComponentPositionByType(self, r, t, idx):
         return r.getComponentPositionNearType(t, idx)
-    
-    def valueDecoder(self, fullSubstrate, substrate, asn1Spec, tagSet,
-                     length, state, decodeFun, substrateFun):
-        head, tail = substrate[:length], substrate[length:]
-        r = self._createComponent(asn1Spec, tagSet)
+
+    def _getComponentTagSet(self, substrate, offset, tagMap):
+        # effective tag set of encoded component, learnt from its
+        # headers (possibly nested by explicit tagging) alone
+        tagSet = None
+        while 1:
+            t, length, size = decodeHeader(substrate, offset)
+            if tagSet is None:
+                tagSet = tag.TagSet((), t)
+            else:
+                tagSet = t + tagSet
+            if tagSet in tagMap:
+                chosenSpec = tagMap[tagSet]
+                if chosenSpec.getTagSet() or \
+                       isinstance(chosenSpec, univ.Choice):
+                    return tagSet
+                else:  # untagged ANY
+                    return chosenSpec.getTagSet()
+            if t[1] != tag.tagFormatConstructed or \
+                   t[0] == tag.tagClassUniversal:
+                raise error.PyAsn1Error(
+                    '%s not in asn1Spec: %s' % (tagSet, tagMap)
+                    )
+            offset = offset + size
+
+    def _decodeLazily(self, r, substrate, length, decodeFun):
+        head, bounds, tail = self._getComponentsBounds(
+            substrate, length, getattr(decodeFun, 'maxComponents', None)
+            )
+        components = []
         idx = 0
-        if substrateFun:
-            return substrateFun(r, substrate, length)
-        while head:
+        for start, end in bounds:
             asn1Spec = self._getComponentTagMap(r, idx)
-            component, head = decodeFun(head, asn1Spec)
-            idx = self._getComponentPositionByType(
-                r, component.getEffectiveTagSet(), idx
-                )
-            r.setComponentByPosition(idx, component, asn1Spec is None)
+            if asn1Spec is None:
+                t = None
+            else:
+                t = self._getComponentTagSet(head, start, asn1Spec)
+            idx = self._getComponentPositionByType(r, t, idx)
+            if idx >= len(components):
+                components.extend((idx-len(components)+1)*[None])
+            components[idx] = (start, end)
             idx = idx + 1
-        r.setDefaultComponents()
+        namedTypes = r.getComponentType()
+        if namedTypes:
+            idx = len(namedTypes)
+            while idx:
+                idx = idx - 1
+                if idx < len(components) and components[idx] is not None:
+                    continue
+                if namedTypes[idx].isDefaulted:
+                    if idx >= len(components):
+                        components.extend((idx-len(components)+1)*[None])
+                    components[idx] = namedTypes.getTypeByPosition(idx).clone()
+                elif not namedTypes[idx].isOptional:
+                    raise error.PyAsn1Error(
+                        'Uninitialized component #%s at %r' % (idx, r)
+                        )
+        r.setLazyComponents(head, components, decodeFun)
         r.verifySizeSpec()
         return r, tail
-
-    def indefLenValueDecoder(self, fullSubstrate, substrate, asn1Spec, tagSet,
-                             length, state, decodeFun, substrateFun):
+    
+    def startFrame(self, fullSubstrate, substrate, asn1Spec, tagSet,
+                   length, state, decodeFun, substrateFun):
         r = self._createComponent(asn1Spec, tagSet)
         if substrateFun:
-            return substrateFun(r, substrate, length)
-        idx = 0
-        while substrate:
-            asn1Spec = self._getComponentTagMap(r, idx)
-            component, substrate = decodeFun(substrate, asn1Spec, allowEoo=True)
-            if eoo.endOfOctets.isSameTypeWith(component) and \
-                    component == eoo.endOfOctets:
-                break
-            idx = self._getComponentPositionByType(
-                r, component.getEffectiveTagSet(), idx
-                )            
-            r.setComponentByPosition(idx, component, asn1Spec is None)
-            idx = idx + 1                
-        else:
-            raise error.SubstrateUnderrunError(
-                'No EOO seen before substrate ends'
-                )
+            return Frame(*substrateFun(r, substrate, length))
+        if getattr(decodeFun, 'lazy', False):
+            return Frame(*self._decodeLazily(r, substrate, length, decodeFun))
+        return Frame(r, substrate, length)
+
+    def _addComponent(self, r, idx, component, asn1Spec):
+        idx = self._getComponentPositionByType(
+            r, component.getEffectiveTagSet(), idx
+            )
+        r.setComponentByPosition(idx, component, asn1Spec is None)
+        return r, idx + 1
+
+    def _completeValue(self, r):
         r.setDefaultComponents()
         r.verifySizeSpec()
-        return r, substrate
+
+class DeferredComponents:
+    """Components of encoded SEQUENCE OF or SET OF, decoded on iteration
+
+    Each iteration decodes components one by one out of contents
+    octets (which are referred to, not copied), so that no more than
+    one component is held in memory at a time.
+    """
+    def __init__(self, substrate, asn1Spec, decodeFun):
+        self.__substrate = substrate
+        self.__asn1Spec = asn1Spec
+        self.__decodeFun = decodeFun
+
+    def __iter__(self):
+        offset = 0
+        while offset < len(self.__substrate):
+            component, offset = self.__decodeFun.decodeAt(
+                self.__substrate, offset, self.__asn1Spec
+                )
+            yield component
 
 class SequenceOfDecoder(AbstractConstructedDecoder):
     protoComponent = univ.SequenceOf()    
-    def valueDecoder(self, fullSubstrate, substrate, asn1Spec, tagSet,
-                     length, state, decodeFun, substrateFun):
-        head, tail = substrate[:length], substrate[length:]
-        r = self._createComponent(asn1Spec, tagSet)
-        if substrateFun:
-            return substrateFun(r, substrate, length)
-        asn1Spec = r.getComponentType()
-        idx = 0
-        while head:
-            component, head = decodeFun(head, asn1Spec)
-            r.setComponentByPosition(idx, component, asn1Spec is None)
-            idx = idx + 1
+    def _decodeLazily(self, r, substrate, length, decodeFun):
+        head, bounds, tail = self._getComponentsBounds(
+            substrate, length, getattr(decodeFun, 'maxComponents', None)
+            )
+        r.setLazyComponents(head, bounds, decodeFun)
         r.verifySizeSpec()
         return r, tail
 
-    def indefLenValueDecoder(self, fullSubstrate, substrate, asn1Spec, tagSet,
-                             length, state, decodeFun, substrateFun):
+    def _decodeDeferred(self, r, substrate, length, decodeFun):
+        maxComponents = getattr(decodeFun, 'maxComponents', None)
+        count = 0
+        if length == -1:
+            offset = 0
+            while 1:
+                try:
+                    t, l, size = decodeHeader(substrate, offset)
+                except error.SubstrateUnderrunError:
+                    raise error.SubstrateUnderrunError(
+                        'No EOO seen before substrate ends'
+                        )
+                if _isEndOfOctets(t, l):
+                    head, tail = substrate[:offset], substrate[offset+size:]
+                    break
+                _checkComponentsCount(count, maxComponents)
+                count = count + 1
+                offset = skipItem(substrate, offset)
+        else:
+            head, tail = substrate[:length], substrate[length:]
+            if maxComponents is not None:
+                offset = 0
+                while offset < length:
+                    _checkComponentsCount(count, maxComponents)
+                    count = count + 1
+                    offset = skipItem(head, offset)
+        r.setComponentSource(
+            DeferredComponents(head, r.getComponentType(), decodeFun)
+            )
+        return r, tail
+
+    def startFrame(self, fullSubstrate, substrate, asn1Spec, tagSet,
+                   length, state, decodeFun, substrateFun):
         r = self._createComponent(asn1Spec, tagSet)
         if substrateFun:
-            return substrateFun(r, substrate, length)
-        asn1Spec = r.getComponentType()
-        idx = 0
-        while substrate:
-            component, substrate = decodeFun(substrate, asn1Spec, allowEoo=True)
-            if eoo.endOfOctets.isSameTypeWith(component) and \
-                    component == eoo.endOfOctets:
-                break
-            r.setComponentByPosition(idx, component, asn1Spec is None)
-            idx = idx + 1                
-        else:
-            raise error.SubstrateUnderrunError(
-                'No EOO seen before substrate ends'
+            return Frame(*substrateFun(r, substrate, length))
+        for deferredSpec in getattr(decodeFun, 'deferred', ()):
+            if deferredSpec is asn1Spec:
+                return Frame(
+                    *self._decodeDeferred(r, substrate, length, decodeFun)
+                    )
+        if getattr(decodeFun, 'lazy', False):
+            return Frame(*self._decodeLazily(r, substrate, length, decodeFun))
+        # each component takes at least two octets, so shorter contents
+        # can't make parallelThreshold components and are not scanned.
+        # Headers of fewer components are read again by serial decoding.
+        if getattr(decodeFun, 'workers', None) and \
+               (length == -1 or length >= 2 * decodeFun.parallelThreshold):
+            head, bounds, tail = self._getComponentsBounds(
+                substrate, length, getattr(decodeFun, 'maxComponents', None)
                 )
+            if len(bounds) >= decodeFun.parallelThreshold:
+                return Frame(
+                    *self._decodeInParallel(r, head, bounds, tail, decodeFun)
+                    )
+        return Frame(r, substrate, length)
+
+    def _decodeInParallel(self, r, substrate, bounds, tail, decodeFun):
+        from pyasn1.codec.ber import parallel
+        components = parallel.decodeComponents(
+            substrate, bounds, r.getComponentType(), decodeFun
+            )
+        verifyConstraints = r.getComponentType() is None
+        for idx in range(len(components)):
+            r.setComponentByPosition(idx, components[idx], verifyConstraints)
+        r.verifySizeSpec()
+        return r, tail
+
+    def _getComponentTagMap(self, r, idx):
+        return r.getComponentType()
+
+    def _addComponent(self, r, idx, component, asn1Spec):
+        r.setComponentByPosition(idx, component, asn1Spec is None)
+        return r, idx + 1
+
+    def _completeValue(self, r):
         r.verifySizeSpec()
-        return r, substrate
 
 class SetDecoder(SequenceDecoder):
     protoComponent = univ.Set()
@@ -428,92 +742,81 @@ class SetOfDecoder(SequenceOfDecoder):
 class ChoiceDecoder(AbstractConstructedDecoder):
     protoComponent = univ.Choice()
     tagFormats = (tag.tagFormatSimple, tag.tagFormatConstructed)
-    def valueDecoder(self, fullSubstrate, substrate, asn1Spec, tagSet,
-                     length, state, decodeFun, substrateFun):
-        head, tail = substrate[:length], substrate[length:]
+    def startFrame(self, fullSubstrate, substrate, asn1Spec, tagSet,
+                   length, state, decodeFun, substrateFun):
         r = self._createComponent(asn1Spec, tagSet)
         if substrateFun:
-            return substrateFun(r, substrate, length)
-        if r.getTagSet() == tagSet: # explicitly tagged Choice
-            component, head = decodeFun(
-                head, r.getComponentTagMap()
-                )
-        else:
-            component, head = decodeFun(
-                head, r.getComponentTagMap(), tagSet, length, state
-                )
-        if isinstance(component, univ.Choice):
-            effectiveTagSet = component.getEffectiveTagSet()
+            return Frame(*substrateFun(r, substrate, length))
+        frame = Frame(r, substrate, length)
+        frame.asn1Spec, frame.tagSet = asn1Spec, tagSet
+        frame.length, frame.state = length, state
+        return frame
+
+    def nextComponent(self, frame):
+        if frame.substrate is None:
+            return
+        if frame.idx:
+            return frame.substrate, None, None, None, stDecodeTag, True
+        if frame.value.getTagSet() == frame.tagSet: # explicitly tagged Choice
+            return frame.substrate, frame.value.getComponentTagMap(), \
+                   None, None, stDecodeTag, False
         else:
-            effectiveTagSet = component.getTagSet()
-        r.setComponentByType(effectiveTagSet, component, 0, asn1Spec is None)
-        return r, tail
+            return frame.substrate, frame.value.getComponentTagMap(), \
+                   frame.tagSet, frame.length, frame.state, False
 
-    def indefLenValueDecoder(self, fullSubstrate, substrate, asn1Spec, tagSet,
-                     length, state, decodeFun, substrateFun):
-        r = self._createComponent(asn1Spec, tagSet)
-        if substrateFun:
-            return substrateFun(r, substrate, length)
-        if r.getTagSet() == tagSet: # explicitly tagged Choice
-            component, substrate = decodeFun(substrate, r.getComponentTagMap())
-            eooMarker, substrate = decodeFun(substrate, allowEoo=True)  # eat up EOO marker
-            if not eoo.endOfOctets.isSameTypeWith(eooMarker) or \
-                    eooMarker != eoo.endOfOctets:
+    def setComponent(self, frame, component, substrate):
+        if frame.idx:
+            if not eoo.endOfOctets.isSameTypeWith(component) or \
+                    component != eoo.endOfOctets:
                 raise error.PyAsn1Error('No EOO seen before substrate ends')
-        else:
-            component, substrate= decodeFun(
-                substrate, r.getComponentTagMap(), tagSet, length, state
-            )
+            frame.substrate, frame.tail = None, substrate
+            return
         if isinstance(component, univ.Choice):
             effectiveTagSet = component.getEffectiveTagSet()
         else:
             effectiveTagSet = component.getTagSet()
-        r.setComponentByType(effectiveTagSet, component, 0, asn1Spec is None)
-        return r, substrate
+        frame.value.setComponentByType(
+            effectiveTagSet, component, 0, frame.asn1Spec is None
+            )
+        if frame.tail is not None:
+            frame.substrate = None
+        elif frame.value.getTagSet() == frame.tagSet:
+            frame.substrate = substrate  # eat up EOO marker
+            frame.idx = 1
+        else:
+            frame.substrate, frame.tail = None, substrate
 
 class AnyDecoder(AbstractSimpleDecoder):
     protoComponent = univ.Any()
     tagFormats = (tag.tagFormatSimple, tag.tagFormatConstructed)
-    def valueDecoder(self, fullSubstrate, substrate, asn1Spec, tagSet,
-                     length, state, decodeFun, substrateFun):
+    def startFrame(self, fullSubstrate, substrate, asn1Spec, tagSet,
+                   length, state, decodeFun, substrateFun):
+        if length == -1:
+            if asn1Spec is not None and tagSet == asn1Spec.getTagSet():
+                # tagged Any type -- consume header substrate
+                header = ''
+            else:
+                # untagged Any, recover header substrate
+                header = buf2octs(fullSubstrate[:-len(substrate)])
+            r = self._createComponent(asn1Spec, tagSet, header)
+            if substrateFun:
+                return Frame(*substrateFun(r, substrate, length))
+            # Any components do not inherit initial tag
+            return self._createSegmentsFrame(r, substrate, length, decodeFun)
         if asn1Spec is None or \
                asn1Spec is not None and tagSet != asn1Spec.getTagSet():
             # untagged Any container, recover inner header substrate
             length = length + len(fullSubstrate) - len(substrate)
             substrate = fullSubstrate
         if substrateFun:
-            return substrateFun(self._createComponent(asn1Spec, tagSet),
-                                substrate, length)
+            return Frame(*substrateFun(self._createComponent(asn1Spec, tagSet),
+                                       substrate, length))
         head, tail = substrate[:length], substrate[length:]
-        return self._createComponent(asn1Spec, tagSet, value=head), tail
-
-    def indefLenValueDecoder(self, fullSubstrate, substrate, asn1Spec, tagSet,
-                             length, state, decodeFun, substrateFun):
-        if asn1Spec is not None and tagSet == asn1Spec.getTagSet():
-            # tagged Any type -- consume header substrate
-            header = ''
-        else:
-            # untagged Any, recover header substrate
-            header = fullSubstrate[:-len(substrate)]
-
-        r = self._createComponent(asn1Spec, tagSet, header)
-
-        # Any components do not inherit initial tag
-        asn1Spec = self.protoComponent
-        
-        if substrateFun:
-            return substrateFun(r, substrate, length)
-        while substrate:
-            component, substrate = decodeFun(substrate, asn1Spec, allowEoo=True)
-            if eoo.endOfOctets.isSameTypeWith(component) and \
-                    component == eoo.endOfOctets:
-                break
-            r = r + component
-        else:
-            raise error.SubstrateUnderrunError(
-                'No EOO seen before substrate ends'
-                )
-        return r, substrate
+        return Frame(
+            self._createComponent(
+                asn1Spec, tagSet, value=self._getOctets(head, decodeFun)
+                ), tail
+            )
 
 # character string types
 class UTF8StringDecoder(OctetStringDecoder):
@@ -595,20 +898,139 @@ class Decoder:
     defaultErrorState = stErrorCondition
 #    defaultErrorState = stDumpRawValue
     defaultRawDecoder = AnyDecoder()
-    def __init__(self, tagMap, typeMap={}):
+    # OctetString-based values of at least this many octets are
+    # returned as views over substrate rather than copied, if set
+    viewThreshold = None
+    # constructed values decode their components on first access
+    lazy = False
+    # SequenceOf and SetOf spec objects (as found in outer spec) whose
+    # components are decoded on iteration over getComponentSource()
+    deferred = ()
+    # SequenceOf and SetOf values of at least parallelThreshold components
+    # are decoded by that many worker processes, if set. Each such value
+    # starts a pool of its own, so process startup cost is paid per value.
+    workers = None
+    parallelThreshold = 10000
+    # Limits on substrate contents, LimitExceededError is raised as
+    # soon as any is exceeded: nesting depth of constructed values,
+    # contents length of a value (or joined segments of constructed
+    # string), number of components of a constructed value and number
+    # of OBJECT IDENTIFIER arcs. None stands for no limit.
+    maxDepth = None
+    maxLength = None
+    maxComponents = None
+    maxOidArcs = None
+    # nesting depth this decoder starts at (see _atDepth())
+    _baseDepth = 0
+    def __init__(self, tagMap, typeMap={}, viewThreshold=None, lazy=None,
+                 deferred=None, workers=None, parallelThreshold=None,
+                 maxDepth=None, maxLength=None, maxComponents=None,
+                 maxOidArcs=None):
         self.__tagMap = tagMap
         self.__typeMap = typeMap
+        if viewThreshold is not None:
+            self.viewThreshold = viewThreshold
+        if lazy is not None:
+            self.lazy = lazy
+        if deferred is not None:
+            self.deferred = tuple(deferred)
+        if workers is not None:
+            self.workers = workers
+        if parallelThreshold is not None:
+            self.parallelThreshold = parallelThreshold
+        if maxDepth is not None:
+            self.maxDepth = maxDepth
+        if maxLength is not None:
+            self.maxLength = maxLength
+        if maxComponents is not None:
+            self.maxComponents = maxComponents
+        if maxOidArcs is not None:
+            self.maxOidArcs = maxOidArcs
         # Tag & TagSet objects caches
         self.__tagCache = {}
         self.__tagSetCache = {}
-        
+        # decoders starting at given nesting depth
+        self.__depthDecoders = {}
+
+    def _atDepth(self, depth):
+        # Decoder sharing this one's setup, but counting nesting depth
+        # from depth on. Value decoders get it in place of this one, so
+        # that components decoded outside of this decoder loop (lazily,
+        # deferred, in workers or recursively) count enclosing values.
+        if depth not in self.__depthDecoders:
+            decodeFun = copy.copy(self)
+            decodeFun._baseDepth = depth
+            self.__depthDecoders[depth] = decodeFun
+        return self.__depthDecoders[depth]
+
     def __call__(self, substrate, asn1Spec=None, tagSet=None,
                  length=None, state=stDecodeTag, recursiveFlag=1,
                  substrateFun=None, allowEoo=False):
+        result = []
+        for _ in self._decodeSteps(substrate, asn1Spec, tagSet, length,
+                                   state, recursiveFlag, substrateFun,
+                                   allowEoo, result):
+            pass
+        return result[0], result[1]
+
+    def _decodeSteps(self, substrate, asn1Spec, tagSet, length, state,
+                     recursiveFlag, substrateFun, allowEoo, result,
+                     pausing=False):
+        # Decoding state machine, puts (value, substrate) into result list
+        # once done. If pausing is set, yields whenever a TLV is decoded
+        # what lets DecodeJob resume decoding later on.
         if debug.logger & debug.flagDecoder:
             debug.logger('decoder called at scope %s with state %d, working with up to %d octets of substrate: %s' % (debug.scope, state, len(substrate), debug.hexdump(substrate)))
+        origSubstrate = substrate
+        if memoryview is not None and recursiveFlag and not substrateFun and \
+               not isBufferType(substrate) and \
+               not isinstance(substrate, univ.OctetString):
+            # slicing a view instead of the octets keeps decoding linear
+            try:
+                substrate = memoryview(substrate)
+            except TypeError:
+                raise error.PyAsn1Error('Bad octet stream type')
+        if isinstance(asn1Spec, DecodePlan):
+            planResult = []
+            for _ in asn1Spec._decodeSteps(substrate, planResult, pausing):
+                yield
+            value, substrate = planResult
+            if isOctetsType(origSubstrate) and isBufferType(substrate):
+                substrate = buf2octs(substrate)
+            result.extend((value, substrate))
+            return
         fullSubstrate = substrate
-        while state != stStop:
+        # (decoder, frame) of values being built of their components
+        stack = []
+        while 1:
+            if state == stStop:
+                if pausing:
+                    yield
+                # value decoded, pass it over to the enclosing value
+                # (if any) and go on with the next component of that
+                while stack:
+                    concreteDecoder, frame = stack[-1]
+                    if value is not None:
+                        if debug.logger and debug.logger & debug.flagDecoder:
+                            debug.scope.pop()
+                        concreteDecoder.setComponent(frame, value, substrate)
+                    request = concreteDecoder.nextComponent(frame)
+                    if request is not None:
+                        # components are counted before being decoded
+                        if self.maxComponents is not None and \
+                               not _isEndOfOctetsAt(request[0]):
+                            _checkComponentsCount(
+                                frame.count, self.maxComponents
+                                )
+                            frame.count = frame.count + 1
+                        break
+                    del stack[-1]
+                    value, substrate = concreteDecoder.endFrame(frame)
+                    debug.logger and debug.logger & debug.flagDecoder and debug.logger('codec %s yields type %s, value:\n%s\n...remaining substrate is: %s' % (concreteDecoder.__class__.__name__, value.__class__.__name__, value.prettyPrint(), substrate and debug.hexdump(substrate) or '<none>'))
+                else:
+                    break
+                substrate, asn1Spec, tagSet, length, state, allowEoo = request
+                fullSubstrate = substrate
             if state == stDecodeTag:
                 # Decode tag
                 if not substrate:
@@ -616,6 +1038,7 @@ class Decoder:
                         'Short octet stream on tag decoding'
                         )
                 if not isOctetsType(substrate) and \
+                   not isBufferType(substrate) and \
                    not isinstance(substrate, univ.OctetString):
                     raise error.PyAsn1Error('Bad octet stream type')
                 
@@ -696,6 +1119,11 @@ class Decoder:
                     for char in lengthString:
                         length = (length << 8) | oct2int(char)
                     size = size + 1
+                if self.maxLength is not None and length > self.maxLength:
+                    raise error.LimitExceededError(
+                        '%d-octet value exceeds %d-octet limit at %s' %
+                        (length, self.maxLength, tagSet)
+                        )
                 substrate = substrate[size:]
                 if length != -1 and len(substrate) < length:
                     raise error.SubstrateUnderrunError(
@@ -808,15 +1236,40 @@ class Decoder:
             if state == stDecodeValue:
                 if recursiveFlag == 0 and not substrateFun: # legacy
                     substrateFun = lambda a,b,c: (a,b[:c])
-                if length == -1:  # indef length
+                if self.maxDepth is None:
+                    decodeFun = self
+                else:
+                    depth = self._baseDepth + len(stack)
+                    if depth >= self.maxDepth and not substrateFun and \
+                           tagSet[0][1] == tag.tagFormatConstructed:
+                        raise error.LimitExceededError(
+                            'Values nested over %d-deep limit at %s' %
+                            (self.maxDepth, tagSet)
+                            )
+                    # components decoded by value decoder are nested deeper
+                    decodeFun = self._atDepth(depth + 1)
+                if concreteDecoder.startFrame is not None and \
+                       not substrateFun:
+                    frame = concreteDecoder.startFrame(
+                        fullSubstrate, substrate, asn1Spec, tagSet,
+                        length, stGetValueDecoder, decodeFun, substrateFun
+                        )
+                    if frame.substrate is not None:
+                        # components are decoded in the loop, not recursively
+                        stack.append((concreteDecoder, frame))
+                        value = None
+                        state = stStop
+                        continue
+                    value, substrate = frame.value, frame.tail
+                elif length == -1:  # indef length
                     value, substrate = concreteDecoder.indefLenValueDecoder(
                         fullSubstrate, substrate, asn1Spec, tagSet, length,
-                        stGetValueDecoder, self, substrateFun
+                        stGetValueDecoder, decodeFun, substrateFun
                         )
                 else:
                     value, substrate = concreteDecoder.valueDecoder(
                         fullSubstrate, substrate, asn1Spec, tagSet, length,
-                        stGetValueDecoder, self, substrateFun
+                        stGetValueDecoder, decodeFun, substrateFun
                         )
                 state = stStop
                 debug.logger and debug.logger & debug.flagDecoder and debug.logger('codec %s yields type %s, value:\n%s\n...remaining substrate is: %s' % (concreteDecoder.__class__.__name__, value.__class__.__name__, value.prettyPrint(), substrate and debug.hexdump(substrate) or '<none>'))
@@ -827,9 +1280,948 @@ class Decoder:
         if debug.logger and debug.logger & debug.flagDecoder:
             debug.scope.pop()
             debug.logger('decoder left scope %s, call completed' % debug.scope)
-        return value, substrate
-            
+        if isOctetsType(origSubstrate) and isBufferType(substrate):
+            substrate = buf2octs(substrate)
+        result.extend((value, substrate))
+
+    def getValueDecoder(self, asn1Spec):
+        """Return value decoder for ASN.1 spec or None if not known"""
+        if asn1Spec.typeId is not None and asn1Spec.typeId in self.__typeMap:
+            return self.__typeMap[asn1Spec.typeId]
+        elif asn1Spec.baseTagSet in self.__tagMap:
+            return self.__tagMap[asn1Spec.baseTagSet]
+
+    def decodeAt(self, substrate, offset=0, asn1Spec=None, allowEoo=False):
+        """Decode one item at offset, return it with the offset past it"""
+        if memoryview is not None and not isBufferType(substrate):
+            try:
+                substrate = memoryview(substrate)
+            except TypeError:
+                raise error.PyAsn1Error('Bad octet stream type')
+        value, rest = self(
+            substrate[offset:], asn1Spec, allowEoo=allowEoo
+            )
+        return value, len(substrate) - len(rest)
+
 decode = Decoder(tagMap, typeMap)
 
-# XXX
-# non-recursive decoding; return position rather than substrate
+class DecodeJob:
+    """Decoding of a value run in slices, for event loops and schedulers
+
+    Each step() call decodes up to itemsPerStep TLVs or keeps decoding
+    for up to timePerStep seconds (whichever comes first, if both are
+    given), then returns so that caller could do other work in between.
+    Decoder state is kept in the job till the next step() call. Given
+    a DecodePlan, the plan yields at its TLVs as well, though values it
+    decodes against ASN.1 spec (rather than natively) are decoded whole.
+    """
+    def __init__(self, substrate, asn1Spec=None, decodeFun=decode,
+                 itemsPerStep=None, timePerStep=None):
+        self.__result = []
+        self.__steps = decodeFun._decodeSteps(
+            substrate, asn1Spec, None, None, stDecodeTag, 1, None, False,
+            self.__result, True
+            )
+        self.__itemsPerStep = itemsPerStep
+        self.__timePerStep = timePerStep
+
+    def step(self):
+        """Decode another slice of TLVs, return True once value is decoded"""
+        items = self.__itemsPerStep
+        if self.__timePerStep is not None:
+            deadline = time() + self.__timePerStep
+        for _ in self.__steps:
+            if items is not None:
+                items = items - 1
+                if items <= 0:
+                    break
+            if self.__timePerStep is not None and time() >= deadline:
+                break
+        return self.isDone()
+
+    def isDone(self): return bool(self.__result)
+
+    def getResult(self):
+        """Return decoded value and remaining substrate"""
+        if not self.__result:
+            raise error.PyAsn1Error('Decoding not completed')
+        return self.__result[0], self.__result[1]
+
+def _checkComponentsCount(count, maxComponents):
+    # called before another component is taken
+    if maxComponents is not None and count >= maxComponents:
+        raise error.LimitExceededError(
+            'Components exceed %d-item limit' % maxComponents
+            )
+
+_headerTagCache = {}
+
+def decodeHeader(substrate, offset=0):
+    """Decode tag and length octets of a TLV sitting at offset
+
+    Returns (tag, length, header size), length is -1 for indefinite
+    length encoding. Raises SubstrateUnderrunError on incomplete header.
+    """
+    substrateLen = len(substrate)
+    if offset >= substrateLen:
+        raise error.SubstrateUnderrunError(
+            'Short octet stream on tag decoding'
+            )
+    firstOctet = oct2int(substrate[offset])
+    size = 1
+    if firstOctet in _headerTagCache:
+        lastTag = _headerTagCache[firstOctet]
+    else:
+        tagId = firstOctet&0x1F
+        if tagId == 0x1F:
+            tagId = 0
+            while 1:
+                if offset + size >= substrateLen:
+                    raise error.SubstrateUnderrunError(
+                        'Short octet stream on long tag decoding'
+                        )
+                t = oct2int(substrate[offset+size])
+                size = size + 1
+                tagId = tagId << 7 | (t&0x7F)
+                if not t&0x80:
+                    break
+        lastTag = tag.Tag(
+            tagClass=firstOctet&0xC0, tagFormat=firstOctet&0x20, tagId=tagId
+            )
+        if size == 1:
+            _headerTagCache[firstOctet] = lastTag
+    if offset + size >= substrateLen:
+        raise error.SubstrateUnderrunError(
+            'Short octet stream on length decoding'
+            )
+    firstOctet = oct2int(substrate[offset+size])
+    size = size + 1
+    if firstOctet == 128:
+        length = -1
+    elif firstOctet < 128:
+        length = firstOctet
+    else:
+        lengthSize = firstOctet & 0x7F
+        if offset + size + lengthSize > substrateLen:
+            raise error.SubstrateUnderrunError(
+                'Short octet stream on long length decoding'
+                )
+        length = 0
+        while lengthSize:
+            length = (length << 8) | oct2int(substrate[offset+size])
+            size = size + 1
+            lengthSize = lengthSize - 1
+    return lastTag, length, size
+
+def _isEndOfOctets(t, length):
+    return t == eoo.endOfOctets.tagSet[0] and \
+           t[1] == tag.tagFormatSimple and not length
+
+def skipItem(substrate, offset=0):
+    """Return offset past the TLV sitting at offset"""
+    depth = 0
+    while 1:
+        t, length, size = decodeHeader(substrate, offset)
+        offset = offset + size
+        if _isEndOfOctets(t, length):
+            if not depth:
+                raise error.PyAsn1Error('Unexpected end-of-contents octets')
+            depth = depth - 1
+        elif length == -1:
+            depth = depth + 1
+        else:
+            offset = offset + length
+            if offset > len(substrate):
+                raise error.SubstrateUnderrunError(
+                    '%d-octet short' % (offset - len(substrate))
+                    )
+        if not depth:
+            return offset
+
+class SequenceOfView:
+    """Random access to components of encoded SEQUENCE OF or SET OF
+
+    Substrate holds the whole encoding (header octets included) of a
+    value of asn1Spec type. On first use only components headers are
+    scanned to build a table of their offsets, then each indexing
+    decodes just the components asked for. Components are not cached.
+    """
+    def __init__(self, substrate, asn1Spec, decodeFun=decode):
+        if memoryview is not None and not isBufferType(substrate):
+            try:
+                substrate = memoryview(substrate)
+            except TypeError:
+                raise error.PyAsn1Error('Bad octet stream type')
+        self.__substrate = substrate
+        self.__asn1Spec = asn1Spec
+        self.__decodeFun = decodeFun
+        self.__offsets = None
+
+    def __getOffsets(self):
+        if self.__offsets is not None:
+            return self.__offsets
+        substrate = self.__substrate
+        tagSet = self.__asn1Spec.getTagSet()
+        offset = 0
+        idx = len(tagSet)
+        while idx:  # outermost (explicit) tags come first
+            idx = idx - 1
+            t, length, size = decodeHeader(substrate, offset)
+            if t != tagSet[idx]:
+                raise error.PyAsn1Error(
+                    '%s not in asn1Spec: %s' % (t, self.__asn1Spec.prettyPrintType())
+                    )
+            offset = offset + size
+        # start offsets of components followed by end of the last one
+        offsets = array('L')
+        if length == -1:
+            while 1:
+                try:
+                    t, length, size = decodeHeader(substrate, offset)
+                except error.SubstrateUnderrunError:
+                    raise error.SubstrateUnderrunError(
+                        'No EOO seen before substrate ends'
+                        )
+                if _isEndOfOctets(t, length):
+                    break
+                offsets.append(offset)
+                offset = skipItem(substrate, offset)
+        else:
+            if offset + length > len(substrate):
+                raise error.SubstrateUnderrunError(
+                    '%d-octet short' % (offset + length - len(substrate))
+                    )
+            head = substrate[:offset+length]
+            while offset < len(head):
+                offsets.append(offset)
+                offset = skipItem(head, offset)
+        offsets.append(offset)
+        self.__offsets = offsets
+        return offsets
+
+    def __len__(self): return len(self.__getOffsets()) - 1
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [ self[x] for x in range(*idx.indices(len(self))) ]
+        offsets = self.__getOffsets()
+        if idx < 0:
+            idx = idx + len(offsets) - 1
+        if idx < 0 or idx >= len(offsets) - 1:
+            raise IndexError('Component index out of range')
+        component, _ = self.__decodeFun(
+            self.__substrate[offsets[idx]:offsets[idx+1]],
+            self.__asn1Spec.getComponentType()
+            )
+        return component
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def bisectLeft(self, value, key=None, lo=0, hi=None):
+        """Return position to insert value at to keep components sorted
+
+        Components (or key(component) values, if key is given) must be
+        in ascending order. Just about log2(len(self)) of them get decoded.
+        """
+        if hi is None:
+            hi = len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            component = self[mid]
+            if key is not None:
+                component = key(component)
+            if component < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+class IncrementalDecoder:
+    """Decode top-level items from substrate arriving in pieces
+
+    Substrate chunks are passed to feed() in any sizes. Headers of the
+    item being received are scanned once, as their octets arrive, so the
+    item is decoded only when its last octet is in. Headers exceeding
+    maxLength or maxDepth limits of decodeFun fail as soon as they are
+    in. Octets listed in filler are skipped in between top-level items.
+    """
+    def __init__(self, asn1Spec=None, decodeFun=decode, filler=null,
+                 offset=0):
+        self.__asn1Spec = asn1Spec
+        self.__decodeFun = decodeFun
+        self.__filler = [ oct2int(x) for x in filler ]
+        if memoryview is None:
+            # no bytearray before Python 2.6, octets are joined instead
+            self.__buffer = null
+        else:
+            self.__buffer = bytearray()
+        # stream offset of buffer head
+        self.__consumed = offset
+        self.__start = 0
+        self.__reset()
+
+    def __reset(self):
+        # scanner position and open indefinite length constructs
+        self.__offset = self.__start
+        self.__depth = 0
+        # end of current item once known
+        self.__end = None
+
+    def __scan(self):
+        bufferLen = len(self.__buffer)
+        # headers are checked against decoder limits as they arrive
+        maxLength = getattr(self.__decodeFun, 'maxLength', None)
+        maxDepth = getattr(self.__decodeFun, 'maxDepth', None)
+        if self.__end is None:
+            if memoryview is None:
+                substrate = self.__buffer
+            else:
+                substrate = memoryview(self.__buffer)
+            try:
+                if self.__filler and self.__offset == self.__start:
+                    while self.__start < bufferLen and \
+                          oct2int(substrate[self.__start]) in self.__filler:
+                        self.__start = self.__start + 1
+                    self.__offset = self.__start
+                while self.__offset < bufferLen:
+                    try:
+                        t, length, size = decodeHeader(
+                            substrate, self.__offset
+                            )
+                    except error.SubstrateUnderrunError:
+                        break
+                    if _isEndOfOctets(t, length):
+                        if not self.__depth:
+                            raise error.PyAsn1Error(
+                                'Unexpected end-of-contents octets'
+                                )
+                        self.__offset = self.__offset + size
+                        self.__depth = self.__depth - 1
+                        if not self.__depth:
+                            self.__end = self.__offset
+                            break
+                    elif length == -1:
+                        if maxDepth is not None and self.__depth >= maxDepth:
+                            raise error.LimitExceededError(
+                                'Values nested over %d-deep limit at %s' %
+                                (maxDepth, t)
+                                )
+                        self.__offset = self.__offset + size
+                        self.__depth = self.__depth + 1
+                    elif maxLength is not None and length > maxLength:
+                        raise error.LimitExceededError(
+                            '%d-octet value exceeds %d-octet limit at %s' %
+                            (length, maxLength, t)
+                            )
+                    elif self.__depth:
+                        self.__offset = self.__offset + size + length
+                    else:
+                        self.__end = self.__offset + size + length
+                        break
+            finally:
+                del substrate
+        if self.__end is not None and self.__end <= bufferLen:
+            return self.__end
+
+    def feedWithOffsets(self, substrate):
+        """Append substrate, return (item, stream offset) pairs it completes"""
+        if memoryview is None:
+            self.__buffer = self.__buffer + substrate
+        else:
+            self.__buffer.extend(substrate)
+        values = []
+        while 1:
+            end = self.__scan()
+            if end is None:
+                break
+            item = self.__buffer[self.__start:end]
+            if memoryview is not None:
+                item = bytes(item)
+            value, _ = self.__decodeFun(item, self.__asn1Spec)
+            values.append((value, self.__consumed + self.__start))
+            self.__start = end
+            self.__reset()
+        if self.__start:
+            if memoryview is None:
+                self.__buffer = self.__buffer[self.__start:]
+            else:
+                del self.__buffer[:self.__start]
+            self.__consumed = self.__consumed + self.__start
+            self.__offset = self.__offset - self.__start
+            if self.__end is not None:
+                self.__end = self.__end - self.__start
+            self.__start = 0
+        return values
+
+    def feed(self, substrate):
+        """Append substrate, return list of items completed by it"""
+        return [ x[0] for x in self.feedWithOffsets(substrate) ]
+
+    def isIdle(self):
+        """True if no partially received item is pending"""
+        return not self.__buffer
+
+def decodeStream(fileObj, asn1Spec=None, decodeFun=decode, filler=null,
+                 offset=0, chunkSize=65536):
+    """Iterate over (item, offset) pairs of items read from a file object
+
+    The file is read in chunkSize pieces so at most one item and one
+    chunk are buffered at a time. Item offsets count from the initial
+    file position, which is passed in offset if it is not zero.
+    """
+    d = IncrementalDecoder(asn1Spec, decodeFun, filler, offset)
+    while 1:
+        chunk = fileObj.read(chunkSize)
+        if not chunk:
+            break
+        for x in d.feedWithOffsets(chunk):
+            yield x
+    if not d.isIdle():
+        raise error.SubstrateUnderrunError(
+            'Stream ends in the middle of an item'
+            )
+
+# Decode plan nodes. Tables map outermost tag of a component (None
+# stands for any tag) to (node, position) of the component. Nodes
+# either decode whole value at once or return a frame from createFrame()
+# to have value decoded component by component.
+
+class _LeafNode:
+    def __init__(self, spec, decodeFun):
+        self.spec = spec
+        self.decodeFun = decodeFun
+
+    def createFrame(self, substrate, t, length, size): return
+
+class _SpecNode(_LeafNode):
+    # decoded by Decoder against ASN.1 spec, explicit tags included
+    def decodeValue(self, substrate, t, length, size):
+        return self.decodeFun(substrate, self.spec)
+
+class _ValueNode(_LeafNode):
+    # decoded by value decoder, with no components
+    def __init__(self, spec, decodeFun, valueDecoder, tagSetCache):
+        _LeafNode.__init__(self, spec, decodeFun)
+        self.valueDecoder = valueDecoder
+        self.tagSetCache = tagSetCache
+
+    def decodeValue(self, substrate, t, length, size):
+        k = t.asTuple()
+        if k in self.tagSetCache:
+            tagSet = self.tagSetCache[k]
+        else:
+            tagSet = self.tagSetCache[k] = tag.TagSet((), t)
+        if length == -1:
+            return self.valueDecoder.indefLenValueDecoder(
+                substrate, substrate[size:], self.spec, tagSet, length,
+                stGetValueDecoder, self.decodeFun, None
+                )
+        else:
+            return self.valueDecoder.valueDecoder(
+                substrate, substrate[size:], self.spec, tagSet, length,
+                stGetValueDecoder, self.decodeFun, None
+                )
+
+class _NativeValueNode(_LeafNode):
+    # decoded by value decoder into Python object
+    def __init__(self, spec, decodeFun, valueDecoder):
+        _LeafNode.__init__(self, spec, decodeFun)
+        self.valueDecoder = valueDecoder
+        if tag.tagFormatConstructed in valueDecoder.tagFormats:
+            self.segmentsNode = _NativeSegmentsNode(
+                { valueDecoder.protoComponent.getTagSet()[0]: (self, None) },
+                isinstance(valueDecoder, BitStringDecoder)
+                )
+        else:
+            self.segmentsNode = None
+
+    def createFrame(self, substrate, t, length, size):
+        if t.asTuple()[1] == tag.tagFormatConstructed:
+            if self.segmentsNode is None:
+                raise error.PyAsn1Error(
+                    'Invalid tag format %s for %s' % (t, self.spec.prettyPrintType())
+                    )
+            return self.segmentsNode.createFrame(substrate, t, length, size)
+
+    def decodeValue(self, substrate, t, length, size):
+        return self.valueDecoder.nativeValueDecoder(
+            substrate[size:], length, self.decodeFun
+            )
+
+class _NativeAnyNode(_LeafNode):
+    # Any value as octets, with header unless Any is tagged
+    def decodeValue(self, substrate, t, length, size):
+        end = skipItem(substrate)
+        if not self.spec.getTagSet():
+            return buf2octs(substrate[:end]), substrate[end:]
+        elif length == -1:
+            return buf2octs(substrate[size:end-2]), substrate[end:]
+        else:
+            return buf2octs(substrate[size:end]), substrate[end:]
+
+class _ComponentsNode:
+    # Sequence, Set, SequenceOf and SetOf; positional tables are
+    # per component index, otherwise single table serves all of them
+    def __init__(self, spec, tables, positional=False):
+        self.spec = spec
+        self.tables = tables
+        self.positional = positional
+
+    def createFrame(self, substrate, t, length, size):
+        if t.asTuple()[1] != tag.tagFormatConstructed:
+            raise error.PyAsn1Error(
+                'Invalid tag format %s for %s' % (t, self.spec.prettyPrintType())
+                )
+        frame = Frame(self.createValue(), substrate[size:], length)
+        frame.node = self
+        return frame
+
+    def createValue(self): return self.spec.clone()
+
+    def nextTable(self, frame):
+        if frame.substrate:
+            if frame.tail is None and _isEndOfOctetsAt(frame.substrate):
+                frame.substrate, frame.tail = None, frame.substrate[2:]
+                self.completeValue(frame)
+                return
+            if not self.positional:
+                return self.tables[0]
+            elif frame.idx < len(self.tables):
+                return self.tables[frame.idx]
+            else:
+                raise error.PyAsn1Error('Type position out of range')
+        if frame.substrate is None:
+            return
+        if frame.tail is None:
+            raise error.SubstrateUnderrunError(
+                'No EOO seen before substrate ends'
+                )
+        frame.substrate = None
+        self.completeValue(frame)
+
+    def setComponent(self, frame, value, position, substrate):
+        if position is None:
+            position = frame.idx
+        frame.value.setComponentByPosition(position, value, False)
+        frame.idx = position + 1
+        frame.substrate = substrate
+
+    def completeValue(self, frame):
+        if isinstance(frame.value, univ.SequenceAndSetBase):
+            frame.value.setDefaultComponents()
+        frame.value.verifySizeSpec()
+
+class _NativeComponentsNode(_ComponentsNode):
+    # Sequence and Set built into dict keyed by component names,
+    # SequenceOf and SetOf into list, then passed to factory if any
+    def __init__(self, spec, tables, positional=False, factory=None):
+        _ComponentsNode.__init__(self, spec, tables, positional)
+        self.factory = factory
+        self.names = self.defaults = self.mandatory = None
+        namedTypes = spec.getComponentType()
+        if isinstance(spec, univ.SequenceAndSetBase):
+            self.names = {}
+            self.defaults = []
+            self.mandatory = []
+            for idx in range(len(namedTypes)):
+                name = namedTypes.getNameByPosition(idx)
+                self.names[idx] = name
+                if namedTypes[idx].isDefaulted:
+                    self.defaults.append(
+                        (name, _getNativeValue(namedTypes.getTypeByPosition(idx)))
+                        )
+                elif not namedTypes[idx].isOptional:
+                    self.mandatory.append(name)
+
+    def createValue(self):
+        if self.names is None:
+            return []
+        else:
+            return {}
+
+    def setComponent(self, frame, value, position, substrate):
+        if position is None:
+            frame.value.append(value)
+            frame.idx = frame.idx + 1
+        else:
+            frame.value[self.names[position]] = value
+            frame.idx = position + 1
+        frame.substrate = substrate
+
+    def completeValue(self, frame):
+        value = frame.value
+        if self.names is None:
+            if self.factory is not None:
+                frame.value = self.factory(value)
+            return
+        for name, default in self.defaults:
+            if name not in value:
+                value[name] = default
+        for name in self.mandatory:
+            if name not in value:
+                raise error.PyAsn1Error(
+                    'Uninitialized component %s at %s' % (name, self.spec.prettyPrintType())
+                    )
+        if self.factory is not None:
+            frame.value = self.factory(**value)
+
+class _NativeSegmentsNode(_NativeComponentsNode):
+    # constructed OctetString or BitString joined into single value
+    def __init__(self, table, bits):
+        self.tables = (table,)
+        self.positional = False
+        self.names = None
+        self.bits = bits
+
+    def createFrame(self, substrate, t, length, size):
+        frame = Frame([], substrate[size:], length)
+        frame.node = self
+        return frame
+
+    def completeValue(self, frame):
+        if self.bits:
+            value = []
+            for segment in frame.value:
+                value.extend(segment)
+            frame.value = tuple(value)
+        else:
+            frame.value = null.join(frame.value)
+
+class _ExplicitNode:
+    # explicit tag around single component
+    def __init__(self, table):
+        self.tables = (table,)
+
+    def createFrame(self, substrate, t, length, size):
+        frame = Frame(None, substrate[size:], length)
+        frame.node = self
+        return frame
+
+    def nextTable(self, frame):
+        if frame.substrate is None:
+            return
+        if frame.idx:
+            if not _isEndOfOctetsAt(frame.substrate):
+                raise error.PyAsn1Error('Missing end-of-octets terminator')
+            frame.substrate, frame.tail = None, frame.substrate[2:]
+            return
+        return self.tables[0]
+
+    def setComponent(self, frame, value, position, substrate):
+        frame.value = value
+        if frame.tail is None:
+            frame.substrate, frame.idx = substrate, 1
+        else:
+            frame.substrate = None
+
+class _ChoiceNode(_ExplicitNode):
+    def __init__(self, spec, table):
+        self.spec = spec
+        self.tables = (table,)
+
+    def createFrame(self, substrate, t, length, size):
+        if self.spec.getTagSet():
+            frame = Frame(self.createValue(), substrate[size:], length)
+        else:
+            # untagged Choice shares header with its component
+            frame = Frame(self.createValue(), substrate, -1)
+            frame.untagged = True
+        frame.node = self
+        return frame
+
+    def createValue(self): return self.spec.clone()
+
+    def nextTable(self, frame):
+        if frame.substrate is None:
+            return
+        if frame.idx:
+            if not _isEndOfOctetsAt(frame.substrate):
+                raise error.PyAsn1Error('No EOO seen before substrate ends')
+            frame.substrate, frame.tail = None, frame.substrate[2:]
+            return
+        return self.tables[0]
+
+    def setComponent(self, frame, value, position, substrate):
+        self.setValue(frame, value, position)
+        if getattr(frame, 'untagged', False):
+            frame.substrate, frame.tail = None, substrate
+        elif frame.tail is None:
+            frame.substrate, frame.idx = substrate, 1
+        else:
+            frame.substrate = None
+
+    def setValue(self, frame, value, position):
+        frame.value.setComponentByPosition(position, value, False)
+
+class _NativeChoiceNode(_ChoiceNode):
+    # Choice built into dict of its only component, then passed to
+    # factory if any
+    def __init__(self, spec, table, factory=None):
+        _ChoiceNode.__init__(self, spec, table)
+        self.factory = factory
+        namedTypes = spec.getComponentType()
+        self.names = {}
+        for idx in range(len(namedTypes)):
+            self.names[idx] = namedTypes.getNameByPosition(idx)
+
+    def createValue(self): return None
+
+    def setValue(self, frame, value, position):
+        if self.factory is None:
+            frame.value = { self.names[position]: value }
+        else:
+            frame.value = self.factory(**{ self.names[position]: value })
+
+def _isEndOfOctetsAt(substrate):
+    return len(substrate) > 1 and not oct2int(substrate[0]) and \
+           not oct2int(substrate[1])
+
+def _getNativeValue(value):
+    # Python object for ASN.1 value such as component default
+    if isinstance(value, univ.Null):
+        return None
+    elif isinstance(value, univ.OctetString):
+        return value.asOctets()
+    elif isinstance(value, univ.Boolean):
+        return bool(value)
+    elif isinstance(value, univ.Integer):
+        return int(value)
+    elif isinstance(value, univ.Real):
+        return float(value)
+    elif isinstance(value, (univ.BitString, univ.ObjectIdentifier)):
+        return tuple(value)
+    else:
+        raise error.PyAsn1Error(
+            'No Python object for %s' % value.prettyPrintType()
+            )
+
+class DecodePlan:
+    """ASN.1 spec compiled into decoding tables
+
+    A plan is passed to decoder in place of asn1Spec. It maps tags of
+    components to their decoders and positions at each point of the
+    spec, with Choice alternatives and explicit tags resolved, so that
+    none of that is worked out of the spec again for every value. Plan
+    is meant to be built once and reused for decoding many values.
+
+    In native mode values are built of Python objects rather than ASN.1
+    ones: Sequence, Set and Choice become dicts keyed by component names
+    (with absent optional components left out), SequenceOf and SetOf
+    become lists, Integer and Enumerated become ints, Boolean bool,
+    Real float, Null None, OctetString-based types and Any become
+    octets, BitString and ObjectIdentifier tuples. Constraints are not
+    verified. The factories dict may map ASN.1 classes of constructed
+    types to callables building objects out of components, passed as
+    keyword arguments (or as single list for SequenceOf and SetOf).
+    """
+    def __init__(self, asn1Spec, decodeFun=decode, native=False,
+                 factories=None):
+        self.__decodeFun = decodeFun
+        self.__native = native
+        self.__factories = factories or {}
+        self.__nodes = {}
+        self.__tagSetCache = {}
+        self.__asn1Spec = asn1Spec
+        self.__table = self.__getTable(((asn1Spec, None),))
+
+    def getSpec(self): return self.__asn1Spec
+
+    def __getTable(self, components):
+        table = {}
+        for asn1Spec, position in components:
+            for t, node in self.__getEntries(asn1Spec):
+                if t in table:
+                    raise error.PyAsn1Error('Duplicate type %s' % (t,))
+                table[t] = node, position
+        return table
+
+    def __getEntries(self, asn1Spec):
+        # (outermost tag, node) pairs for decoding spec
+        node = self.__getNode(asn1Spec)
+        tagSet = asn1Spec.getTagSet()
+        if not tagSet:
+            if isinstance(node, _ChoiceNode):
+                return [ (t, node) for t in node.tables[0] ]
+            else:  # untagged ANY
+                return [ (None, node) ]
+        if not isinstance(node, _SpecNode):
+            for idx in range(1, len(tagSet)):
+                node = _ExplicitNode({tagSet[idx-1]: (node, None)})
+        return [ (tagSet[-1], node) ]
+
+    def __getNode(self, asn1Spec):
+        if id(asn1Spec) in self.__nodes:
+            return self.__nodes[id(asn1Spec)]
+        if self.__native:
+            node = self.__getNativeNode(asn1Spec)
+        else:
+            node = self.__getSpecNode(asn1Spec)
+        self.__nodes[id(asn1Spec)] = node
+        return node
+
+    def __getSequenceTables(self, namedTypes):
+        tables = []
+        for idx in range(len(namedTypes)):
+            # optional components make next ones possible here
+            components = []
+            for nextIdx in range(idx, len(namedTypes)):
+                components.append(
+                    (namedTypes.getTypeByPosition(nextIdx), nextIdx)
+                    )
+                if not namedTypes[nextIdx].isOptional and \
+                       not namedTypes[nextIdx].isDefaulted:
+                    break
+            tables.append(self.__getTable(components))
+        return tables
+
+    def __getSetTable(self, namedTypes):
+        return self.__getTable(
+            [ (namedTypes.getTypeByPosition(idx), idx) for idx in range(len(namedTypes)) ]
+            )
+
+    def __getSpecNode(self, asn1Spec):
+        valueDecoder = self.__decodeFun.getValueDecoder(asn1Spec)
+        if getattr(self.__decodeFun, 'lazy', False) or \
+               valueDecoder is None or isinstance(valueDecoder, AnyDecoder):
+            return _SpecNode(asn1Spec, self.__decodeFun)
+        elif isinstance(valueDecoder, SequenceDecoder):
+            namedTypes = asn1Spec.getComponentType()
+            if not namedTypes:
+                return _SpecNode(asn1Spec, self.__decodeFun)
+            elif isinstance(valueDecoder, SetDecoder):
+                return _ComponentsNode(
+                    asn1Spec, [ self.__getSetTable(namedTypes) ]
+                    )
+            else:
+                return _ComponentsNode(
+                    asn1Spec, self.__getSequenceTables(namedTypes), True
+                    )
+        elif isinstance(valueDecoder, SequenceOfDecoder):
+            if asn1Spec.getComponentType() is None:
+                return _SpecNode(asn1Spec, self.__decodeFun)
+            return _ComponentsNode(asn1Spec, [ self.__getTable(
+                ((asn1Spec.getComponentType(), None),)
+                ) ])
+        elif isinstance(valueDecoder, ChoiceDecoder):
+            return _ChoiceNode(
+                asn1Spec, self.__getSetTable(asn1Spec.getComponentType())
+                )
+        else:
+            return _ValueNode(
+                asn1Spec, self.__decodeFun, valueDecoder, self.__tagSetCache
+                )
+
+    def __getNativeNode(self, asn1Spec):
+        valueDecoder = self.__decodeFun.getValueDecoder(asn1Spec)
+        factory = self.__factories.get(asn1Spec.__class__)
+        if isinstance(valueDecoder, AnyDecoder):
+            return _NativeAnyNode(asn1Spec, self.__decodeFun)
+        elif isinstance(valueDecoder, (SequenceDecoder, ChoiceDecoder)):
+            namedTypes = asn1Spec.getComponentType()
+            if not namedTypes:
+                raise error.PyAsn1Error(
+                    'No component types for native decoding of %s' % asn1Spec.prettyPrintType()
+                    )
+            if isinstance(valueDecoder, ChoiceDecoder):
+                return _NativeChoiceNode(
+                    asn1Spec, self.__getSetTable(namedTypes), factory
+                    )
+            elif isinstance(valueDecoder, SetDecoder):
+                return _NativeComponentsNode(
+                    asn1Spec, [ self.__getSetTable(namedTypes) ], False,
+                    factory
+                    )
+            else:
+                return _NativeComponentsNode(
+                    asn1Spec, self.__getSequenceTables(namedTypes), True,
+                    factory
+                    )
+        elif isinstance(valueDecoder, SequenceOfDecoder):
+            if asn1Spec.getComponentType() is None:
+                raise error.PyAsn1Error(
+                    'No component type for native decoding of %s' % asn1Spec.prettyPrintType()
+                    )
+            return _NativeComponentsNode(asn1Spec, [ self.__getTable(
+                ((asn1Spec.getComponentType(), None),)
+                ) ], False, factory)
+        elif valueDecoder is not None and \
+                 getattr(valueDecoder, '_decodeContents', None) is not None:
+            return _NativeValueNode(asn1Spec, self.__decodeFun, valueDecoder)
+        else:
+            raise error.PyAsn1Error(
+                'Native decoding not implemented for %s' % asn1Spec.prettyPrintType()
+                )
+
+    def __call__(self, substrate):
+        """Decode substrate into value, return it along with the rest"""
+        result = []
+        for _ in self._decodeSteps(substrate, result):
+            pass
+        return result[0], result[1]
+
+    def _decodeSteps(self, substrate, result, pausing=False):
+        # Puts (value, substrate) into result list once done. If pausing
+        # is set, yields whenever a TLV is decoded (see DecodeJob).
+        stack = []
+        table = self.__table
+        position = None
+        maxDepth = getattr(self.__decodeFun, 'maxDepth', None)
+        maxLength = getattr(self.__decodeFun, 'maxLength', None)
+        maxComponents = getattr(self.__decodeFun, 'maxComponents', None)
+        while 1:
+            t, length, size = decodeHeader(substrate)
+            if maxLength is not None and length > maxLength:
+                raise error.LimitExceededError(
+                    '%d-octet value exceeds %d-octet limit at %s' %
+                    (length, maxLength, t)
+                    )
+            if t in table:
+                node, position = table[t]
+            elif None in table:
+                node, position = table[None]
+            else:
+                raise error.PyAsn1Error(
+                    '%s not in asn1Spec: %s' % (t, self.__asn1Spec)
+                    )
+            if length != -1 and size + length > len(substrate):
+                raise error.SubstrateUnderrunError(
+                    '%d-octet short' % (size + length - len(substrate))
+                    )
+            frame = node.createFrame(substrate, t, length, size)
+            if frame is None:
+                value, substrate = node.decodeValue(substrate, t, length, size)
+                complete = True
+            else:
+                if maxDepth is not None and len(stack) >= maxDepth:
+                    raise error.LimitExceededError(
+                        'Values nested over %d-deep limit at %s' %
+                        (maxDepth, t)
+                        )
+                frame.position = position
+                stack.append(frame)
+                complete = False
+            if pausing:
+                yield
+            # pass value over to enclosing ones till next component
+            # is due
+            while stack:
+                frame = stack[-1]
+                if complete:
+                    frame.node.setComponent(frame, value, position, substrate)
+                table = frame.node.nextTable(frame)
+                if table is not None:
+                    substrate = frame.substrate
+                    # components are counted before being decoded
+                    if maxComponents is not None:
+                        _checkComponentsCount(frame.count, maxComponents)
+                        frame.count = frame.count + 1
+                    break
+                del stack[-1]
+                value, substrate, position = \
+                       frame.value, frame.tail, frame.position
+                complete = True
+            else:
+                result.extend((value, substrate))
+                return
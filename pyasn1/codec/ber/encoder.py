@@ -1,7 +1,8 @@
 # BER encoder
 from pyasn1.type import base, tag, univ, char, useful
 from pyasn1.codec.ber import eoo
-from pyasn1.compat.octets import int2oct, oct2int, ints2octs, null, str2octs
+from pyasn1.compat.octets import int2oct, oct2int, ints2octs, null, str2octs, \
+     buf2octs, isOctetsType, joinOcts, memoryview
 from pyasn1 import debug, error
 
 class Error(Exception): pass
@@ -63,6 +64,142 @@ class AbstractItemEncoder:
         else:
             return substrate  # untagged value
 
+    # Encoding into list of chunks keeps encoding time linear in value
+    # size: nothing is copied till chunks are joined or written out.
+    # Unless encodeValueInto() is overridden, contents octets are built
+    # by encodeValue().
+
+    def encodeValueInto(self, encodeFun, value, defMode, maxChunkSize,
+                        chunks):
+        substrate, isConstructed = self.encodeValue(
+            encodeFun, value, defMode, maxChunkSize
+            )
+        chunks.append(substrate)
+        return len(substrate), isConstructed
+
+    def encodeInto(self, encodeFun, value, defMode, maxChunkSize, chunks):
+        """Append encoding of value to chunks list, return its size"""
+        tagSet = value.getTagSet()
+        if not tagSet:  # untagged value
+            return self.encodeValueInto(
+                encodeFun, value, defMode, maxChunkSize, chunks
+                )[0]
+        idx = len(chunks)
+        chunks.append(null)  # header goes here once length is known
+        size, isConstructed = self.encodeValueInto(
+            encodeFun, value, defMode, maxChunkSize, chunks
+            )
+        if not isConstructed:  # primitive form implies definite mode
+            defMode = 1
+        chunks[idx] = self.encodeTag(
+            tagSet[-1], isConstructed
+            ) + self.encodeLength(size, defMode)
+        size = size + len(chunks[idx])
+        if not defMode and self.supportIndefLenMode:
+            chunks.append(self._encodeEndOfOctets(encodeFun, defMode))
+            size = size + len(chunks[-1])
+        return size
+
+    # Python objects are encoded under ASN.1 spec with the methods below.
+    # Unless encodeNativeValueInto() or encodeNativeValue() is overridden,
+    # ASN.1 object is built of Python one and encoded with encodeValue().
+
+    def encodeNativeValue(self, encodeFun, value, asn1Spec, defMode,
+                          maxChunkSize):
+        return self.encodeValue(
+            encodeFun, asn1Spec.clone(value), defMode, maxChunkSize
+            )
+
+    def encodeNativeValueInto(self, encodeFun, value, asn1Spec, defMode,
+                              maxChunkSize, chunks):
+        substrate, isConstructed = self.encodeNativeValue(
+            encodeFun, value, asn1Spec, defMode, maxChunkSize
+            )
+        chunks.append(substrate)
+        return len(substrate), isConstructed
+
+    def encodeNativeInto(self, encodeFun, value, asn1Spec, defMode,
+                         maxChunkSize, chunks):
+        """Append encoding of Python value to chunks list, return its size"""
+        tagSet = asn1Spec.getTagSet()
+        if not tagSet:  # untagged value
+            return self.encodeNativeValueInto(
+                encodeFun, value, asn1Spec, defMode, maxChunkSize, chunks
+                )[0]
+        idx = len(chunks)
+        # headers go here, outermost first, once lengths are known
+        chunks.extend([null] * len(tagSet))
+        size, isConstructed = self.encodeNativeValueInto(
+            encodeFun, value, asn1Spec, defMode, maxChunkSize, chunks
+            )
+        if isConstructed:
+            valueDefMode = defMode
+        else:  # primitive form implies definite mode
+            valueDefMode = 1
+        itemEncoder = self
+        for n in range(len(tagSet)):
+            header = itemEncoder.encodeTag(
+                tagSet[n], isConstructed
+                ) + itemEncoder.encodeLength(size, valueDefMode)
+            chunks[idx+len(tagSet)-1-n] = header
+            size = size + len(header)
+            if not valueDefMode and itemEncoder.supportIndefLenMode:
+                chunks.append(
+                    itemEncoder._encodeEndOfOctets(encodeFun, valueDefMode)
+                    )
+                size = size + len(chunks[-1])
+            # outer tags are explicit ones
+            itemEncoder = explicitlyTaggedItemEncoder
+            isConstructed, valueDefMode = 1, defMode
+        return size
+
+    def _encodeNativeChunks(self, encodeFun, value, asn1Spec, chunkSize):
+        # primitive encodings of value pieces (base type tagged)
+        t = asn1Spec.baseTagSet[0]
+        pos = 0; substrate = []
+        while pos < len(value):
+            chunk, isConstructed = self.encodeNativeValue(
+                encodeFun, value[pos:pos+chunkSize], asn1Spec, 1, 0
+                )
+            substrate.append(
+                self.encodeTag(t, 0) + self.encodeLength(len(chunk), 1) + chunk
+                )
+            pos = pos + chunkSize
+        return null.join(substrate), 1
+
+    # Octets read off a file object or an iterator are encoded in
+    # constructed form, one primitive segment of maxChunkSize (or
+    # streamChunkSize) octets at a time, as they are written out.
+    # Values fitting a single segment are encoded in primitive form,
+    # as they would be if not streamed.
+    streamChunkSize = 1000
+
+    def _encodeStreamInto(self, value, asn1Spec, defMode, maxChunkSize,
+                          chunks, prefix=null):
+        if defMode:
+            raise error.PyAsn1Error(
+                'Streamed %s value needs indefinite length mode' % asn1Spec.prettyPrintType()
+                )
+        chunkSize = maxChunkSize or self.streamChunkSize
+        pieces = _readPieces(value, chunkSize)
+        # read ahead past one segment to choose encoding form
+        head = []; size = 0
+        for piece in pieces:
+            head.append(piece)
+            size = size + len(piece)
+            if size > chunkSize:
+                break
+        else:
+            chunks.append(prefix + joinOcts(head))
+            return len(chunks[-1]), 0
+        chunks.append(
+            StreamedValue(
+                self, _chainPieces(head, pieces), asn1Spec.baseTagSet[0],
+                chunkSize, prefix
+                )
+            )
+        return 0, 1
+
 class EndOfOctetsEncoder(AbstractItemEncoder):
     def encodeValue(self, encodeFun, value, defMode, maxChunkSize):
         return null, 0
@@ -76,6 +213,17 @@ class ExplicitlyTaggedItemEncoder(AbstractItemEncoder):
             value = value.clone(tagSet=value.getTagSet()[:-1])
         return encodeFun(value, defMode, maxChunkSize), 1
 
+    def encodeValueInto(self, encodeFun, value, defMode, maxChunkSize,
+                        chunks):
+        if isinstance(value, base.AbstractConstructedAsn1Item):
+            value = value.clone(tagSet=value.getTagSet()[:-1],
+                                cloneValueFlag=1)
+        else:
+            value = value.clone(tagSet=value.getTagSet()[:-1])
+        return encodeFun.encodeChunks(
+            value, defMode, maxChunkSize, chunks
+            ), 1
+
 explicitlyTaggedItemEncoder = ExplicitlyTaggedItemEncoder()
 
 class BooleanEncoder(AbstractItemEncoder):
@@ -85,6 +233,10 @@ class BooleanEncoder(AbstractItemEncoder):
     def encodeValue(self, encodeFun, value, defMode, maxChunkSize):
         return value and self._true or self._false, 0
 
+    def encodeNativeValue(self, encodeFun, value, asn1Spec, defMode,
+                          maxChunkSize):
+        return self.encodeValue(encodeFun, value, defMode, maxChunkSize)
+
 class IntegerEncoder(AbstractItemEncoder):
     supportIndefLenMode = 0
     supportCompactZero = False
@@ -111,50 +263,114 @@ class IntegerEncoder(AbstractItemEncoder):
             del octets[0]
         return ints2octs(octets), 0
 
+    def encodeNativeValue(self, encodeFun, value, asn1Spec, defMode,
+                          maxChunkSize):
+        return self.encodeValue(encodeFun, value, defMode, maxChunkSize)
+
 class BitStringEncoder(AbstractItemEncoder):
     def encodeValue(self, encodeFun, value, defMode, maxChunkSize):
+        if not isinstance(value, univ.BitString):  # native tuple of bits
+            value = univ.BitString(value)
         if not maxChunkSize or len(value) <= maxChunkSize*8:
-            out_len = (len(value) + 7) // 8
-            out_list = out_len * [0]
-            j = 7
-            i = -1
-            for val in value:
-                j += 1
-                if j == 8:
-                    i += 1
-                    j = 0
-                out_list[i] = out_list[i] | val << (7-j)
-            return int2oct(7-j) + ints2octs(out_list), 0
+            return int2oct(-len(value) % 8) + value.asOctets(), 0
         else:
-            pos = 0; substrate = null
+            pos = 0; substrate = []
             while 1:
-                # count in octets
-                v = value.clone(value[pos*8:pos*8+maxChunkSize*8])
+                # count in octets, segments are base type tagged
+                v = value.clone(
+                    value[pos*8:pos*8+maxChunkSize*8], value.baseTagSet
+                    )
                 if not v:
                     break
-                substrate = substrate + encodeFun(v, defMode, maxChunkSize)
+                substrate.append(encodeFun(v, defMode, maxChunkSize))
                 pos = pos + maxChunkSize
-            return substrate, 1
+            return null.join(substrate), 1
+
+    def encodeNativeValue(self, encodeFun, value, asn1Spec, defMode,
+                          maxChunkSize):
+        if not maxChunkSize or len(value) <= maxChunkSize*8:
+            return self.encodeValue(encodeFun, value, defMode, 0)
+        else:
+            return self._encodeNativeChunks(
+                encodeFun, value, asn1Spec, maxChunkSize*8
+                )
+
+    def encodeNativeValueInto(self, encodeFun, value, asn1Spec, defMode,
+                              maxChunkSize, chunks):
+        # streamed source yields octets (whole ones, no unused bits)
+        # while native value is a tuple of bits
+        if _isStream(value):
+            return self._encodeStreamInto(
+                value, asn1Spec, defMode, maxChunkSize, chunks, int2oct(0)
+                )
+        return AbstractItemEncoder.encodeNativeValueInto(
+            self, encodeFun, value, asn1Spec, defMode, maxChunkSize, chunks
+            )
 
 class OctetStringEncoder(AbstractItemEncoder):
     def encodeValue(self, encodeFun, value, defMode, maxChunkSize):
         if not maxChunkSize or len(value) <= maxChunkSize:
             return value.asOctets(), 0
         else:
-            pos = 0; substrate = null
+            pos = 0; substrate = []
             while 1:
-                v = value.clone(value[pos:pos+maxChunkSize])
+                # segments are base type tagged
+                v = value.clone(value[pos:pos+maxChunkSize], value.baseTagSet)
                 if not v:
                     break
-                substrate = substrate + encodeFun(v, defMode, maxChunkSize)
+                substrate.append(encodeFun(v, defMode, maxChunkSize))
                 pos = pos + maxChunkSize
-            return substrate, 1
+            return null.join(substrate), 1
+
+    def encodeValueInto(self, encodeFun, value, defMode, maxChunkSize,
+                        chunks):
+        # value octets go to chunks as they are, chunked ones as views
+        substrate = value.asBuffer()
+        if not maxChunkSize or len(substrate) <= maxChunkSize:
+            chunks.append(substrate)
+            return len(substrate), 0
+        if memoryview is not None:
+            substrate = memoryview(substrate)
+        t = value.baseTagSet[0]
+        pos = size = 0
+        while pos < len(substrate):
+            v = substrate[pos:pos+maxChunkSize]
+            chunks.append(self.encodeTag(t, 0) + self.encodeLength(len(v), 1))
+            chunks.append(v)
+            size = size + len(chunks[-2]) + len(v)
+            pos = pos + maxChunkSize
+        return size, 1
+
+    def encodeNativeValue(self, encodeFun, value, asn1Spec, defMode,
+                          maxChunkSize):
+        if not isOctetsType(value):
+            value = asn1Spec.clone(value).asOctets()
+        if not maxChunkSize or len(value) <= maxChunkSize:
+            return value, 0
+        else:
+            return self._encodeNativeChunks(
+                encodeFun, value, asn1Spec, maxChunkSize
+                )
+
+    def encodeNativeValueInto(self, encodeFun, value, asn1Spec, defMode,
+                              maxChunkSize, chunks):
+        if _isStream(value):
+            return self._encodeStreamInto(
+                value, asn1Spec, defMode, maxChunkSize, chunks
+                )
+        return AbstractItemEncoder.encodeNativeValueInto(
+            self, encodeFun, value, asn1Spec, defMode, maxChunkSize, chunks
+            )
 
 class NullEncoder(AbstractItemEncoder):
     supportIndefLenMode = 0
     def encodeValue(self, encodeFun, value, defMode, maxChunkSize):
         return null, 0
 
+    def encodeNativeValue(self, encodeFun, value, asn1Spec, defMode,
+                          maxChunkSize):
+        return null, 0
+
 class ObjectIdentifierEncoder(AbstractItemEncoder):
     supportIndefLenMode = 0
     precomputedValues = {
@@ -162,7 +378,14 @@ class ObjectIdentifierEncoder(AbstractItemEncoder):
         (1, 3, 6, 1, 4): (43, 6, 1, 4)
     }
     def encodeValue(self, encodeFun, value, defMode, maxChunkSize):    
-        oid = value.asTuple()
+        return self._encodeArcs(value.asTuple()), 0
+
+    def encodeNativeValue(self, encodeFun, value, asn1Spec, defMode,
+                          maxChunkSize):
+        return self._encodeArcs(tuple(value)), 0
+
+    def _encodeArcs(self, value):
+        oid = value
         if oid[:5] in self.precomputedValues:
             octets = self.precomputedValues[oid[:5]]
             oid = oid[5:]
@@ -203,7 +426,7 @@ class ObjectIdentifierEncoder(AbstractItemEncoder):
                 # Add packed Sub-Object ID to resulted Object ID
                 octets += res
 
-        return ints2octs(octets), 0
+        return ints2octs(octets)
 
 class RealEncoder(AbstractItemEncoder):
     supportIndefLenMode = 0
@@ -322,41 +545,303 @@ class RealEncoder(AbstractItemEncoder):
             raise error.PyAsn1Error('Prohibited Real base %s' % b)
 
 class SequenceEncoder(AbstractItemEncoder):
+    # untouched lazily decoded values are encoded with original octets
+    reuseSubstrate = True
     def encodeValue(self, encodeFun, value, defMode, maxChunkSize):
+        chunks = []
+        self.encodeValueInto(encodeFun, value, defMode, maxChunkSize, chunks)
+        return null.join(chunks), 1
+
+    def encodeValueInto(self, encodeFun, value, defMode, maxChunkSize,
+                        chunks):
+        if self.reuseSubstrate:
+            substrate = value.getOriginalSubstrate()
+            if substrate is not None:
+                chunks.append(buf2octs(substrate))
+                return len(chunks[-1]), 1
         value.setDefaultComponents()
         value.verifySizeSpec()
-        substrate = null; idx = len(value)
-        while idx > 0:
-            idx = idx - 1
+        size = 0
+        for idx in range(len(value)):
             if value[idx] is None:  # Optional component
                 continue
             component = value.getDefaultComponentByPosition(idx)
             if component is not None and component == value[idx]:
                 continue
-            substrate = encodeFun(
-                value[idx], defMode, maxChunkSize
-                ) + substrate
-        return substrate, 1
+            size = size + encodeFun.encodeChunks(
+                value[idx], defMode, maxChunkSize, chunks
+                )
+        return size, 1
+
+    def encodeNativeValueInto(self, encodeFun, value, asn1Spec, defMode,
+                              maxChunkSize, chunks):
+        size = 0
+        for componentSpec, component in _getNativeComponents(value, asn1Spec):
+            size = size + encodeFun.encodeChunks(
+                component, defMode, maxChunkSize, chunks, componentSpec
+                )
+        return size, 1
 
 class SequenceOfEncoder(AbstractItemEncoder):
+    reuseSubstrate = True
     def encodeValue(self, encodeFun, value, defMode, maxChunkSize):
+        chunks = []
+        self.encodeValueInto(encodeFun, value, defMode, maxChunkSize, chunks)
+        return null.join(chunks), 1
+
+    def encodeValueInto(self, encodeFun, value, defMode, maxChunkSize,
+                        chunks):
+        if self.reuseSubstrate:
+            substrate = value.getOriginalSubstrate()
+            if substrate is not None:
+                chunks.append(buf2octs(substrate))
+                return len(chunks[-1]), 1
+        source = value.getComponentSource()
+        if source is not None:
+            return self._encodeComponentsInto(
+                encodeFun, source, value.getComponentType(), defMode,
+                maxChunkSize, chunks
+                )
         value.verifySizeSpec()
-        substrate = null; idx = len(value)
-        while idx > 0:
-            idx = idx - 1
-            substrate = encodeFun(
-                value[idx], defMode, maxChunkSize
-                ) + substrate
-        return substrate, 1
+        if getattr(encodeFun, 'workers', None) and \
+               len(value) >= encodeFun.parallelThreshold:
+            return self._encodeInParallel(
+                encodeFun, [ value[idx] for idx in range(len(value)) ],
+                None, defMode, maxChunkSize, chunks
+                )
+        size = 0
+        for idx in range(len(value)):
+            size = size + encodeFun.encodeChunks(
+                value[idx], defMode, maxChunkSize, chunks
+                )
+        return size, 1
+
+    def encodeNativeValueInto(self, encodeFun, value, asn1Spec, defMode,
+                              maxChunkSize, chunks):
+        componentSpec = asn1Spec.getComponentType()
+        if componentSpec is None:
+            raise error.PyAsn1Error(
+                'No component type at %s' % asn1Spec.prettyPrintType()
+                )
+        if _isStream(value):
+            return self._encodeComponentsInto(
+                encodeFun, value, componentSpec, defMode, maxChunkSize, chunks
+                )
+        if getattr(encodeFun, 'workers', None) and \
+               len(value) >= encodeFun.parallelThreshold:
+            return self._encodeInParallel(
+                encodeFun, list(value), componentSpec, defMode, maxChunkSize,
+                chunks
+                )
+        size = 0
+        for component in value:
+            size = size + encodeFun.encodeChunks(
+                component, defMode, maxChunkSize, chunks, componentSpec
+                )
+        return size, 1
+
+    def _encodeInParallel(self, encodeFun, components, componentSpec,
+                          defMode, maxChunkSize, chunks, sort=False):
+        from pyasn1.codec.ber import parallel
+        substrates = parallel.encodeComponents(
+            components, componentSpec, defMode, maxChunkSize, encodeFun, sort
+            )
+        chunks.extend(substrates)
+        return sum([ len(x) for x in substrates ]), 1
+
+    def _encodeComponentsInto(self, encodeFun, components, componentSpec,
+                              defMode, maxChunkSize, chunks):
+        # components are taken from iterable as encoding is written out
+        if not defMode:
+            chunks.append(
+                StreamedComponents(
+                    encodeFun, components, componentSpec, defMode, maxChunkSize
+                    )
+                )
+            return 0, 1
+        size = 0
+        if iter(components) is components:
+            # one-off iterator, encodings have to be kept
+            for component in components:
+                size = size + encodeFun.encodeChunks(
+                    component, defMode, maxChunkSize, chunks, componentSpec
+                    )
+            return size, 1
+        # length pre-pass, encodings are dropped
+        for component in components:
+            size = size + encodeFun.encodeChunks(
+                component, defMode, maxChunkSize, [], componentSpec
+                )
+        chunks.append(
+            StreamedComponents(
+                encodeFun, components, componentSpec, defMode, maxChunkSize
+                )
+            )
+        return size, 1
 
 class ChoiceEncoder(AbstractItemEncoder):
     def encodeValue(self, encodeFun, value, defMode, maxChunkSize):
         return encodeFun(value.getComponent(), defMode, maxChunkSize), 1
 
+    def encodeValueInto(self, encodeFun, value, defMode, maxChunkSize,
+                        chunks):
+        return encodeFun.encodeChunks(
+            value.getComponent(), defMode, maxChunkSize, chunks
+            ), 1
+
+    def encodeNativeValueInto(self, encodeFun, value, asn1Spec, defMode,
+                              maxChunkSize, chunks):
+        # Choice value is a dict of its only component
+        if len(value) != 1:
+            raise error.PyAsn1Error(
+                'Single component expected at %s' % asn1Spec.prettyPrintType()
+                )
+        for name in value:
+            namedTypes = asn1Spec.getComponentType()
+            componentSpec = namedTypes.getTypeByPosition(
+                namedTypes.getPositionByName(name)
+                )
+            return encodeFun.encodeChunks(
+                value[name], defMode, maxChunkSize, chunks, componentSpec
+                ), 1
+
 class AnyEncoder(OctetStringEncoder):
     def encodeValue(self, encodeFun, value, defMode, maxChunkSize):
         return value.asOctets(), defMode == 0
 
+    def encodeValueInto(self, encodeFun, value, defMode, maxChunkSize,
+                        chunks):
+        chunks.append(value.asBuffer())
+        return len(chunks[-1]), defMode == 0
+
+    def encodeNativeValue(self, encodeFun, value, asn1Spec, defMode,
+                          maxChunkSize):
+        return buf2octs(value), defMode == 0
+
+    encodeNativeValueInto = AbstractItemEncoder.encodeNativeValueInto
+
+def _isStream(value):
+    # file objects and iterators are read off as they are encoded
+    return hasattr(value, 'read') or hasattr(value, 'next') or \
+           hasattr(value, '__next__')
+
+def _readPieces(source, chunkSize):
+    if hasattr(source, 'read'):
+        while 1:
+            piece = source.read(chunkSize)
+            if not piece:
+                break
+            yield piece
+    else:
+        for piece in source:
+            yield piece
+
+def _chainPieces(head, pieces):
+    for piece in head:
+        yield piece
+    for piece in pieces:
+        yield piece
+
+class StreamedValue:
+    """Constructed encoding of octets coming from an iterator of pieces
+
+    Iterating over it yields header and contents octets of primitive
+    segments, each holding chunkSize octets but the last, as soon as the
+    pieces come. The pieces are read once, as the encoding is written.
+    """
+    def __init__(self, itemEncoder, pieces, t, chunkSize, prefix=null):
+        self.__itemEncoder = itemEncoder
+        self.__pieces = pieces
+        self.__tag = t
+        self.__chunkSize = chunkSize
+        self.__prefix = prefix
+
+    def __header(self, length):
+        return self.__itemEncoder.encodeTag(
+            self.__tag, 0
+            ) + self.__itemEncoder.encodeLength(
+            length + len(self.__prefix), 1
+            ) + self.__prefix
+
+    def __iter__(self):
+        chunkSize = self.__chunkSize
+        header = self.__header(chunkSize)
+        pending = []; pendingSize = 0
+        for piece in self.__pieces:
+            pending.append(piece)
+            pendingSize = pendingSize + len(piece)
+            if pendingSize < chunkSize:
+                continue
+            octets = joinOcts(pending)
+            pos = 0
+            while len(octets) - pos >= chunkSize:
+                yield header
+                yield octets[pos:pos+chunkSize]
+                pos = pos + chunkSize
+            pending = [ octets[pos:] ]; pendingSize = len(pending[0])
+        if pendingSize:
+            octets = joinOcts(pending)
+            yield self.__header(len(octets))
+            yield octets
+
+    def tobytes(self):
+        return joinOcts(list(self))
+
+class StreamedComponents(StreamedValue):
+    """Encodings of SEQUENCE OF components taken from an iterable
+
+    Components are encoded one at a time as the encoding is written.
+    """
+    def __init__(self, encodeFun, source, componentSpec, defMode,
+                 maxChunkSize):
+        self.__encodeFun = encodeFun
+        self.__source = source
+        self.__componentSpec = componentSpec
+        self.__defMode = defMode
+        self.__maxChunkSize = maxChunkSize
+
+    def __iter__(self):
+        for component in self.__source:
+            chunks = []
+            self.__encodeFun.encodeChunks(
+                component, self.__defMode, self.__maxChunkSize, chunks,
+                self.__componentSpec
+                )
+            for chunk in _iterChunks(chunks):
+                yield chunk
+
+def _iterChunks(chunks):
+    for chunk in chunks:
+        if isinstance(chunk, StreamedValue):
+            for piece in chunk:
+                yield piece
+        else:
+            yield chunk
+
+def _expandStreams(chunks):
+    return [ isinstance(x, StreamedValue) and x.tobytes() or x
+             for x in chunks ]
+
+def _getNativeComponents(value, asn1Spec):
+    # (spec, value) pairs of Sequence or Set components in a dict keyed
+    # by component names, except for absent and default ones
+    namedTypes = asn1Spec.getComponentType()
+    components = []
+    for idx in range(len(namedTypes)):
+        namedType = namedTypes[idx]
+        name = namedType.getName()
+        if name not in value:
+            if namedType.isOptional or namedType.isDefaulted:
+                continue
+            raise error.PyAsn1Error(
+                'Uninitialized component %s at %s' % (name, asn1Spec.prettyPrintType())
+                )
+        componentSpec = namedType.getType()
+        if namedType.isDefaulted and componentSpec == value[name]:
+            continue
+        components.append((componentSpec, value[name]))
+    return components
+
 tagMap = {
     eoo.endOfOctets.tagSet: EndOfOctetsEncoder(),
     univ.Boolean.tagSet: BooleanEncoder(),
@@ -400,11 +885,46 @@ typeMap = {
     }
 
 class Encoder:
-    def __init__(self, tagMap, typeMap={}):
+    # SequenceOf and SetOf values of at least parallelThreshold components
+    # are encoded by that many worker processes, if set. Each such value
+    # starts a pool of its own, so process startup cost is paid per value.
+    workers = None
+    parallelThreshold = 10000
+    def __init__(self, tagMap, typeMap={}, workers=None,
+                 parallelThreshold=None):
         self.__tagMap = tagMap
         self.__typeMap = typeMap
+        if workers is not None:
+            self.workers = workers
+        if parallelThreshold is not None:
+            self.parallelThreshold = parallelThreshold
+
+    def __call__(self, value, defMode=1, maxChunkSize=0, asn1Spec=None):
+        chunks = []
+        self.encodeChunks(value, defMode, maxChunkSize, chunks, asn1Spec)
+        try:
+            substrate = joinOcts(chunks)
+        except TypeError:  # streamed values are to be read out
+            substrate = joinOcts(_expandStreams(chunks))
+        debug.logger & debug.flagEncoder and debug.logger('built %s octets of substrate: %s\nencoder completed' % (len(substrate), debug.hexdump(substrate)))
+        return substrate
 
-    def __call__(self, value, defMode=1, maxChunkSize=0):
+    def encodeChunks(self, value, defMode, maxChunkSize, chunks,
+                     asn1Spec=None):
+        """Append encoding of value to chunks list, return its size"""
+        if asn1Spec is not None and not isinstance(value, base.Asn1Item):
+            # Python object encoded as ASN.1 spec says
+            debug.logger & debug.flagEncoder and debug.logger('encoder called in %sdef mode, chunk size %s for type %s, Python value: %r' % (not defMode and 'in' or '', maxChunkSize, asn1Spec.prettyPrintType(), value))
+            if asn1Spec.typeId is not None and \
+                   asn1Spec.typeId in self.__typeMap:
+                concreteEncoder = self.__typeMap[asn1Spec.typeId]
+            elif asn1Spec.baseTagSet in self.__tagMap:
+                concreteEncoder = self.__tagMap[asn1Spec.baseTagSet]
+            else:
+                raise Error('No encoder for %s' % (asn1Spec,))
+            return concreteEncoder.encodeNativeInto(
+                self, value, asn1Spec, defMode, maxChunkSize, chunks
+                )
         debug.logger & debug.flagEncoder and debug.logger('encoder called in %sdef mode, chunk size %s for type %s, value:\n%s' % (not defMode and 'in' or '', maxChunkSize, value.prettyPrintType(), value.prettyPrint()))
         tagSet = value.getTagSet()
         if len(tagSet) > 1:
@@ -421,10 +941,63 @@ class Encoder:
                 else:
                     raise Error('No encoder for %s' % (value,))
         debug.logger & debug.flagEncoder and debug.logger('using value codec %s chosen by %s' % (concreteEncoder.__class__.__name__, tagSet))
-        substrate = concreteEncoder.encode(
-            self, value, defMode, maxChunkSize
+        return concreteEncoder.encodeInto(
+            self, value, defMode, maxChunkSize, chunks
             )
-        debug.logger & debug.flagEncoder and debug.logger('built %s octets of substrate: %s\nencoder completed' % (len(substrate), debug.hexdump(substrate)))
-        return substrate
+
+    def encodeSegments(self, value, defMode=1, maxChunkSize=0,
+                       asn1Spec=None):
+        """Return encoding of value as a list of octets and buffer views
+
+        Header octets are interleaved with OctetString-based values octets,
+        which are referred to rather than copied. The list may be passed to
+        socket.sendmsg() or file writelines() as it is.
+        """
+        chunks = []
+        self.encodeChunks(value, defMode, maxChunkSize, chunks, asn1Spec)
+        return _expandStreams(chunks)
+
+    def encodeInto(self, value, buffer, offset=0, defMode=1, maxChunkSize=0,
+                   asn1Spec=None):
+        """Write encoding of value into buffer at offset, return offset past it
+
+        Buffer may be a bytearray, a writable memoryview, an mmap or any
+        other object supporting slice assignment. Buffer is not resized.
+        """
+        chunks = []
+        self.encodeChunks(value, defMode, maxChunkSize, chunks, asn1Spec)
+        chunks = _expandStreams(chunks)  # streamed values are sized as read
+        size = sum([ len(x) for x in chunks ])
+        if offset + size > len(buffer):
+            raise error.PyAsn1Error(
+                '%d-octet buffer short' % (offset + size - len(buffer))
+                )
+        for chunk in chunks:
+            buffer[offset:offset+len(chunk)] = chunk
+            offset = offset + len(chunk)
+        return offset
+
+    def encodeStream(self, value, fileObj, defMode=1, maxChunkSize=0,
+                     asn1Spec=None):
+        """Write encoding of value to fileObj, return number of octets written
+
+        Python value encoded under asn1Spec may have file objects or
+        iterators of octets in place of OCTET STRING or BIT STRING
+        values. Those are read and written out segment by segment
+        (in indefinite length mode only), so huge payloads are never
+        held in memory as a whole. Note that streamed BIT STRING comes
+        as octets (whole ones, no unused bits), while BIT STRING given
+        as Python value is a tuple of bits. Likewise, SEQUENCE OF components
+        taken from an iterator or a component source (see
+        SetOf.setComponentSource()) are encoded one by one as they
+        are written.
+        """
+        chunks = []
+        self.encodeChunks(value, defMode, maxChunkSize, chunks, asn1Spec)
+        size = 0
+        for chunk in _iterChunks(chunks):
+            fileObj.write(chunk)
+            size = size + len(chunk)
+        return size
 
 encode = Encoder(tagMap, typeMap)
@@ -0,0 +1,202 @@
+# BER TLV offset index
+import struct
+from pyasn1.type import tag
+from pyasn1.codec.ber import decoder
+from pyasn1.compat.octets import str2octs
+from pyasn1 import error
+
+# Index is a header followed by fixed size records, one per TLV, in the
+# order TLVs appear in substrate. Record holds number of enclosing TLV
+# record (noParent for top-level ones), position within enclosing TLV,
+# tag class & format octet, tag ID, header size, offset, contents length
+# (-1 for indefinite length encoding) and whole TLV size.
+
+indexMagic = str2octs('BERTLVI1')
+headerFormat = '>8sB'
+headerSize = struct.calcsize(headerFormat)
+recordFormat = '>IIBIHQqQ'
+recordSize = struct.calcsize(recordFormat)
+noParent = 0xFFFFFFFF
+# tag ID and header size record fields are 32 and 16 bit wide
+maxTagId = 0xFFFFFFFF
+maxHeaderSize = 0xFFFF
+
+class Index:
+    """Offsets of TLVs in BER encoded substrate, as built by buildIndex()
+
+    Records are (path, tag, offset, header size, contents length, size)
+    tuples, where path is a tuple of positions of the TLV and of
+    enclosing ones, starting with top-level item number. Contents length
+    is -1 for indefinite length encoding.
+
+    Index data may be any buffer, such as an mmap-ed sidecar file.
+    """
+    def __init__(self, data):
+        magic, maxDepth = struct.unpack_from(headerFormat, data, 0)
+        if magic != indexMagic:
+            raise error.PyAsn1Error('Not a TLV index')
+        if (len(data) - headerSize) % recordSize:
+            raise error.PyAsn1Error('Truncated TLV index')
+        self.__data = data
+        self.maxDepth = maxDepth
+
+    def __len__(self): return (len(self.__data) - headerSize) // recordSize
+
+    def __getRecord(self, idx):
+        if idx < 0 or idx >= len(self):
+            raise IndexError('Record index out of range')
+        return struct.unpack_from(
+            recordFormat, self.__data, headerSize + idx * recordSize
+            )
+
+    def __getitem__(self, idx):
+        if idx < 0:
+            idx = idx + len(self)
+        parent, position, tagClassFormat, tagId, size, offset, length, \
+                tlvSize = self.__getRecord(idx)
+        return self.getPath(idx), tag.Tag(
+            tagClassFormat&0xC0, tagClassFormat&0x20, tagId
+            ), offset, size, length, tlvSize
+
+    def getPath(self, idx):
+        """Return positions path of TLV record number idx"""
+        path = []
+        while idx != noParent:
+            record = self.__getRecord(idx)
+            path.insert(0, record[1])
+            idx = record[0]
+        return tuple(path)
+
+    def find(self, path):
+        """Return number of the record at positions path
+
+        Records follow in depth-first order, so they are sorted by path
+        and only about log2(len(self)) of them are looked at.
+        """
+        path = tuple(path)
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.getPath(mid) < path:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self) and self.getPath(lo) == path:
+            return lo
+        raise KeyError(path)
+
+    def readItem(self, fileObj, path):
+        """Return octets of TLV at positions path read off seekable fileObj"""
+        record = self.__getRecord(self.find(path))
+        offset, size = record[5], record[7]
+        fileObj.seek(offset)
+        substrate = fileObj.read(size)
+        if len(substrate) < size:
+            raise error.SubstrateUnderrunError(
+                '%d-octet short' % (size - len(substrate))
+                )
+        return substrate
+
+    def decodeItem(self, fileObj, path, asn1Spec=None,
+                   decodeFun=decoder.decode):
+        """Return value of TLV at positions path read off seekable fileObj"""
+        value, _ = decodeFun(self.readItem(fileObj, path), asn1Spec)
+        return value
+
+    def save(self, fileObj):
+        fileObj.write(self.__data)
+
+def loadIndex(fileObj):
+    """Return Index read off sidecar file object"""
+    return Index(fileObj.read())
+
+def buildIndex(substrate, maxDepth=1):
+    """Return Index of TLVs in substrate down to maxDepth nesting level
+
+    Top-level items are at level one. Substrate may be any buffer, a
+    multi-gigabyte file would best be mmap-ed. Just header octets are
+    read, contents of TLVs at maxDepth level and primitive ones are
+    skipped over.
+    """
+    data = bytearray(struct.pack(headerFormat, indexMagic, maxDepth))
+    # [record number, offset, contents end (None if indefinite length),
+    #  next component position] of TLVs being scanned into
+    stack = []
+    topPosition = offset = 0
+    while 1:
+        if stack:
+            entry = stack[-1]
+            if entry[2] is None:
+                t, length, size = decoder.decodeHeader(substrate, offset)
+                if decoder._isEndOfOctets(t, length):
+                    offset = offset + size
+                    entry[2] = offset
+            elif offset > entry[2]:
+                raise error.PyAsn1Error(
+                    'Component overruns enclosing value at %d' % entry[1]
+                    )
+            if offset == entry[2]:
+                # size of enclosing TLV is known at last
+                struct.pack_into(
+                    '>Q', data,
+                    headerSize + (entry[0] + 1) * recordSize - 8,
+                    offset - entry[1]
+                    )
+                del stack[-1]
+                continue
+            parent, position = entry[0], entry[3]
+            entry[3] = entry[3] + 1
+        elif offset >= len(substrate):
+            break
+        else:
+            parent, position = noParent, topPosition
+            topPosition = topPosition + 1
+        t, length, size = decoder.decodeHeader(substrate, offset)
+        if decoder._isEndOfOctets(t, length):
+            raise error.PyAsn1Error(
+                'Unexpected end-of-contents octets at %d' % offset
+                )
+        if t[2] > maxTagId or size > maxHeaderSize:
+            raise error.PyAsn1Error(
+                'Tag %s too large to index at %d' % (t, offset)
+                )
+        idx = (len(data) - headerSize) // recordSize
+        if t[1] == tag.tagFormatConstructed and len(stack) + 1 < maxDepth:
+            tlvSize = 0  # filled in once components are scanned
+            if length == -1:
+                stack.append([idx, offset, None, 0])
+            else:
+                stack.append([idx, offset, offset + size + length, 0])
+            nextOffset = offset + size
+        else:
+            nextOffset = decoder.skipItem(substrate, offset)
+            tlvSize = nextOffset - offset
+        data.extend(
+            struct.pack(recordFormat, parent, position, t[0]|t[1], t[2],
+                        size, offset, length, tlvSize)
+            )
+        offset = nextOffset
+    return Index(data)
+
+if __name__ == '__main__':
+    import sys, mmap
+    if len(sys.argv) not in (3, 4) or sys.argv[1] not in ('build', 'dump'):
+        sys.stderr.write('Usage: %s build <ber-file> [<depth>] | dump <index-file>\n' % sys.argv[0])
+        sys.exit(-1)
+    if sys.argv[1] == 'build':
+        f = open(sys.argv[2], 'rb')
+        try:
+            substrate = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, EnvironmentError):  # empty file
+            substrate = f.read()
+        maxDepth = len(sys.argv) == 4 and int(sys.argv[3]) or 1
+        index = buildIndex(substrate, maxDepth)
+        out = open(sys.argv[2] + '.idx', 'wb')
+        index.save(out)
+        out.close()
+        sys.stdout.write('%d TLVs indexed into %s.idx\n' % (len(index), sys.argv[2]))
+    else:
+        index = loadIndex(open(sys.argv[2], 'rb'))
+        for idx in range(len(index)):
+            path, t, offset, size, length, tlvSize = index[idx]
+            sys.stdout.write('%s %s offset %d header %d length %d size %d\n' % ('.'.join([ str(x) for x in path ]), t, offset, size, length, tlvSize))
@@ -0,0 +1,156 @@
+# Multiprocess BER codec front ends
+import sys
+from pyasn1.codec.ber import decoder
+from pyasn1.compat.octets import buf2octs, null
+from pyasn1 import error
+
+# Worker process state, set up once per process by pool initializer
+_worker = {}
+
+def _initDecoder(asn1Spec, decodeFun):
+    # anything failing here would have pool respawning workers forever
+    _worker['asn1Spec'] = asn1Spec
+    _worker['decodeFun'] = decodeFun
+
+def _decodeItem(substrate):
+    try:
+        value, rest = _worker['decodeFun'](
+            substrate, asn1Spec=_worker['asn1Spec']
+            )
+        if rest:
+            raise error.PyAsn1Error(
+                '%d octets of trailing substrate' % len(rest)
+                )
+    except error.PyAsn1Error:
+        return sys.exc_info()[1]
+    return value
+
+def decodeMany(blobs, asn1Spec=None, workers=None, chunksize=64,
+               decodeFun=decoder.decode, native=False):
+    """Decode independent encoded values in a pool of worker processes
+
+    Blobs (octets, each holding one encoded value) are passed to workers
+    in batches of chunksize. Spec and decoder are sent to each worker
+    once. With native set, workers decode into Python objects through
+    DecodePlan native mode. Those are way cheaper to pass back than ASN.1
+    objects, which drag their type objects through pickling. The plan
+    is compiled here, so spec errors are raised right away.
+
+    Yields decoded values in blobs order. Values that fail to decode
+    (or are followed by extra octets) come out as PyAsn1Error instances
+    in their places, other values are still decoded. Workers number
+    defaults to CPUs count, a single worker decodes in this process.
+    Lazy decoders are not accepted as their values can't be pickled.
+    """
+    if getattr(decodeFun, 'lazy', False):
+        raise error.PyAsn1Error(
+            'Lazily decoded values can\'t be passed back from workers'
+            )
+    if native:
+        asn1Spec = decoder.DecodePlan(asn1Spec, decodeFun, native=True)
+    return _decodeMany(blobs, asn1Spec, workers, chunksize, decodeFun)
+
+def _decodeMany(blobs, asn1Spec, workers, chunksize, decodeFun):
+    if workers == 1:
+        _initDecoder(asn1Spec, decodeFun)
+        for substrate in blobs:
+            yield _decodeItem(substrate)
+        return
+    import multiprocessing
+    pool = multiprocessing.Pool(
+        workers, _initDecoder, (asn1Spec, decodeFun)
+        )
+    try:
+        for value in pool.imap(_decodeItem, blobs, chunksize):
+            yield value
+    finally:
+        pool.terminate()
+
+def _initComponentsDecoder(decodeFun):
+    # nested values are decoded within this worker
+    decodeFun.workers = None
+    _worker['decodeFun'] = decodeFun
+
+def _decodeShard(task):
+    substrate, asn1Spec = task
+    decodeFun = _worker['decodeFun']
+    components = []
+    offset = 0
+    while offset < len(substrate):
+        component, offset = decodeFun.decodeAt(substrate, offset, asn1Spec)
+        components.append(component)
+    return components
+
+def decodeComponents(substrate, bounds, asn1Spec, decodeFun):
+    """Return list of components decoded by decodeFun.workers processes
+
+    Bounds are (start, end) offsets of encoded components in substrate,
+    as learnt from their headers. Runs of adjacent components are
+    decoded in worker processes (a few runs per worker) and joined in
+    order. Used by decoders having workers option set.
+    """
+    tasks = []
+    for start, end in _getShards(len(bounds), decodeFun.workers):
+        tasks.append(
+            (buf2octs(substrate[bounds[start][0]:bounds[end-1][1]]), asn1Spec)
+            )
+    components = []
+    for shard in _mapInPool(decodeFun.workers, _initComponentsDecoder,
+                            decodeFun, _decodeShard, tasks):
+        components.extend(shard)
+    return components
+
+def _initComponentsEncoder(encodeFun):
+    # nested values are encoded within this worker
+    encodeFun.workers = None
+    _worker['encodeFun'] = encodeFun
+
+def _encodeShard(task):
+    components, asn1Spec, defMode, maxChunkSize, sort = task
+    encodeFun = _worker['encodeFun']
+    substrates = [
+        encodeFun(c, defMode, maxChunkSize, asn1Spec) for c in components
+        ]
+    if sort:
+        substrates.sort()
+        return substrates
+    return null.join(substrates)
+
+def encodeComponents(components, asn1Spec, defMode, maxChunkSize, encodeFun,
+                     sort=False):
+    """Return encodings of components made by encodeFun.workers processes
+
+    Components (ASN.1 objects or, given asn1Spec, Python ones) are split
+    into runs of adjacent ones, a few runs per worker. Returns a list of
+    encoded runs in order or, if sort is set (as for DER SET OF), a list
+    of component encodings in ascending order: each run gets sorted by
+    its worker and sorted runs are merged then. Used by encoders having
+    workers option set.
+    """
+    tasks = []
+    for start, end in _getShards(len(components), encodeFun.workers):
+        tasks.append(
+            (components[start:end], asn1Spec, defMode, maxChunkSize, sort)
+            )
+    shards = _mapInPool(encodeFun.workers, _initComponentsEncoder,
+                        encodeFun, _encodeShard, tasks)
+    if sort:
+        import heapq
+        return list(heapq.merge(*shards))
+    return shards
+
+def _getShards(count, workers):
+    # (start, end) indices of a few runs of items per worker
+    shards = min(count, workers * 4)
+    return [ (count * idx // shards, count * (idx + 1) // shards)
+             for idx in range(shards) ]
+
+def _mapInPool(workers, initializer, codecFun, fun, tasks):
+    # pool lives as long as one value is being decoded or encoded, so
+    # that no worker processes outlive codec call
+    import multiprocessing
+    pool = multiprocessing.Pool(workers, initializer, (codecFun,))
+    try:
+        return pool.map(fun, tasks)
+    finally:
+        pool.terminate()
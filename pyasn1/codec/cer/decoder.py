@@ -9,6 +9,11 @@ class BooleanDecoder(decoder.AbstractSimpleDecoder):
     def valueDecoder(self, fullSubstrate, substrate, asn1Spec, tagSet, length,
                      state, decodeFun, substrateFun):
         head, tail = substrate[:length], substrate[length:]
+        return self._createComponent(
+            asn1Spec, tagSet, self._decodeContents(head, decodeFun)
+            ), tail
+
+    def _decodeContents(self, head, decodeFun):
         if not head:
             raise error.PyAsn1Error('Empty substrate')
         byte = oct2int(head[0])
@@ -16,12 +21,13 @@ class BooleanDecoder(decoder.AbstractSimpleDecoder):
         # BER allows any non-zero value as TRUE; cf. sections 8.2.2. and 11.1 
         # in http://www.itu.int/ITU-T/studygroups/com17/languages/X.690-0207.pdf
         if byte == 0xff:
-            value = 1
+            return 1
         elif byte == 0x00:
-            value = 0
+            return 0
         else:
             raise error.PyAsn1Error('Boolean CER violation: %s' % byte)
-        return self._createComponent(asn1Spec, tagSet, value), tail
+
+    def _toNative(self, value): return bool(value)
 
 tagMap = decoder.tagMap.copy()
 tagMap.update({
@@ -17,12 +17,30 @@ class BitStringEncoder(encoder.BitStringEncoder):
             self, encodeFun, client, defMode, 1000
             )
 
+    def encodeNativeValueInto(self, encodeFun, value, asn1Spec, defMode,
+                              maxChunkSize, chunks):
+        return encoder.BitStringEncoder.encodeNativeValueInto(
+            self, encodeFun, value, asn1Spec, defMode, 1000, chunks
+            )
+
 class OctetStringEncoder(encoder.OctetStringEncoder):
     def encodeValue(self, encodeFun, client, defMode, maxChunkSize):
         return encoder.OctetStringEncoder.encodeValue(
             self, encodeFun, client, defMode, 1000
             )
 
+    def encodeValueInto(self, encodeFun, client, defMode, maxChunkSize,
+                        chunks):
+        return encoder.OctetStringEncoder.encodeValueInto(
+            self, encodeFun, client, defMode, 1000, chunks
+            )
+
+    def encodeNativeValueInto(self, encodeFun, value, asn1Spec, defMode,
+                              maxChunkSize, chunks):
+        return encoder.OctetStringEncoder.encodeNativeValueInto(
+            self, encodeFun, value, asn1Spec, defMode, 1000, chunks
+            )
+
 class RealEncoder(encoder.RealEncoder):
     def _chooseEncBase(self, value):
         m, b, e = value
@@ -32,12 +50,20 @@ class RealEncoder(encoder.RealEncoder):
 # specialized GeneralizedTimeEncoder here
 # specialized UTCTimeEncoder here
 
+class SequenceEncoder(encoder.SequenceEncoder):
+    # original octets may not be in canonical form
+    reuseSubstrate = False
+
+class SequenceOfEncoder(encoder.SequenceOfEncoder):
+    reuseSubstrate = False
+
 class SetOfEncoder(encoder.SequenceOfEncoder):
-    def encodeValue(self, encodeFun, client, defMode, maxChunkSize):
+    def encodeValueInto(self, encodeFun, client, defMode, maxChunkSize,
+                        chunks):
         if isinstance(client, univ.SequenceAndSetBase):
             client.setDefaultComponents()
         client.verifySizeSpec()
-        substrate = null; idx = len(client)
+        idx = len(client)
         # This is certainly a hack but how else do I distinguish SetOf
         # from Set if they have the same tags&constraints?
         if isinstance(client, univ.SequenceAndSetBase):
@@ -52,21 +78,70 @@ class SetOfEncoder(encoder.SequenceOfEncoder):
                 comps.append(client[idx])
             comps.sort(key=lambda x: isinstance(x, univ.Choice) and \
                                      x.getMinTagSet() or x.getTagSet())
+            size = 0
             for c in comps:
-                substrate += encodeFun(c, defMode, maxChunkSize)
+                size = size + encodeFun.encodeChunks(
+                    c, defMode, maxChunkSize, chunks
+                    )
+            return size, 1
         else:
             # SetOf
             compSubs = []
+            if client.getComponentSource() is not None:
+                # can't sort components encodings without having them all
+                for c in client.getComponentSource():
+                    compSubs.append(
+                        encodeFun(c, defMode, maxChunkSize,
+                                  client.getComponentType())
+                        )
+                idx = 0
+            elif getattr(encodeFun, 'workers', None) and \
+                     idx >= encodeFun.parallelThreshold:
+                # components get sorted by workers, sorted runs are merged
+                return self._encodeInParallel(
+                    encodeFun, [ client[x] for x in range(idx) ], None,
+                    defMode, maxChunkSize, chunks, sort=True
+                    )
             while idx > 0:
                 idx = idx - 1
                 compSubs.append(
                     encodeFun(client[idx], defMode, maxChunkSize)
                     )
             compSubs.sort()  # perhaps padding's not needed
-            substrate = null
-            for compSub in compSubs:
-                substrate += compSub
-        return substrate, 1
+            chunks.extend(compSubs)
+            return sum([ len(x) for x in compSubs ]), 1
+
+    def encodeNativeValueInto(self, encodeFun, value, asn1Spec, defMode,
+                              maxChunkSize, chunks):
+        if isinstance(asn1Spec, univ.SequenceAndSetBase):
+            # Set
+            comps = encoder._getNativeComponents(value, asn1Spec)
+            comps.sort(key=lambda x: isinstance(x[0], univ.Choice) and \
+                                     x[0].getMinTagSet() or x[0].getTagSet())
+            size = 0
+            for s, c in comps:
+                size = size + encodeFun.encodeChunks(
+                    c, defMode, maxChunkSize, chunks, s
+                    )
+            return size, 1
+        else:
+            # SetOf
+            componentSpec = asn1Spec.getComponentType()
+            if encoder._isStream(value):
+                # components get sorted in memory anyway
+                value = list(value)
+            if getattr(encodeFun, 'workers', None) and \
+                   len(value) >= encodeFun.parallelThreshold:
+                return self._encodeInParallel(
+                    encodeFun, list(value), componentSpec, defMode,
+                    maxChunkSize, chunks, sort=True
+                    )
+            compSubs = [
+                encodeFun(c, defMode, maxChunkSize, componentSpec) for c in value
+                ]
+            compSubs.sort()
+            chunks.extend(compSubs)
+            return sum([ len(x) for x in compSubs ]), 1
 
 tagMap = encoder.tagMap.copy()
 tagMap.update({
@@ -74,18 +149,41 @@ tagMap.update({
     univ.BitString.tagSet: BitStringEncoder(),
     univ.OctetString.tagSet: OctetStringEncoder(),
     univ.Real.tagSet: RealEncoder(),
+    univ.SequenceOf.tagSet: SequenceOfEncoder(),
     univ.SetOf().tagSet: SetOfEncoder()  # conflcts with Set
     })
 
 typeMap = encoder.typeMap.copy()
 typeMap.update({
     univ.Set.typeId: SetOfEncoder(),
-    univ.SetOf.typeId: SetOfEncoder()
+    univ.SetOf.typeId: SetOfEncoder(),
+    univ.Sequence.typeId: SequenceEncoder(),
+    univ.SequenceOf.typeId: SequenceOfEncoder()
     })
 
 class Encoder(encoder.Encoder):
-    def __call__(self, client, defMode=0, maxChunkSize=0):
-        return encoder.Encoder.__call__(self, client, defMode, maxChunkSize)
+    def __call__(self, client, defMode=0, maxChunkSize=0, asn1Spec=None):
+        return encoder.Encoder.__call__(
+            self, client, defMode, maxChunkSize, asn1Spec
+            )
+
+    def encodeSegments(self, client, defMode=0, maxChunkSize=0,
+                       asn1Spec=None):
+        return encoder.Encoder.encodeSegments(
+            self, client, defMode, maxChunkSize, asn1Spec
+            )
+
+    def encodeInto(self, client, buffer, offset=0, defMode=0, maxChunkSize=0,
+                   asn1Spec=None):
+        return encoder.Encoder.encodeInto(
+            self, client, buffer, offset, defMode, maxChunkSize, asn1Spec
+            )
+
+    def encodeStream(self, client, fileObj, defMode=0, maxChunkSize=0,
+                     asn1Spec=None):
+        return encoder.Encoder.encodeStream(
+            self, client, fileObj, defMode, maxChunkSize, asn1Spec
+            )
 
 encode = Encoder(tagMap, typeMap)
 
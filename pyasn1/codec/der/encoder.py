@@ -22,7 +22,27 @@ tagMap.update({
 typeMap = encoder.typeMap
 
 class Encoder(encoder.Encoder):
-    def __call__(self, client, defMode=1, maxChunkSize=0):
-        return encoder.Encoder.__call__(self, client, defMode, maxChunkSize)
+    def __call__(self, client, defMode=1, maxChunkSize=0, asn1Spec=None):
+        return encoder.Encoder.__call__(
+            self, client, defMode, maxChunkSize, asn1Spec
+            )
+
+    def encodeSegments(self, client, defMode=1, maxChunkSize=0,
+                       asn1Spec=None):
+        return encoder.Encoder.encodeSegments(
+            self, client, defMode, maxChunkSize, asn1Spec
+            )
+
+    def encodeInto(self, client, buffer, offset=0, defMode=1, maxChunkSize=0,
+                   asn1Spec=None):
+        return encoder.Encoder.encodeInto(
+            self, client, buffer, offset, defMode, maxChunkSize, asn1Spec
+            )
+
+    def encodeStream(self, client, fileObj, defMode=1, maxChunkSize=0,
+                     asn1Spec=None):
+        return encoder.Encoder.encodeStream(
+            self, client, fileObj, defMode, maxChunkSize, asn1Spec
+            )
         
 encode = Encoder(tagMap, typeMap)
@@ -0,0 +1,15 @@
+from sys import version_info
+
+if version_info[0] <= 2:
+    from binascii import hexlify, unhexlify
+    def from_bytes(octets):
+        if not octets:
+            return 0
+        return long(hexlify(octets), 16)
+    def to_bytes(value, length):
+        if not length:
+            return ''
+        return unhexlify('%0*x' % (length * 2, value))
+else:
+    def from_bytes(octets): return int.from_bytes(octets, 'big')
+    def to_bytes(value, length): return value.to_bytes(length, 'big')
@@ -9,6 +9,12 @@ if version_info[0] <= 2:
     str2octs = lambda x: x
     octs2str = lambda x: x
     isOctetsType = lambda s: isinstance(s, str)
+    def buf2octs(s):
+        if isinstance(s, str):
+            return s
+        return s.tobytes()
+    def joinOcts(s):
+        return ''.join([ buf2octs(x) for x in s ])
 else:
     ints2octs = bytes
     int2oct = lambda x: ints2octs((x,))
@@ -18,3 +24,16 @@ else:
     str2octs = lambda x: x.encode()
     octs2str = lambda x: x.decode()
     isOctetsType = lambda s: isinstance(s, bytes)
+    def buf2octs(s):
+        if isinstance(s, bytes):
+            return s
+        return bytes(s)
+    joinOcts = null.join
+
+if version_info[0:2] < (2, 7):
+    # zero-copy buffer views are not available
+    memoryview = None
+    isBufferType = lambda s: False
+else:
+    memoryview = memoryview
+    isBufferType = lambda s: isinstance(s, memoryview)
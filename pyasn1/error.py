@@ -1,3 +1,4 @@
 class PyAsn1Error(Exception): pass
 class ValueConstraintError(PyAsn1Error): pass
 class SubstrateUnderrunError(PyAsn1Error): pass
+class LimitExceededError(PyAsn1Error): pass
@@ -52,12 +52,16 @@ class Asn1ItemBase(Asn1Item):
                (not matchConstraints or \
                 (self._subtypeSpec.isSuperTypeOf(other.getSubtypeSpec())))
 
-class NoValue:
+class NoValue(object):
     def __getattr__(self, attr):
         raise error.PyAsn1Error('No value for %s()' % attr)
     def __getitem__(self, i):
         raise error.PyAsn1Error('No value')
     def __repr__(self): return '%s()' % self.__class__.__name__
+    # pickled by reference, so that unpickled values still hold noValue
+    def __reduce__(self): return 'noValue'
+    def __copy__(self): return self
+    def __deepcopy__(self, memo): return self
     
 noValue = NoValue()
 
@@ -73,7 +77,8 @@ class AbstractSimpleAsn1Item(Asn1ItemBase):
         else:
             value = self.prettyIn(value)
             self._verifySubtypeSpec(value)
-            self.__hashedValue = hash(value)
+            # value may be a view over large substrate, hash it on demand
+            self.__hashedValue = None
         self._value = value
         self._len = None
         
@@ -99,7 +104,12 @@ class AbstractSimpleAsn1Item(Asn1ItemBase):
         def __nonzero__(self): return bool(self._value)
     else:
         def __bool__(self): return bool(self._value)
-    def __hash__(self): return self.__hashedValue
+    def __hash__(self):
+        if self.__hashedValue is None:
+            self.__hashedValue = self._hashValue()
+        return self.__hashedValue
+
+    def _hashValue(self): return hash(self._value)
 
     def clone(self, value=None, tagSet=None, subtypeSpec=None):
         if value is None and tagSet is None and subtypeSpec is None:
@@ -165,6 +175,8 @@ class AbstractSimpleAsn1Item(Asn1ItemBase):
 class AbstractConstructedAsn1Item(Asn1ItemBase):
     componentType = None
     sizeSpec = constraint.ConstraintsIntersection()
+    # components of lazily decoded value, see setLazyComponents()
+    _lazyComponents = None
     def __init__(self, componentType=None, tagSet=None,
                  subtypeSpec=None, sizeSpec=None):
         Asn1ItemBase.__init__(self, tagSet, subtypeSpec)
@@ -200,9 +212,67 @@ class AbstractConstructedAsn1Item(Asn1ItemBase):
     def __gt__(self, other): return self._componentValues > other
     def __ge__(self, other): return self._componentValues >= other
     if sys.version_info[0] <= 2:
-        def __nonzero__(self): return bool(self._componentValues)
+        def __nonzero__(self): return bool(len(self))
     else:
-        def __bool__(self): return bool(self._componentValues)
+        def __bool__(self): return bool(len(self))
+
+    def __getattr__(self, attr):
+        # whole components list of a lazily decoded value is requested,
+        # decode remaining components and turn into ordinary value
+        if attr != '_componentValues' or self._lazyComponents is None:
+            raise AttributeError(attr)
+        idx = len(self._lazyComponents)
+        while idx:
+            idx = idx - 1
+            self._getLazyComponent(idx)
+        self._componentValues = self._lazyComponents
+        self._lazyComponents = self._lazySubstrate = None
+        return self._componentValues
+
+    def setLazyComponents(self, substrate, components, decodeFun):
+        """Defer decoding of components until they are accessed
+
+        Components is a list of (start, end) offsets of each component
+        encoding within substrate or None for absent components. Components
+        are decoded by decodeFun on first access and cached.
+        """
+        self._lazySubstrate = substrate
+        self._lazyComponents = components
+        self._lazyDecodeFun = decodeFun
+        self._componentValuesSet = len([ x for x in components if x is not None ])
+        if '_componentValues' in self.__dict__:
+            del self._componentValues
+        return self
+
+    # lazily decoded value is pickled (or deep-copied) with all its
+    # components decoded, substrate and decoder are left behind
+    def __getstate__(self):
+        self._componentValues  # decodes remaining components
+        state = self.__dict__.copy()
+        if '_lazyDecodeFun' in state:
+            del state['_lazyDecodeFun']
+        return state
+
+    def _getLazyComponent(self, idx):
+        c = self._lazyComponents[idx]
+        if isinstance(c, tuple):
+            c, _ = self._lazyDecodeFun(
+                self._lazySubstrate[c[0]:c[1]], self._getComponentSpec(idx)
+                )
+            self._lazyComponents[idx] = c
+        return c
+
+    def _getComponentSpec(self, idx): return
+
+    def getOriginalSubstrate(self):
+        """Return encoded components of unmodified lazily decoded value"""
+        if self._lazyComponents is None:
+            return
+        for c in self._lazyComponents:
+            if isinstance(c, AbstractConstructedAsn1Item) and \
+                   c.getOriginalSubstrate() is None:
+                return
+        return self._lazySubstrate
 
     def getComponentTagMap(self):
         raise error.PyAsn1Error('Method not implemented')
@@ -266,9 +336,13 @@ class AbstractConstructedAsn1Item(Asn1ItemBase):
     def __getitem__(self, idx): return self.getComponentByPosition(idx)
     def __setitem__(self, idx, value): self.setComponentByPosition(idx, value)
 
-    def __len__(self): return len(self._componentValues)
+    def __len__(self):
+        if self._lazyComponents is not None:
+            return len(self._lazyComponents)
+        return len(self._componentValues)
     
     def clear(self):
         self._componentValues = []
         self._componentValuesSet = 0
+        self._lazyComponents = self._lazySubstrate = None
 
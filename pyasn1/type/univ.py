@@ -2,7 +2,8 @@
 import operator, sys, math
 from pyasn1.type import base, tag, constraint, namedtype, namedval, tagmap
 from pyasn1.codec.ber import eoo
-from pyasn1.compat import octets
+from pyasn1.compat import octets, integer
+from pyasn1.compat.binary import bin
 from pyasn1 import error
 
 # "Simple" ASN.1 types (yet incomplete)
@@ -152,6 +153,122 @@ class Boolean(Integer):
     subtypeSpec = Integer.subtypeSpec+constraint.SingleValueConstraint(0,1)
     namedValues = Integer.namedValues.clone(('False', 0), ('True', 1))
 
+class PackedBits:
+    """Immutable sequence of bits packed into an integer, BitString value
+
+    First bit is the most significant one of number. Compares, hashes
+    and indexes as a tuple of bits would, such a tuple is only built
+    on iteration or hashing.
+    """
+    def __init__(self, number=0, length=0):
+        self.number = number
+        self.length = length
+
+    def __repr__(self):
+        return '%s(%d, %d)' % (self.__class__.__name__, self.number, self.length)
+
+    def asBinary(self):
+        """Return bits as a string of 0 and 1 characters"""
+        if not self.length:
+            return ''
+        return bin(self.number)[2:].zfill(self.length)
+
+    def asTuple(self): return tuple([ int(x) for x in self.asBinary() ])
+
+    def __len__(self): return self.length
+    def __iter__(self): return iter(self.asTuple())
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(self.length)
+            if step != 1:
+                return _packBits(self.asTuple()[i])
+            if stop <= start:
+                return PackedBits()
+            return PackedBits(
+                (self.number >> (self.length - stop)) & \
+                ((1 << (stop - start)) - 1), stop - start
+                )
+        if i < 0:
+            i = i + self.length
+        if i < 0 or i >= self.length:
+            raise IndexError('bit index out of range')
+        return (self.number >> (self.length - 1 - i)) & 1
+
+    def __add__(self, other):
+        other = _toPackedBits(other)
+        if other is None:
+            return NotImplemented
+        return PackedBits(
+            self.number << other.length | other.number,
+            self.length + other.length
+            )
+    def __radd__(self, other):
+        other = _toPackedBits(other)
+        if other is None:
+            return NotImplemented
+        return other + self
+    def __mul__(self, value):
+        number = 0
+        for _ in range(value):
+            number = number << self.length | self.number
+        return PackedBits(number, self.length * max(value, 0))
+    def __rmul__(self, value): return self * value
+
+    def __cmp(self, other):
+        # as tuples of bits compare, that is lexicographically
+        bits = _toPackedBits(other)
+        if bits is None:
+            x, y = self.asTuple(), tuple(other)
+            return (x > y) - (x < y)
+        other = bits
+        length = min(self.length, other.length)
+        x = self.number >> (self.length - length)
+        y = other.number >> (other.length - length)
+        if x != y:
+            return x < y and -1 or 1
+        return (self.length > other.length) - (self.length < other.length)
+
+    def __eq__(self, other):
+        other = _toPackedBits(other)
+        return other is not None and self.length == other.length and \
+               self.number == other.number
+    def __ne__(self, other): return not self == other
+    def __lt__(self, other): return self.__cmp(other) < 0
+    def __le__(self, other): return self.__cmp(other) <= 0
+    def __gt__(self, other): return self.__cmp(other) > 0
+    def __ge__(self, other): return self.__cmp(other) >= 0
+    if sys.version_info[0] <= 2:
+        def __nonzero__(self): return self.length > 0
+    else:
+        def __bool__(self): return self.length > 0
+    def __hash__(self): return hash(self.asTuple())
+
+def _packBits(bits):
+    bits = tuple(bits)
+    for b in bits:
+        if b and b != 1:
+            raise error.PyAsn1Error(
+                'Non-binary BitString initializer \'%s\'' % (bits,)
+                )
+    if not bits:
+        return PackedBits()
+    return PackedBits(
+        int(''.join([ b and '1' or '0' for b in bits ]), 2), len(bits)
+        )
+
+def _toPackedBits(value):
+    # PackedBits out of anything BitString compares with, None if not
+    # made of bits
+    if isinstance(value, PackedBits):
+        return value
+    elif isinstance(value, BitString):
+        return value.asPackedBits()
+    elif isinstance(value, (tuple, list)):
+        try:
+            return _packBits(value)
+        except error.PyAsn1Error:
+            return
+
 class BitString(base.AbstractSimpleAsn1Item):
     tagSet = baseTagSet = tag.initTagSet(
         tag.Tag(tag.tagClassUniversal, tag.tagFormatSimple, 0x03)
@@ -202,10 +319,23 @@ class BitString(base.AbstractSimpleAsn1Item):
             namedValues = namedValues + self.__namedValues
         return self.__class__(value, tagSet, subtypeSpec, namedValues)
 
-    def __str__(self): return str(tuple(self))
+    def __str__(self): return str(self._value.asTuple())
+
+    def asPackedBits(self): return self._value
+    def asInteger(self):
+        """Return bits as an unsigned integer, first bit most significant"""
+        return self._value.number
+    def asOctets(self):
+        """Return bits packed into octets, last one padded with zero bits"""
+        length = self._value.length
+        return integer.to_bytes(
+            self._value.number << (-length % 8), (length + 7) // 8
+            )
 
     # Immutable sequence object protocol
 
+    def __iter__(self): return iter(self._value)
+
     def __len__(self):
         if self._len is None:
             self._len = len(self._value)
@@ -222,62 +352,57 @@ class BitString(base.AbstractSimpleAsn1Item):
     def __rmul__(self, value): return self * value
 
     def prettyIn(self, value):
-        r = []
-        if not value:
-            return ()
+        if isinstance(value, PackedBits):
+            return value
+        elif not value:
+            return PackedBits()
         elif isinstance(value, str):
             if value[0] == '\'':
                 if value[-2:] == '\'B':
-                    for v in value[1:-2]:
-                        if v == '0':
-                            r.append(0)
-                        elif v == '1':
-                            r.append(1)
-                        else:
+                    v = value[1:-2]
+                    for b in v:
+                        if b not in '01':
                             raise error.PyAsn1Error(
-                                'Non-binary BIT STRING initializer %s' % (v,)
+                                'Non-binary BIT STRING initializer %s' % (b,)
                                 )
-                    return tuple(r)
+                    return PackedBits(v and int(v, 2) or 0, len(v))
                 elif value[-2:] == '\'H':
-                    for v in value[1:-2]:
-                        i = 4
-                        v = int(v, 16)
-                        while i:
-                            i = i - 1
-                            r.append((v>>i)&0x01)
-                    return tuple(r)
+                    v = value[1:-2]
+                    for h in v:
+                        if h not in '0123456789abcdefABCDEF':
+                            raise error.PyAsn1Error(
+                                'Non-hexadecimal BIT STRING initializer %s' % (h,)
+                                )
+                    return PackedBits(v and int(v, 16) or 0, len(v) * 4)
                 else:
                     raise error.PyAsn1Error(
                         'Bad BIT STRING value notation %s' % (value,)
                         )                
             else:
+                r = []
                 for i in value.split(','):
                     j = self.__namedValues.getValue(i)
                     if j is None:
                         raise error.PyAsn1Error(
                             'Unknown bit identifier \'%s\'' % (i,)
                             )
-                    if j >= len(r):
-                        r.extend([0]*(j-len(r)+1))
-                    r[j] = 1
-                return tuple(r)
+                    r.append(j)
+                length = max(r) + 1
+                number = 0
+                for j in r:
+                    number = number | 1 << (length - 1 - j)
+                return PackedBits(number, length)
         elif isinstance(value, (tuple, list)):
-            r = tuple(value)
-            for b in r:
-                if b and b != 1:
-                    raise error.PyAsn1Error(
-                        'Non-binary BitString initializer \'%s\'' % (r,)
-                        )
-            return r
+            return _packBits(value)
         elif isinstance(value, BitString):
-            return tuple(value)
+            return value.asPackedBits()
         else:
             raise error.PyAsn1Error(
                 'Bad BitString initializer type \'%s\'' % (value,)
                 )
 
     def prettyOut(self, value):
-        return '\"\'%s\'B\"' % ''.join([str(x) for x in value])
+        return '\"\'%s\'B\"' % value.asBinary()
 
 try:
     all
@@ -308,7 +433,6 @@ class OctetString(base.AbstractSimpleAsn1Item):
             value = self.defaultHexValue
         if value is None or value is base.noValue:
             value = self.defaultBinValue
-        self.__asNumbersCache = None
         base.AbstractSimpleAsn1Item.__init__(self, value, tagSet, subtypeSpec)
 
     def clone(self, value=None, tagSet=None, subtypeSpec=None,
@@ -332,6 +456,9 @@ class OctetString(base.AbstractSimpleAsn1Item):
         def prettyIn(self, value):
             if isinstance(value, str):
                 return value
+            elif octets.isBufferType(value):
+                # keep buffer views (e.g. over a mmap) uncopied
+                return value
             elif isinstance(value, unicode):
                 try:
                     return value.encode(self._encoding)
@@ -352,6 +479,9 @@ class OctetString(base.AbstractSimpleAsn1Item):
         def prettyIn(self, value):
             if isinstance(value, bytes):
                 return value
+            elif octets.isBufferType(value):
+                # keep buffer views (e.g. over a mmap) uncopied
+                return value
             elif isinstance(value, str):
                 try:
                     return value.encode(self._encoding)
@@ -410,6 +540,7 @@ class OctetString(base.AbstractSimpleAsn1Item):
         return octets.ints2octs(r)
 
     def prettyOut(self, value):
+        value = octets.buf2octs(value)
         if sys.version_info[0] <= 2:
             numbers = tuple(( ord(x) for x in value ))
         else:
@@ -423,12 +554,13 @@ class OctetString(base.AbstractSimpleAsn1Item):
         r = []
         doHex = False
         if self._value is not self.defaultValue:
-            for x in self.asNumbers():
+            numbers = self.asNumbers()
+            for x in numbers:
                 if x < 32 or x > 126:
                     doHex = True
                     break
             if not doHex:
-                r.append('%r' % (self._value,))
+                r.append('%r' % (self.asOctets(),))
         if self._tagSet is not self.tagSet:
             r.append('tagSet=%r' % (self._tagSet,))
         if self._subtypeSpec is not self.subtypeSpec:
@@ -436,26 +568,36 @@ class OctetString(base.AbstractSimpleAsn1Item):
         if self.encoding is not self._encoding:
             r.append('encoding=%r' % (self._encoding,))
         if doHex:
-            r.append('hexValue=%r' % ''.join([ '%.2x' % x for x in self.asNumbers() ]))
+            r.append('hexValue=%r' % ''.join([ '%.2x' % x for x in numbers ]))
         return '%s(%s)' % (self.__class__.__name__, ', '.join(r))
                                 
     if sys.version_info[0] <= 2:
-        def __str__(self): return str(self._value)
+        def __str__(self): return self.asOctets()
         def __unicode__(self):
-            return self._value.decode(self._encoding, 'ignore')
-        def asOctets(self): return self._value
-        def asNumbers(self):
-            if self.__asNumbersCache is None:
-                self.__asNumbersCache = tuple([ ord(x) for x in self._value ])
-            return self.__asNumbersCache
+            return self.asOctets().decode(self._encoding, 'ignore')
+        def asOctets(self): return octets.buf2octs(self._value)
+        def asNumbers(self): return tuple([ ord(x) for x in self._value ])
     else:
-        def __str__(self): return self._value.decode(self._encoding, 'ignore')
-        def __bytes__(self): return self._value
-        def asOctets(self): return self._value
-        def asNumbers(self):
-            if self.__asNumbersCache is None:
-                self.__asNumbersCache = tuple(self._value)
-            return self.__asNumbersCache
+        def __str__(self): return self.asOctets().decode(self._encoding, 'ignore')
+        def __bytes__(self): return self.asOctets()
+        def asOctets(self): return octets.buf2octs(self._value)
+        def asNumbers(self): return tuple(self._value)
+
+    # octets or buffer view (as initialized), not copied
+    def asBuffer(self): return self._value
+
+    def _hashValue(self):
+        try:
+            return hash(self._value)
+        except (TypeError, ValueError):  # view over a writable buffer
+            return hash(self.asOctets())
+
+    # buffer views are pickled as octets
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if octets.isBufferType(self._value):
+            state['_value'] = octets.buf2octs(self._value)
+        return state
  
     # Immutable sequence object protocol
     
@@ -465,16 +607,29 @@ class OctetString(base.AbstractSimpleAsn1Item):
         return self._len
     def __getitem__(self, i):
         if isinstance(i, slice):
-            return self.clone(operator.getitem(self._value, i))
+            # contiguous slices are views over value octets, not copies
+            value = self._value
+            if octets.memoryview is not None and i.step in (None, 1) and \
+                   not octets.isBufferType(value):
+                value = octets.memoryview(value)
+            return self.clone(operator.getitem(value, i))
         else:
             return self._value[i]
 
-    def __add__(self, value): return self.clone(self._value + self.prettyIn(value))
-    def __radd__(self, value): return self.clone(self.prettyIn(value) + self._value)
-    def __mul__(self, value): return self.clone(self._value * value)
+    def __add__(self, value):
+        return self.clone(self.asOctets() + octets.buf2octs(self.prettyIn(value)))
+    def __radd__(self, value):
+        return self.clone(octets.buf2octs(self.prettyIn(value)) + self.asOctets())
+    def __mul__(self, value): return self.clone(self.asOctets() * value)
     def __rmul__(self, value): return self * value
-    def __int__(self): return int(self._value)
-    def __float__(self): return float(self._value)
+    def __int__(self): return int(self.asOctets())
+    def __float__(self): return float(self.asOctets())
+
+    # buffer views do not support ordering
+    def __lt__(self, other): return self.asOctets() < other
+    def __le__(self, other): return self.asOctets() <= other
+    def __gt__(self, other): return self.asOctets() > other
+    def __ge__(self, other): return self.asOctets() >= other
     
 class Null(OctetString):
     defaultValue = ''.encode()  # This is tightly constrained
@@ -720,8 +875,28 @@ class SetOf(base.AbstractConstructedAsn1Item):
         )
     typeId = 1
     strictConstraints = False
+    # iterable components are taken from, see setComponentSource()
+    _componentSource = None
+
+    def setComponentSource(self, source):
+        """Take components from iterable source as value is encoded
+
+        Components (ASN.1 objects or Python values of component type) are
+        not stored in the value but encoded one by one, so the size of
+        encoded list is not limited by memory. Indefinite length mode
+        encoders iterate source once; definite length mode encoders
+        iterate it twice, once for just computing encoding length, so
+        source must not be an iterator then (a list or an object whose
+        __iter__() calls a generator would do).
+        """
+        self._componentSource = source
+        return self
+
+    def getComponentSource(self): return self._componentSource
 
     def _cloneComponentValues(self, myClone, cloneValueFlag):
+        if self._componentSource is not None:
+            myClone.setComponentSource(self._componentSource)
         idx = 0; l = len(self._componentValues)
         while idx < l:
             c = self._componentValues[idx]
@@ -744,11 +919,16 @@ class SetOf(base.AbstractConstructedAsn1Item):
                 not t.isSuperTypeOf(value, matchTags=False):
             raise error.PyAsn1Error('Component value is constraints-incompatible: %r vs %r' % (value, t))
 
-    def getComponentByPosition(self, idx): return self._componentValues[idx]
+    def _getComponentSpec(self, idx): return self._componentType
+
+    def getComponentByPosition(self, idx):
+        if self._lazyComponents is not None:
+            return self._getLazyComponent(idx)
+        return self._componentValues[idx]
     def setComponentByPosition(self, idx, value=None, verifyConstraints=True):
         l = len(self._componentValues)
         if idx >= l:
-            self._componentValues = self._componentValues + (idx-l+1)*[None]
+            self._componentValues.extend((idx-l+1)*[None])
         if value is None:
             if self._componentValues[idx] is None:
                 if self._componentType is None:
@@ -859,8 +1039,14 @@ class SequenceAndSetBase(base.AbstractConstructedAsn1Item):
             self._componentType.getPositionByName(name),value,verifyConstraints
         )
 
+    def _getComponentSpec(self, idx):
+        if self._componentTypeLen:
+            return self._componentType.getTypeByPosition(idx)
+
     def getComponentByPosition(self, idx):
         try:
+            if self._lazyComponents is not None:
+                return self._getLazyComponent(idx)
             return self._componentValues[idx]
         except IndexError:
             if idx < self._componentTypeLen:
@@ -873,7 +1059,7 @@ class SequenceAndSetBase(base.AbstractConstructedAsn1Item):
                                matchConstraints=True):
         l = len(self._componentValues)
         if idx >= l:
-            self._componentValues = self._componentValues + (idx-l+1)*[None]
+            self._componentValues.extend((idx-l+1)*[None])
         if value is None:
             if self._componentValues[idx] is None:
                 self._componentValues[idx] = self._componentType.getTypeByPosition(idx).clone()
@@ -1075,7 +1261,7 @@ class Choice(Set):
     def setComponentByPosition(self, idx, value=None, verifyConstraints=True):
         l = len(self._componentValues)
         if idx >= l:
-            self._componentValues = self._componentValues + (idx-l+1)*[None]
+            self._componentValues.extend((idx-l+1)*[None])
         if self._currentIdx is not None:
             self._componentValues[self._currentIdx] = None
         if value is None:
@@ -1,7 +1,7 @@
 from sys import path, version_info
 from os.path import sep
 path.insert(1, path[0]+sep+'ber')
-import test_encoder, test_decoder
+import test_encoder, test_decoder, test_index, test_parallel, test_aio
 from pyasn1.error import PyAsn1Error
 if version_info[0:2] < (2, 7) or \
    version_info[0:2] in ( (3, 0), (3, 1) ):
@@ -14,7 +14,7 @@ else:
 
 suite = unittest.TestSuite()
 loader = unittest.TestLoader()
-for m in (test_encoder, test_decoder):
+for m in (test_encoder, test_decoder, test_index, test_parallel, test_aio):
     suite.addTest(loader.loadTestsFromModule(m))
 
 def runTests(): unittest.TextTestRunner(verbosity=2).run(suite)
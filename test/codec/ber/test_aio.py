@@ -0,0 +1,116 @@
+from pyasn1.type import tag, univ
+from pyasn1.compat.octets import ints2octs, str2octs
+from pyasn1.codec.ber import decoder
+from pyasn1.error import SubstrateUnderrunError, LimitExceededError
+from sys import version_info
+if version_info[0:2] < (2, 7) or \
+   version_info[0:2] in ( (3, 0), (3, 1) ):
+    try:
+        import unittest2 as unittest
+    except ImportError:
+        import unittest
+else:
+    import unittest
+
+if version_info[0:2] >= (3, 6):
+    import asyncio
+    from pyasn1.codec.ber import aio
+
+    def readAll(substrate, asn1Spec=None, decodeFun=decoder.decode):
+        # drives async generator without async syntax
+        loop = asyncio.new_event_loop()
+        try:
+            reader = asyncio.StreamReader(loop=loop)
+            reader.feed_data(substrate)
+            reader.feed_eof()
+            messages = aio.readMessages(reader, asn1Spec, decodeFun)
+            values = []
+            while 1:
+                try:
+                    values.append(
+                        loop.run_until_complete(messages.__anext__())
+                        )
+                except StopAsyncIteration:
+                    return values
+        finally:
+            loop.close()
+
+    class ReadMessagesTestCase(unittest.TestCase):
+        def testDefMode(self):
+            assert readAll(
+                ints2octs((2, 1, 12, 4, 3, 102, 111, 120))
+                ) == [12, str2octs('fox')]
+
+        def testIndefMode(self):
+            assert readAll(
+                ints2octs((48, 128, 36, 128, 4, 1, 102, 0, 0, 2, 1, 1, 0, 0, 5, 0))
+                ) == [[str2octs('f'), 1], univ.Null()]
+
+        def testLongHeader(self):
+            substrate = ints2octs((4, 129, 200)) + str2octs('x') * 200
+            values = readAll(substrate * 2, univ.OctetString())
+            assert values == [str2octs('x') * 200] * 2
+
+        def testLongTag(self):
+            s = univ.OctetString().subtype(
+                implicitTag=tag.Tag(tag.tagClassApplication, tag.tagFormatSimple, 128)
+                )
+            assert readAll(
+                ints2octs((95, 129, 0, 1, 5)), s
+                ) == [ints2octs((5,))]
+
+        def testDeepNesting(self):
+            values = readAll(ints2octs((48, 128) * 5000 + (0, 0) * 5000))
+            assert len(values) == 1
+
+        def testLengthLimit(self):
+            decodeFun = decoder.Decoder(
+                decoder.tagMap, decoder.typeMap, maxLength=10
+                )
+            for substrate in ((4, 132, 127, 255, 255, 255),
+                              (48, 128, 4, 132, 127, 255, 255, 255)):
+                try:
+                    readAll(ints2octs(substrate), decodeFun=decodeFun)
+                except LimitExceededError:
+                    pass
+                else:
+                    assert 0, 'limit not enforced'
+
+        def testDepthLimit(self):
+            decodeFun = decoder.Decoder(
+                decoder.tagMap, decoder.typeMap, maxDepth=2
+                )
+            assert readAll(
+                ints2octs((48, 128, 48, 128, 0, 0, 0, 0)), decodeFun=decodeFun
+                ) == [[[]]]
+            try:
+                readAll(ints2octs((48, 128) * 3), decodeFun=decodeFun)
+            except LimitExceededError:
+                pass
+            else:
+                assert 0, 'limit not enforced'
+
+        def testTruncated(self):
+            try:
+                readAll(ints2octs((4, 3, 102)))
+            except SubstrateUnderrunError:
+                pass
+            else:
+                assert 0, 'truncated message tolerated'
+
+    class DecodeInSlicesTestCase(unittest.TestCase):
+        def testDecode(self):
+            loop = asyncio.new_event_loop()
+            try:
+                value, rest = loop.run_until_complete(
+                    aio.decodeInSlices(
+                        ints2octs((48, 9, 2, 1, 1, 2, 1, 2, 2, 1, 3, 5, 0)),
+                        itemsPerStep=1
+                        )
+                    )
+            finally:
+                loop.close()
+            assert value == [1, 2, 3]
+            assert rest == ints2octs((5, 0))
+
+if __name__ == '__main__': unittest.main()
@@ -1,8 +1,13 @@
 from pyasn1.type import tag, namedtype, univ
-from pyasn1.codec.ber import decoder, eoo
+from pyasn1.codec.ber import decoder, encoder, eoo
 from pyasn1.compat.octets import ints2octs, str2octs, null
-from pyasn1.error import PyAsn1Error
-from sys import version_info
+from pyasn1.error import PyAsn1Error, LimitExceededError
+from sys import version_info, getrecursionlimit
+import copy, pickle
+try:
+    from io import BytesIO
+except ImportError:
+    from StringIO import StringIO as BytesIO
 if version_info[0:2] < (2, 7) or \
    version_info[0:2] in ( (3, 0), (3, 1) ):
     try:
@@ -89,6 +94,14 @@ class BitStringDecoderTestCase(unittest.TestCase):
         assert decoder.decode(
             ints2octs((35, 128, 3, 2, 0, 169, 3, 2, 1, 138, 0, 0))
             ) == ((1,0,1,0,1,0,0,1,1,0,0,0,1,0,1), null)
+    def testIndefModeMisalignedChunks(self):
+        assert decoder.decode(
+            ints2octs((35, 128, 3, 2, 1, 168, 3, 2, 1, 138, 0, 0))
+            ) == ((1,0,1,0,1,0,0,1,0,0,0,1,0,1), null)
+    def testIndefModeNestedChunks(self):
+        assert decoder.decode(
+            ints2octs((35, 128, 35, 128, 3, 2, 0, 169, 0, 0, 3, 2, 1, 138, 0, 0))
+            ) == ((1,0,1,0,1,0,0,1,1,0,0,0,1,0,1), null)
     def testDefModeChunkedSubst(self):
         assert decoder.decode(
             ints2octs((35, 8, 3, 2, 0, 169, 3, 2, 1, 138)),
@@ -124,6 +137,14 @@ class OctetStringDecoderTestCase(unittest.TestCase):
         assert decoder.decode(
             ints2octs((36, 128, 4, 4, 81, 117, 105, 99, 4, 4, 107, 32, 98, 114, 4, 4, 111, 119, 110, 32, 4, 3, 102, 111, 120, 0, 0))
             ) == (str2octs('Quick brown fox'), null)
+    def testIndefModeNestedChunks(self):
+        assert decoder.decode(
+            ints2octs((36, 128, 36, 128, 4, 2, 81, 117, 0, 0, 4, 1, 105, 0, 0))
+            ) == (str2octs('Qui'), null)
+    def testIndefModeManyChunks(self):
+        assert decoder.decode(
+            ints2octs((36, 128) + (4, 1, 120) * 10000 + (0, 0))
+            ) == (str2octs('x' * 10000), null)
     def testDefModeChunkedSubst(self):
         assert decoder.decode(
             ints2octs((36, 23, 4, 4, 81, 117, 105, 99, 4, 4, 107, 32, 98, 114, 4, 4, 111, 119, 110, 32, 4, 3, 102, 111, 120)),
@@ -661,6 +682,692 @@ class AnyDecoderTestCase(unittest.TestCase):
             substrateFun=lambda a,b,c: (b,c)
         ) == (ints2octs((164, 5, 4, 3, 102, 111, 120)), 7)
 
+class BufferSubstrateTestCase(unittest.TestCase):
+    def setUp(self):
+        self.substrate = ints2octs((48, 8, 2, 1, 12, 4, 3, 102, 111, 120, 2, 1, 1))
+
+    def testOctetsRemainder(self):
+        value, rest = decoder.decode(self.substrate)
+        assert value[1] == str2octs('fox')
+        assert rest == ints2octs((2, 1, 1))
+        assert type(rest) == type(self.substrate)
+
+    def testByteArray(self):
+        value, rest = decoder.decode(bytearray(self.substrate))
+        assert value[0] == 12 and value[1] == str2octs('fox')
+        assert rest == ints2octs((2, 1, 1))
+
+    def testMemoryView(self):
+        value, rest = decoder.decode(memoryview(self.substrate)[10:])
+        assert value == 1
+        assert rest == null
+
+    def testDecodeAt(self):
+        value, offset = decoder.decode.decodeAt(self.substrate)
+        assert value[1] == str2octs('fox') and offset == 10
+        value, offset = decoder.decode.decodeAt(self.substrate, offset)
+        assert value == 1 and offset == len(self.substrate)
+
+    def testDecodeAtUnderrun(self):
+        try:
+            decoder.decode.decodeAt(self.substrate[:-1], 10)
+        except PyAsn1Error:
+            pass
+        else:
+            assert 0, 'short substrate tolerated'
+
+class SubstrateViewTestCase(unittest.TestCase):
+    def setUp(self):
+        self.decoder = decoder.Decoder(
+            decoder.tagMap, decoder.typeMap, viewThreshold=4
+            )
+        self.substrate = bytearray(
+            ints2octs((48, 11, 4, 3, 102, 111, 120, 4, 4, 113, 117, 105, 99))
+            )
+
+    def testViews(self):
+        value, rest = self.decoder(self.substrate)
+        assert value[0] == str2octs('fox') and value[1] == str2octs('quic')
+        assert isinstance(value[0].asOctets(), bytes)
+        assert not isinstance(value[0]._value, memoryview)
+        assert isinstance(value[1]._value, memoryview)
+        self.substrate[12] = 107
+        assert value[1] == str2octs('quik')
+
+    def testDefault(self):
+        value, rest = decoder.decode(self.substrate)
+        assert not isinstance(value[1]._value, memoryview)
+
+class IncrementalDecoderTestCase(unittest.TestCase):
+    def setUp(self):
+        self.substrate = ints2octs(
+            (48, 8, 2, 1, 12, 4, 3, 102, 111, 120) +
+            (36, 128, 4, 2, 102, 111, 36, 128, 4, 1, 120, 0, 0, 0, 0) +
+            (2, 1, 1)
+            )
+
+    def __feed(self, step):
+        d = decoder.IncrementalDecoder()
+        values = []
+        for idx in range(0, len(self.substrate), step):
+            values.extend(d.feed(self.substrate[idx:idx+step]))
+        assert d.isIdle()
+        return values
+
+    def testOctetByOctet(self):
+        values = self.__feed(1)
+        assert len(values) == 3
+        assert values[0][0] == 12 and values[0][1] == str2octs('fox')
+        assert values[1] == str2octs('fox')
+        assert values[2] == 1
+
+    def testAllAtOnce(self):
+        assert self.__feed(len(self.substrate)) == self.__feed(4)
+
+    def testWithoutMemoryview(self):
+        values = self.__feed(3)
+        memoryview = decoder.memoryview
+        decoder.memoryview = None  # as on Python < 2.7
+        try:
+            assert self.__feed(3) == values
+        finally:
+            decoder.memoryview = memoryview
+
+    def testPartial(self):
+        d = decoder.IncrementalDecoder(asn1Spec=univ.OctetString())
+        assert d.feed(self.substrate[10:20]) == []
+        assert not d.isIdle()
+        assert d.feed(self.substrate[20:25]) == [str2octs('fox')]
+        assert d.isIdle()
+
+    def testUnexpectedEoo(self):
+        try:
+            decoder.IncrementalDecoder().feed(ints2octs((0, 0)))
+        except PyAsn1Error:
+            pass
+        else:
+            assert 0, 'end-of-contents octets accepted at top level'
+
+    def testLimits(self):
+        decodeFun = decoder.Decoder(
+            decoder.tagMap, decoder.typeMap, maxLength=10, maxDepth=2
+            )
+        for substrate in ((4, 132, 127, 255, 255, 255),
+                          (48, 128, 4, 132, 127, 255, 255, 255),
+                          (48, 128) * 3):
+            try:
+                decoder.IncrementalDecoder(decodeFun=decodeFun).feed(
+                    ints2octs(substrate)
+                    )
+            except LimitExceededError:
+                pass
+            else:
+                assert 0, 'limit not enforced on header'
+
+class StreamDecoderTestCase(unittest.TestCase):
+    def setUp(self):
+        self.substrate = ints2octs(
+            (4, 3, 102, 111, 120, 0, 0, 255) +
+            (36, 128, 4, 2, 102, 111, 4, 1, 120, 0, 0, 255) +
+            (2, 1, 1)
+            )
+
+    def testOffsets(self):
+        values = list(
+            decoder.decodeStream(BytesIO(self.substrate),
+                                 filler=ints2octs((0, 255)), chunkSize=3)
+            )
+        assert values == [ (str2octs('fox'), 0),
+                           (str2octs('fox'), 8),
+                           (1, 20) ]
+
+    def testResume(self):
+        values = list(
+            decoder.decodeStream(BytesIO(self.substrate[20:]), offset=20)
+            )
+        assert values == [ (1, 20) ]
+
+    def testSpec(self):
+        values = list(
+            decoder.decodeStream(BytesIO(self.substrate[:5]),
+                                 asn1Spec=univ.OctetString())
+            )
+        assert values == [ (str2octs('fox'), 0) ]
+
+    def testFillerRequired(self):
+        try:
+            list(decoder.decodeStream(BytesIO(self.substrate)))
+        except PyAsn1Error:
+            pass
+        else:
+            assert 0, 'filler octets taken for items'
+
+    def testTruncated(self):
+        try:
+            list(decoder.decodeStream(BytesIO(self.substrate[:-1])))
+        except PyAsn1Error:
+            pass
+        else:
+            assert 0, 'truncated stream tolerated'
+
+    def testLengthLimit(self):
+        decodeFun = decoder.Decoder(
+            decoder.tagMap, decoder.typeMap, maxLength=10
+            )
+        try:
+            list(decoder.decodeStream(
+                BytesIO(ints2octs((4, 132, 127, 255, 255, 255))),
+                decodeFun=decodeFun
+                ))
+        except LimitExceededError:
+            pass
+        else:
+            assert 0, 'limit not enforced on header'
+
+class LazyDecoderTestCase(unittest.TestCase):
+    def setUp(self):
+        self.s = univ.Sequence(componentType=namedtype.NamedTypes(
+            namedtype.NamedType('place-holder', univ.Null(null)),
+            namedtype.OptionalNamedType('first-name', univ.OctetString(null).subtype(explicitTag=tag.Tag(tag.tagClassContext, tag.tagFormatSimple, 0))),
+            namedtype.DefaultedNamedType('age', univ.Integer(33)),
+            namedtype.NamedType('children', univ.SequenceOf(componentType=univ.Integer()))
+            ))
+        self.decode = decoder.Decoder(decoder.tagMap, decoder.typeMap, lazy=True)
+        # indefinite length and constructed string are not re-encoded
+        self.substrate = ints2octs((48, 128, 5, 0, 160, 128, 36, 128, 4, 2, 113, 117, 4, 1, 105, 0, 0, 0, 0, 48, 6, 2, 1, 1, 2, 1, 2, 0, 0))
+
+    def testDecodeOnAccess(self):
+        s, rest = self.decode(self.substrate, asn1Spec=self.s)
+        assert rest == null
+        assert s.getOriginalSubstrate() is not None
+        assert len(s) == 4
+        assert len(s['children']) == 2
+        assert s['children'][1] == 2
+        assert s.getComponentByName('first-name') == str2octs('qui')
+        assert s['age'] == 33
+
+    def testSpecless(self):
+        s, rest = self.decode(self.substrate)
+        assert rest == null
+        assert s == decoder.decode(self.substrate)[0]
+
+    def testMaterialize(self):
+        s, _ = self.decode(self.substrate, asn1Spec=self.s)
+        t, _ = decoder.decode(self.substrate, asn1Spec=self.s)
+        assert s == t
+
+    def testPickle(self):
+        s, _ = self.decode(self.substrate, asn1Spec=self.s)
+        t, _ = decoder.decode(self.substrate, asn1Spec=self.s)
+        assert pickle.loads(pickle.dumps(s)) == t
+        s, _ = self.decode(self.substrate, asn1Spec=self.s)
+        assert copy.deepcopy(s) == t
+        assert s.prettyPrint() == t.prettyPrint()
+        assert s.getOriginalSubstrate() is None
+
+    def testReencodeUntouched(self):
+        s, _ = self.decode(self.substrate, asn1Spec=self.s)
+        assert s['first-name'] == str2octs('qui')
+        assert encoder.encode(s, defMode=False) == self.substrate
+
+    def testReencodeModified(self):
+        s, _ = self.decode(self.substrate, asn1Spec=self.s)
+        s['children'][1] = 3
+        assert s.getOriginalSubstrate() is None
+        assert encoder.encode(s) == ints2octs((48, 17, 5, 0, 160, 5, 4, 3, 113, 117, 105, 48, 6, 2, 1, 1, 2, 1, 3))
+
+    def testMissingComponent(self):
+        try:
+            self.decode(ints2octs((48, 2, 5, 0)), asn1Spec=self.s)
+        except PyAsn1Error:
+            pass
+        else:
+            assert 0, 'missing mandatory component tolerated'
+
+class DeferredDecoderTestCase(unittest.TestCase):
+    def setUp(self):
+        self.children = univ.SequenceOf(componentType=univ.Integer())
+        self.s = univ.Sequence(componentType=namedtype.NamedTypes(
+            namedtype.NamedType('place-holder', univ.Null(null)),
+            namedtype.NamedType('children', self.children),
+            namedtype.NamedType('age', univ.Integer())
+            ))
+        self.decode = decoder.Decoder(
+            decoder.tagMap, decoder.typeMap, deferred=(self.children,)
+            )
+
+    def testDefMode(self):
+        s, rest = self.decode(
+            ints2octs((48, 13, 5, 0, 48, 6, 2, 1, 1, 2, 1, 2, 2, 1, 33)),
+            asn1Spec=self.s
+            )
+        assert rest == null
+        assert s['age'] == 33
+        assert len(s['children']) == 0
+        assert list(s['children'].getComponentSource()) == [1, 2]
+        assert list(s['children'].getComponentSource()) == [1, 2]
+
+    def testIndefMode(self):
+        s, rest = self.decode(
+            ints2octs((48, 128, 5, 0, 48, 128, 2, 1, 1, 2, 1, 2, 0, 0, 2, 1, 33, 0, 0)),
+            asn1Spec=self.s
+            )
+        assert rest == null
+        assert s['age'] == 33
+        assert list(s['children'].getComponentSource()) == [1, 2]
+
+    def testReencode(self):
+        substrate = ints2octs((48, 13, 5, 0, 48, 6, 2, 1, 1, 2, 1, 2, 2, 1, 33))
+        s, _ = self.decode(substrate, asn1Spec=self.s)
+        assert encoder.encode(s) == substrate
+
+    def testOtherSpec(self):
+        s, _ = self.decode(
+            ints2octs((48, 6, 2, 1, 1, 2, 1, 2)),
+            asn1Spec=univ.SequenceOf(componentType=univ.Integer())
+            )
+        assert s.getComponentSource() is None
+        assert list(s) == [1, 2]
+
+class SequenceOfViewTestCase(unittest.TestCase):
+    def setUp(self):
+        self.s = univ.SequenceOf(componentType=univ.Integer())
+
+    def testDefMode(self):
+        view = decoder.SequenceOfView(
+            ints2octs((48, 9, 2, 1, 1, 2, 1, 3, 2, 1, 5)), self.s
+            )
+        assert len(view) == 3
+        assert view[1] == 3
+        assert view[-1] == 5
+        assert view[1:] == [3, 5]
+        assert list(view) == [1, 3, 5]
+
+    def testIndefMode(self):
+        view = decoder.SequenceOfView(
+            ints2octs((48, 128, 2, 1, 1, 2, 1, 3, 2, 1, 5, 0, 0)), self.s
+            )
+        assert len(view) == 3
+        assert view[2] == 5
+
+    def testExplicitTag(self):
+        s = self.s.subtype(
+            explicitTag=tag.Tag(tag.tagClassContext, tag.tagFormatSimple, 3)
+            )
+        view = decoder.SequenceOfView(
+            ints2octs((163, 8, 48, 6, 2, 1, 1, 2, 1, 3)), s
+            )
+        assert list(view) == [1, 3]
+
+    def testBisect(self):
+        view = decoder.SequenceOfView(
+            ints2octs((48, 9, 2, 1, 1, 2, 1, 3, 2, 1, 5)), self.s
+            )
+        assert view.bisectLeft(3) == 1
+        assert view.bisectLeft(4) == 2
+        assert view.bisectLeft(5, key=int) == 2
+
+    def testIndexError(self):
+        view = decoder.SequenceOfView(ints2octs((48, 3, 2, 1, 1)), self.s)
+        try:
+            view[1]
+        except IndexError:
+            pass
+        else:
+            assert 0, 'out of range index tolerated'
+
+    def testTagMismatch(self):
+        try:
+            len(decoder.SequenceOfView(ints2octs((49, 3, 2, 1, 1)), self.s))
+        except PyAsn1Error:
+            pass
+        else:
+            assert 0, 'wrong tag tolerated'
+
+class DecodeJobTestCase(unittest.TestCase):
+    def setUp(self):
+        self.substrate = ints2octs((48, 128, 2, 1, 1, 48, 3, 2, 1, 2, 4, 1, 120, 0, 0, 5, 0))
+
+    def testItemsPerStep(self):
+        job = decoder.DecodeJob(self.substrate, itemsPerStep=2)
+        steps = 1
+        while not job.step():
+            steps = steps + 1
+        assert steps > 1
+        value, rest = job.getResult()
+        assert value == decoder.decode(self.substrate)[0]
+        assert rest == ints2octs((5, 0))
+
+    def testSingleStep(self):
+        job = decoder.DecodeJob(self.substrate)
+        assert job.step()
+        assert job.step()
+        assert job.getResult()[1] == ints2octs((5, 0))
+
+    def testDecodePlan(self):
+        plan = decoder.DecodePlan(
+            univ.SequenceOf(componentType=univ.Integer()), native=True
+            )
+        substrate = ints2octs((48, 9, 2, 1, 1, 2, 1, 2, 2, 1, 3, 5, 0))
+        job = decoder.DecodeJob(substrate, plan, itemsPerStep=2)
+        steps = 1
+        while not job.step():
+            steps = steps + 1
+        assert steps > 2
+        assert job.getResult() == ([1, 2, 3], ints2octs((5, 0)))
+
+    def testTimePerStep(self):
+        job = decoder.DecodeJob(self.substrate, timePerStep=60)
+        assert job.step()
+
+    def testNotDone(self):
+        job = decoder.DecodeJob(self.substrate, itemsPerStep=1)
+        assert not job.step()
+        assert not job.isDone()
+        try:
+            job.getResult()
+        except PyAsn1Error:
+            pass
+        else:
+            assert 0, 'incomplete result returned'
+
+class DeepNestingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.depth = getrecursionlimit() * 2
+
+    def testIndefMode(self):
+        s, rest = decoder.decode(
+            ints2octs((48, 128) * self.depth + (2, 1, 1) + (0, 0) * self.depth)
+            )
+        assert rest == null
+        depth = 0
+        while isinstance(s, univ.Sequence):
+            s = s[0]
+            depth = depth + 1
+        assert depth == self.depth
+        assert s == 1
+
+    def testTruncated(self):
+        try:
+            decoder.decode(
+                ints2octs((48, 128) * self.depth + (2, 1, 1) + (0, 0) * (self.depth - 1))
+                )
+        except PyAsn1Error:
+            pass
+        else:
+            assert 0, 'missing EOO tolerated'
+
+class DecoderLimitsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.decode = decoder.Decoder(
+            decoder.tagMap, decoder.typeMap, maxDepth=2, maxLength=8,
+            maxComponents=3, maxOidArcs=4
+            )
+
+    def __assertExceeded(self, substrate, asn1Spec=None, decodeFun=None):
+        try:
+            (decodeFun or self.decode)(ints2octs(substrate), asn1Spec)
+        except LimitExceededError:
+            pass
+        else:
+            assert 0, 'limit not enforced'
+
+    def testWithinLimits(self):
+        s, rest = self.decode(
+            ints2octs((48, 128, 48, 6, 2, 1, 1, 6, 1, 43, 0, 0))
+            )
+        assert rest == null
+        assert s[0][0] == 1
+        assert s[0][1] == (1, 3)
+
+    def testDepth(self):
+        self.__assertExceeded((48, 128, 48, 128, 48, 128, 0, 0, 0, 0, 0, 0))
+
+    def testLazyDepth(self):
+        decode = decoder.Decoder(
+            decoder.tagMap, decoder.typeMap, lazy=True, maxDepth=10
+            )
+        s, rest = decode(ints2octs((48, 128) * 10 + (2, 1, 1) + (0, 0) * 10))
+        for _ in range(9):
+            s = s[0]
+        assert s[0] == 1
+        s, rest = decode(ints2octs((48, 128) * 50 + (2, 1, 1) + (0, 0) * 50))
+        try:
+            for _ in range(50):
+                s = s[0]
+        except LimitExceededError:
+            pass
+        else:
+            assert 0, 'limit not enforced'
+
+    def testLength(self):
+        self.__assertExceeded((4, 9) + (0,) * 9)
+
+    def testLengthBeforeUnderrun(self):
+        self.__assertExceeded((4, 132, 127, 255, 255, 255))
+
+    def testSegmentsLength(self):
+        self.__assertExceeded(
+            (36, 128, 4, 5) + (0,) * 5 + (4, 5) + (0,) * 5 + (0, 0)
+            )
+
+    def testBitStringSegmentsLength(self):
+        self.__assertExceeded(
+            (35, 128, 3, 6, 0) + (0,) * 5 + (3, 6, 0) + (0,) * 5 + (0, 0)
+            )
+
+    def testComponents(self):
+        self.__assertExceeded((48, 128) + (5, 0) * 4 + (0, 0))
+
+    def testComponentsBeforeDecoding(self):
+        self.__assertExceeded((48, 128) + (2, 1, 1) * 3 + (2, 5, 1))
+
+    def testLazyComponents(self):
+        decode = decoder.Decoder(
+            decoder.tagMap, decoder.typeMap, lazy=True, maxComponents=3
+            )
+        self.__assertExceeded(
+            (48, 12) + (2, 1, 1) * 4,
+            univ.SequenceOf(componentType=univ.Integer()), decode
+            )
+
+    def testDeferredComponents(self):
+        spec = univ.SequenceOf(componentType=univ.Integer())
+        decode = decoder.Decoder(
+            decoder.tagMap, decoder.typeMap, deferred=(spec,), maxComponents=3
+            )
+        self.__assertExceeded((48, 12) + (2, 1, 1) * 4, spec, decode)
+
+    def testOidArcs(self):
+        self.__assertExceeded((6, 4, 43, 6, 1, 2))
+
+    def testDecodePlan(self):
+        plan = decoder.DecodePlan(
+            univ.SequenceOf(componentType=univ.Integer()), self.decode,
+            native=True
+            )
+        assert self.decode(ints2octs((48, 6) + (2, 1, 1) * 2), plan) == ([1, 1], null)
+        self.__assertExceeded((48, 128) + (2, 1, 1) * 4 + (0, 0), plan)
+        self.__assertExceeded((48, 9) + (2, 1, 1) * 3, plan)
+        self.__assertExceeded((48, 128) + (2, 1, 1) * 3 + (2, 5, 1), plan)
+
+class DecodePlanTestCase(unittest.TestCase):
+    def setUp(self):
+        c = univ.Choice(componentType=namedtype.NamedTypes(
+            namedtype.NamedType('number', univ.Integer()),
+            namedtype.NamedType('string', univ.OctetString())
+            ))
+        self.s = univ.Sequence(componentType=namedtype.NamedTypes(
+            namedtype.NamedType('id', univ.Integer()),
+            namedtype.OptionalNamedType('null', univ.Null()),
+            namedtype.DefaultedNamedType('flag', univ.Boolean(0)),
+            namedtype.NamedType('choice', c),
+            namedtype.NamedType('tagged', univ.OctetString().subtype(
+                explicitTag=tag.Tag(tag.tagClassContext, tag.tagFormatSimple, 3)
+                )),
+            namedtype.NamedType('list', univ.SequenceOf(
+                componentType=univ.Integer()
+                )),
+            namedtype.OptionalNamedType('any', univ.Any())
+            ))
+        self.plan = decoder.DecodePlan(self.s)
+        v = self.s.clone()
+        v.setComponentByName('id', 1)
+        v.setComponentByName('null', univ.Null(''))
+        v.setComponentByName('choice')
+        v.getComponentByName('choice').setComponentByName('string', 'abc')
+        v.setComponentByName('tagged', 'quick')
+        v.setComponentByName('list')
+        v.getComponentByName('list').setComponentByPosition(0, 1)
+        v.getComponentByName('list').setComponentByPosition(1, 2)
+        v.setComponentByName('any', encoder.encode(univ.Integer(3)))
+        self.v = v
+
+    def __check(self, substrate):
+        v, rest = decoder.decode(substrate + str2octs('x'), asn1Spec=self.plan)
+        assert rest == str2octs('x')
+        assert v == decoder.decode(substrate, asn1Spec=self.s)[0]
+        return v
+
+    def testDefMode(self):
+        substrate = encoder.encode(self.v)
+        v = self.__check(substrate)
+        assert encoder.encode(v) == substrate
+
+    def testIndefMode(self):
+        substrate = encoder.encode(self.v, defMode=False)
+        v = self.__check(substrate)
+        assert encoder.encode(v, defMode=False) == substrate
+
+    def testOptionalSkipped(self):
+        v = self.s.clone()
+        v.setComponentByName('id', 1)
+        v.setComponentByName('flag', 1)
+        v.setComponentByName('choice')
+        v.getComponentByName('choice').setComponentByName('number', 5)
+        v.setComponentByName('tagged', 'quick')
+        v.setComponentByName('list')
+        v = self.__check(encoder.encode(v))
+        assert v.getComponentByName('null') is None
+        assert v.getComponentByName('flag') == 1
+
+    def testSet(self):
+        s = univ.Set(componentType=namedtype.NamedTypes(
+            namedtype.NamedType('number', univ.Integer()),
+            namedtype.OptionalNamedType('string', univ.OctetString())
+            ))
+        v = s.clone()
+        v.setComponentByName('number', 1)
+        v.setComponentByName('string', 'abc')
+        substrate = ints2octs((49, 8, 4, 3, 97, 98, 99, 2, 1, 1))
+        assert decoder.decode(
+            substrate, asn1Spec=decoder.DecodePlan(s)
+            ) == (v, null)
+
+    def testUnknownTag(self):
+        try:
+            decoder.decode(ints2octs((48, 3, 1, 1, 1)), asn1Spec=self.plan)
+        except PyAsn1Error:
+            pass
+        else:
+            assert 0, 'unknown tag tolerated'
+
+    def testTruncated(self):
+        try:
+            decoder.decode(
+                encoder.encode(self.v, defMode=False)[:-2], asn1Spec=self.plan
+                )
+        except PyAsn1Error:
+            pass
+        else:
+            assert 0, 'missing EOO tolerated'
+
+    def testAmbiguousSpec(self):
+        try:
+            decoder.DecodePlan(univ.Sequence(componentType=namedtype.NamedTypes(
+                namedtype.OptionalNamedType('first', univ.Integer()),
+                namedtype.NamedType('second', univ.Integer())
+                )))
+        except PyAsn1Error:
+            pass
+        else:
+            assert 0, 'ambiguous spec tolerated'
+
+class NativeDecodePlanTestCase(unittest.TestCase):
+    def setUp(self):
+        self.c = univ.Choice(componentType=namedtype.NamedTypes(
+            namedtype.NamedType('number', univ.Integer()),
+            namedtype.NamedType('string', univ.OctetString())
+            ))
+        self.s = univ.Sequence(componentType=namedtype.NamedTypes(
+            namedtype.NamedType('id', univ.Integer()),
+            namedtype.OptionalNamedType('null', univ.Null()),
+            namedtype.DefaultedNamedType('flag', univ.Boolean(0)),
+            namedtype.NamedType('choice', self.c),
+            namedtype.NamedType('oid', univ.ObjectIdentifier()),
+            namedtype.NamedType('list', univ.SequenceOf(
+                componentType=univ.OctetString()
+                ))
+            ))
+        self.plan = decoder.DecodePlan(self.s, native=True)
+        v = self.s.clone()
+        v.setComponentByName('id', 1)
+        v.setComponentByName('null', univ.Null(''))
+        v.setComponentByName('choice')
+        v.getComponentByName('choice').setComponentByName('string', 'abc')
+        v.setComponentByName('oid', (1, 3, 6))
+        v.setComponentByName('list')
+        v.getComponentByName('list').setComponentByPosition(0, 'x')
+        v.getComponentByName('list').setComponentByPosition(1, 'y')
+        self.v = v
+        self.native = {
+            'id': 1, 'null': None, 'flag': False,
+            'choice': { 'string': str2octs('abc') }, 'oid': (1, 3, 6),
+            'list': [ str2octs('x'), str2octs('y') ]
+            }
+
+    def testDefMode(self):
+        assert decoder.decode(
+            encoder.encode(self.v), asn1Spec=self.plan
+            ) == (self.native, null)
+
+    def testIndefMode(self):
+        assert decoder.decode(
+            encoder.encode(self.v, defMode=False), asn1Spec=self.plan
+            ) == (self.native, null)
+
+    def testSegmentedString(self):
+        assert decoder.decode(
+            ints2octs((36, 128, 4, 2, 97, 98, 36, 3, 4, 1, 99, 0, 0)),
+            asn1Spec=decoder.DecodePlan(univ.OctetString(), native=True)
+            ) == (str2octs('abc'), null)
+
+    def testFactories(self):
+        plan = decoder.DecodePlan(
+            self.s, native=True, factories={
+                univ.Sequence: lambda **kwargs: sorted(kwargs.keys()),
+                univ.SequenceOf: tuple
+                }
+            )
+        assert decoder.decode(encoder.encode(self.v), asn1Spec=plan)[0] == [
+            'choice', 'flag', 'id', 'list', 'null', 'oid'
+            ]
+        plan = decoder.DecodePlan(
+            self.s.getComponentType().getTypeByPosition(5), native=True,
+            factories={univ.SequenceOf: tuple}
+            )
+        assert decoder.decode(
+            encoder.encode(self.v['list']), asn1Spec=plan
+            )[0] == (str2octs('x'), str2octs('y'))
+
+    def testMissingComponent(self):
+        try:
+            decoder.decode(ints2octs((48, 3, 2, 1, 1)), asn1Spec=self.plan)
+        except PyAsn1Error:
+            pass
+        else:
+            assert 0, 'missing mandatory component tolerated'
+
 class EndOfOctetsTestCase(unittest.TestCase):
     def testUnexpectedEoo(self):
         try:
@@ -1,6 +1,6 @@
 from pyasn1.type import tag, namedtype, univ
 from pyasn1.codec.ber import encoder
-from pyasn1.compat.octets import ints2octs
+from pyasn1.compat.octets import ints2octs, str2octs, joinOcts
 from pyasn1.error import PyAsn1Error
 from sys import version_info
 if version_info[0:2] < (2, 7) or \
@@ -467,4 +467,175 @@ class AnyEncoderTestCase(unittest.TestCase):
             )
         assert encoder.encode(s) == ints2octs((132, 5, 4, 3, 102, 111, 120))
                     
+class EncodeIntoTestCase(unittest.TestCase):
+    def setUp(self):
+        self.s = univ.SequenceOf(componentType=univ.OctetString())
+        self.s.setComponentByPosition(0, 'quick brown')
+        self.s.setComponentByPosition(1, 'fox')
+
+    def testBuffer(self):
+        buffer = bytearray(ints2octs((1,) * 24))
+        assert encoder.encode.encodeInto(self.s, buffer, 2) == 22
+        assert bytes(buffer[:22]) == ints2octs((1, 1)) + encoder.encode(self.s)
+        assert bytes(buffer[22:]) == ints2octs((1, 1))
+
+    def testIndefMode(self):
+        buffer = bytearray(22)
+        assert encoder.encode.encodeInto(self.s, buffer, defMode=False) == 22
+        assert bytes(buffer) == encoder.encode(self.s, defMode=False)
+
+    def testShortBuffer(self):
+        try:
+            encoder.encode.encodeInto(self.s, bytearray(24), 5)
+        except PyAsn1Error:
+            pass
+        else:
+            assert 0, 'buffer overflow tolerated'
+
+    def testLargeSequenceOf(self):
+        for idx in range(2, 1000):
+            self.s.setComponentByPosition(idx, 'x')
+        assert encoder.encode(self.s) == ints2octs((48, 130, 11, 196, 4, 11) + (113, 117, 105, 99, 107, 32, 98, 114, 111, 119, 110) + (4, 3, 102, 111, 120) + (4, 1, 120) * 998)
+
+class EncodeSegmentsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.o = str2octs('quick brown fox')
+        self.s = univ.SequenceOf(componentType=univ.OctetString())
+        self.s.setComponentByPosition(0, self.o)
+
+    def testDefMode(self):
+        segments = encoder.encode.encodeSegments(self.s)
+        assert joinOcts(segments) == encoder.encode(self.s)
+        assert [ x for x in segments if x is self.o ]
+
+    def testChunkedMode(self):
+        segments = encoder.encode.encodeSegments(self.s, maxChunkSize=4)
+        assert joinOcts(segments) == encoder.encode(self.s, maxChunkSize=4)
+
+class NativeEncoderTestCase(unittest.TestCase):
+    def setUp(self):
+        c = univ.Choice(componentType=namedtype.NamedTypes(
+            namedtype.NamedType('number', univ.Integer()),
+            namedtype.NamedType('string', univ.OctetString())
+            ))
+        self.s = univ.Sequence(componentType=namedtype.NamedTypes(
+            namedtype.NamedType('id', univ.Integer()),
+            namedtype.OptionalNamedType('null', univ.Null()),
+            namedtype.DefaultedNamedType('flag', univ.Boolean(0)),
+            namedtype.NamedType('choice', c),
+            namedtype.NamedType('oid', univ.ObjectIdentifier().subtype(
+                explicitTag=tag.Tag(tag.tagClassContext, tag.tagFormatSimple, 4)
+                )),
+            namedtype.NamedType('list', univ.SequenceOf(
+                componentType=univ.OctetString()
+                ))
+            ))
+        v = self.s.clone()
+        v.setComponentByName('id', 1)
+        v.setComponentByName('null', univ.Null(''))
+        v.setComponentByName('choice')
+        v.getComponentByName('choice').setComponentByName('string', 'abc')
+        v.setComponentByName('oid', (1, 3, 6))
+        v.setComponentByName('list')
+        v.getComponentByName('list').setComponentByPosition(0, 'x')
+        v.getComponentByName('list').setComponentByPosition(1, 'y')
+        self.v = v
+        self.native = {
+            'id': 1, 'null': None, 'flag': False,
+            'choice': { 'string': str2octs('abc') }, 'oid': (1, 3, 6),
+            'list': [ str2octs('x'), str2octs('y') ]
+            }
+
+    def testDefMode(self):
+        assert encoder.encode(
+            self.native, asn1Spec=self.s
+            ) == encoder.encode(self.v)
+
+    def testIndefMode(self):
+        assert encoder.encode(
+            self.native, defMode=False, asn1Spec=self.s
+            ) == encoder.encode(self.v, defMode=False)
+
+    def testOptionalSkipped(self):
+        del self.native['null']
+        assert encoder.encode(
+            self.native, asn1Spec=self.s
+            ) == ints2octs((48, 22, 2, 1, 1, 4, 3, 97, 98, 99, 164, 4, 6, 2, 43, 6, 48, 6, 4, 1, 120, 4, 1, 121))
+
+    def testChunkedMode(self):
+        assert encoder.encode(
+            str2octs('abcdefgh'), defMode=False, maxChunkSize=3,
+            asn1Spec=univ.OctetString()
+            ) == ints2octs((36, 128, 4, 3, 97, 98, 99, 4, 3, 100, 101, 102, 4, 2, 103, 104, 0, 0))
+
+    def testImplicitTaggedChunkedMode(self):
+        o = univ.OctetString().subtype(
+            implicitTag=tag.Tag(tag.tagClassContext, tag.tagFormatSimple, 1)
+            )
+        substrate = encoder.encode(
+            str2octs('abcdefgh'), defMode=False, maxChunkSize=3, asn1Spec=o
+            )
+        assert substrate == ints2octs((161, 128, 4, 3, 97, 98, 99, 4, 3, 100, 101, 102, 4, 2, 103, 104, 0, 0))
+        assert substrate == encoder.encode(
+            o.clone('abcdefgh'), defMode=False, maxChunkSize=3
+            )
+        assert joinOcts(encoder.encode.encodeSegments(
+            o.clone('abcdefgh'), defMode=False, maxChunkSize=3
+            )) == substrate
+        b = univ.BitString().subtype(
+            implicitTag=tag.Tag(tag.tagClassContext, tag.tagFormatSimple, 2)
+            )
+        assert encoder.encode(
+            (1, 0) * 10, maxChunkSize=1, asn1Spec=b
+            ) == encoder.encode(b.clone((1, 0) * 10), maxChunkSize=1)
+
+    def testMixed(self):
+        self.native['id'] = univ.Integer(1)
+        assert encoder.encode(
+            self.native, asn1Spec=self.s
+            ) == encoder.encode(self.v)
+
+    def testMissingComponent(self):
+        del self.native['id']
+        try:
+            encoder.encode(self.native, asn1Spec=self.s)
+        except PyAsn1Error:
+            pass
+        else:
+            assert 0, 'missing mandatory component tolerated'
+
+class ComponentSourceTestCase(unittest.TestCase):
+    def setUp(self):
+        class Source:
+            def __iter__(self):
+                for x in range(3):
+                    yield x
+        self.source = Source()
+        self.s = univ.SequenceOf(componentType=univ.Integer())
+
+    def testDefMode(self):
+        assert encoder.encode(
+            self.s.clone().setComponentSource(self.source)
+            ) == ints2octs((48, 9, 2, 1, 0, 2, 1, 1, 2, 1, 2))
+
+    def testIndefMode(self):
+        assert encoder.encode(
+            self.s.clone().setComponentSource(iter(range(3))), defMode=False
+            ) == ints2octs((48, 128, 2, 1, 0, 2, 1, 1, 2, 1, 2, 0, 0))
+
+    def testDefModeIterator(self):
+        assert encoder.encode(
+            iter(range(3)), asn1Spec=self.s
+            ) == ints2octs((48, 9, 2, 1, 0, 2, 1, 1, 2, 1, 2))
+
+    def testEncodeStream(self):
+        chunks = []
+        class Writer:
+            def write(self, chunk):
+                chunks.append(chunk)
+        assert encoder.encode.encodeStream(
+            self.s.clone().setComponentSource(self.source), Writer()
+            ) == 11
+        assert joinOcts(chunks) == ints2octs((48, 9, 2, 1, 0, 2, 1, 1, 2, 1, 2))
+
 if __name__ == '__main__': unittest.main()
@@ -0,0 +1,85 @@
+from pyasn1.type import univ
+from pyasn1.codec.ber import index
+from pyasn1.compat.octets import ints2octs
+from pyasn1.error import PyAsn1Error
+from sys import version_info
+import io
+if version_info[0:2] < (2, 7) or \
+   version_info[0:2] in ( (3, 0), (3, 1) ):
+    try:
+        import unittest2 as unittest
+    except ImportError:
+        import unittest
+else:
+    import unittest
+
+class IndexTestCase(unittest.TestCase):
+    def setUp(self):
+        # definite and indefinite length SEQUENCE OF INTEGER
+        self.substrate = ints2octs((48, 6, 2, 1, 1, 2, 1, 2, 48, 128, 2, 1, 3, 0, 0))
+
+    def testTopLevel(self):
+        i = index.buildIndex(self.substrate)
+        assert len(i) == 2
+        assert i[1] == ((1,), univ.SequenceOf.tagSet[0], 8, 2, -1, 7)
+
+    def testDepth(self):
+        i = index.buildIndex(self.substrate, 2)
+        assert len(i) == 5
+        assert i[0] == ((0,), univ.SequenceOf.tagSet[0], 0, 2, 6, 8)
+        assert i[2] == ((0, 1), univ.Integer.tagSet[0], 5, 2, 1, 3)
+        assert i[-1] == ((1, 0), univ.Integer.tagSet[0], 10, 2, 1, 3)
+
+    def testFind(self):
+        i = index.buildIndex(self.substrate, 2)
+        assert i.find((0, 1)) == 2
+        assert i.find((1,)) == 3
+        try:
+            i.find((1, 1))
+        except KeyError:
+            pass
+        else:
+            assert 0, 'missing path found'
+
+    def testSaveLoad(self):
+        f = io.BytesIO()
+        index.buildIndex(self.substrate, 2).save(f)
+        f.seek(0)
+        i = index.loadIndex(f)
+        assert len(i) == 5
+        assert i.maxDepth == 2
+        assert i[4][0] == (1, 0)
+
+    def testDecodeItem(self):
+        i = index.buildIndex(self.substrate, 2)
+        f = io.BytesIO(self.substrate)
+        assert i.readItem(f, (1,)) == ints2octs((48, 128, 2, 1, 3, 0, 0))
+        assert i.decodeItem(f, (0, 1)) == 2
+
+    def testOverrun(self):
+        try:
+            index.buildIndex(ints2octs((48, 2, 2, 1, 1)), 2)
+        except PyAsn1Error:
+            pass
+        else:
+            assert 0, 'component overrun tolerated'
+
+    def testLargeTagId(self):
+        # tag ID of 2**32
+        try:
+            index.buildIndex(ints2octs((31, 144, 128, 128, 128, 0, 0)))
+        except PyAsn1Error:
+            pass
+        else:
+            assert 0, 'oversized tag ID tolerated'
+        assert len(index.buildIndex(ints2octs((31, 143, 255, 255, 255, 127, 0)))) == 1
+
+    def testBadIndex(self):
+        try:
+            index.Index(ints2octs((0,) * 9))
+        except PyAsn1Error:
+            pass
+        else:
+            assert 0, 'bad index magic tolerated'
+
+if __name__ == '__main__': unittest.main()
@@ -0,0 +1,168 @@
+from pyasn1.type import namedtype, univ
+from pyasn1.codec.ber import parallel, encoder, decoder
+from pyasn1.codec.der import encoder as der_encoder
+from pyasn1.compat.octets import ints2octs, str2octs
+from pyasn1.error import PyAsn1Error
+from sys import version_info
+if version_info[0:2] < (2, 7) or \
+   version_info[0:2] in ( (3, 0), (3, 1) ):
+    try:
+        import unittest2 as unittest
+    except ImportError:
+        import unittest
+else:
+    import unittest
+
+class DecodeManyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.s = univ.Sequence(componentType=namedtype.NamedTypes(
+            namedtype.NamedType('id', univ.Integer()),
+            namedtype.NamedType('name', univ.OctetString())
+            ))
+        self.blobs = [
+            encoder.encode({'id': x, 'name': str2octs('n%d' % x)}, asn1Spec=self.s)
+            for x in range(10)
+            ]
+        self.blobs[3] = ints2octs((48, 3, 2))
+        self.blobs[5] = self.blobs[5] + ints2octs((0,))
+
+    def _check(self, values):
+        assert len(values) == 10
+        assert isinstance(values[3], PyAsn1Error)
+        assert isinstance(values[5], PyAsn1Error)
+
+    def testInProcess(self):
+        values = list(
+            parallel.decodeMany(self.blobs, self.s, workers=1)
+            )
+        self._check(values)
+        assert values[9]['id'] == 9
+        assert values[9]['name'] == str2octs('n9')
+
+    def testWorkers(self):
+        values = list(
+            parallel.decodeMany(self.blobs, self.s, workers=2, chunksize=3)
+            )
+        self._check(values)
+        assert values[0]['id'] == 0
+        assert values[9]['name'] == str2octs('n9')
+
+    def testNative(self):
+        values = list(
+            parallel.decodeMany(self.blobs, self.s, workers=2, native=True)
+            )
+        self._check(values)
+        assert values[9] == {'id': 9, 'name': str2octs('n9')}
+
+    def testNativeBadSpec(self):
+        s = univ.Sequence(componentType=namedtype.NamedTypes(
+            namedtype.OptionalNamedType('id', univ.Integer()),
+            namedtype.NamedType('num', univ.Integer())
+            ))
+        try:
+            parallel.decodeMany(self.blobs, s, workers=2, native=True)
+        except PyAsn1Error:
+            pass
+        else:
+            assert 0, 'bad spec tolerated'
+
+    def testLazy(self):
+        try:
+            parallel.decodeMany(
+                self.blobs, self.s, workers=2,
+                decodeFun=decoder.Decoder(decoder.tagMap, decoder.typeMap, lazy=True)
+                )
+        except PyAsn1Error:
+            pass
+        else:
+            assert 0, 'lazy decoder tolerated'
+
+class ParallelDecoderTestCase(unittest.TestCase):
+    def setUp(self):
+        self.s = univ.SequenceOf(
+            componentType=univ.SequenceOf(componentType=univ.Integer())
+            )
+        self.substrate = encoder.encode(
+            [ [x, x + 1] for x in range(7) ], asn1Spec=self.s
+            )
+        self.decode = decoder.Decoder(
+            decoder.tagMap, decoder.typeMap, workers=2, parallelThreshold=3
+            )
+
+    def testWithSpec(self):
+        s, rest = self.decode(self.substrate, asn1Spec=self.s)
+        assert not rest
+        assert s == decoder.decode(self.substrate, asn1Spec=self.s)[0]
+        assert s[6][1] == 7
+
+    def testSpecless(self):
+        s, rest = self.decode(self.substrate)
+        assert not rest
+        assert s == decoder.decode(self.substrate)[0]
+
+    def testBelowThreshold(self):
+        s, rest = self.decode(ints2octs((48, 8, 48, 6, 2, 1, 1, 2, 1, 2)))
+        assert s[0] == [1, 2]
+
+    def testShortNotScanned(self):
+        valueDecoder = decoder.typeMap[univ.SequenceOf.typeId]
+        scans = []
+        def getComponentsBounds(*args):
+            scans.append(args)
+            return valueDecoder.__class__._getComponentsBounds(valueDecoder, *args)
+        valueDecoder._getComponentsBounds = getComponentsBounds
+        try:
+            s, rest = self.decode(
+                ints2octs((48, 5, 48, 3, 2, 1, 1)), asn1Spec=self.s
+                )
+        finally:
+            del valueDecoder._getComponentsBounds
+        assert s[0] == [1]
+        assert not scans
+
+class ParallelEncoderTestCase(unittest.TestCase):
+    def setUp(self):
+        self.s = univ.SequenceOf(componentType=univ.Integer())
+        self.encode = encoder.Encoder(
+            encoder.tagMap, encoder.typeMap, workers=2, parallelThreshold=3
+            )
+
+    def testSequenceOf(self):
+        s = self.s.clone()
+        for x in range(7):
+            s[x] = x
+        assert self.encode(s) == encoder.encode(s)
+        assert self.encode(s, defMode=False) == encoder.encode(s, defMode=False)
+
+    def testNative(self):
+        assert self.encode(
+            list(range(7)), asn1Spec=self.s
+            ) == encoder.encode(list(range(7)), asn1Spec=self.s)
+
+    def testDerSetOf(self):
+        encode = der_encoder.Encoder(
+            der_encoder.tagMap, der_encoder.typeMap, workers=2,
+            parallelThreshold=3
+            )
+        s = univ.SetOf(componentType=univ.Integer())
+        for x in range(7):
+            s[x] = 300 - x * 40
+        assert encode(s) == der_encoder.encode(s)
+        assert encode(
+            [3, 300, 1, 7], asn1Spec=s
+            ) == ints2octs((49, 13, 2, 1, 1, 2, 1, 3, 2, 1, 7, 2, 2, 1, 44))
+
+    def testDerSetOfGenerator(self):
+        encode = der_encoder.Encoder(
+            der_encoder.tagMap, der_encoder.typeMap, workers=2,
+            parallelThreshold=3
+            )
+        s = univ.SetOf(componentType=univ.Integer())
+        assert encode(
+            (x for x in [3, 300, 1, 7]), asn1Spec=s
+            ) == ints2octs((49, 13, 2, 1, 1, 2, 1, 3, 2, 1, 7, 2, 2, 1, 44))
+        assert encode(
+            iter([3, 1]), asn1Spec=s
+            ) == ints2octs((49, 6, 2, 1, 1, 2, 1, 3))
+
+if __name__ == '__main__': unittest.main()
@@ -1,5 +1,6 @@
 from pyasn1.type import univ
 from pyasn1.codec.cer import decoder
+from pyasn1.codec.ber import decoder as ber_decoder
 from pyasn1.compat.octets import ints2octs, str2octs, null
 from pyasn1.error import PyAsn1Error
 from sys import version_info
@@ -17,6 +18,23 @@ class BooleanDecoderTestCase(unittest.TestCase):
         assert decoder.decode(ints2octs((1, 1, 255))) == (1, null)
     def testFalse(self):
         assert decoder.decode(ints2octs((1, 1, 0))) == (0, null)
+    def testBerTrue(self):
+        try:
+            decoder.decode(ints2octs((1, 1, 1)))
+        except PyAsn1Error:
+            pass
+        else:
+            assert 0, 'BER TRUE tolerated'
+    def testNative(self):
+        plan = ber_decoder.DecodePlan(univ.Boolean(), decoder.decode, native=True)
+        assert decoder.decode(ints2octs((1, 1, 255)), asn1Spec=plan) == (True, null)
+        assert decoder.decode(ints2octs((1, 1, 0)), asn1Spec=plan) == (False, null)
+        try:
+            decoder.decode(ints2octs((1, 1, 1)), asn1Spec=plan)
+        except PyAsn1Error:
+            pass
+        else:
+            assert 0, 'BER TRUE tolerated'
         
 class OctetStringDecoderTestCase(unittest.TestCase):
     def testShortMode(self):
@@ -1,8 +1,10 @@
 from pyasn1.type import namedtype, univ
+from pyasn1.codec.ber import decoder
 from pyasn1.codec.cer import encoder
-from pyasn1.compat.octets import ints2octs
+from pyasn1.compat.octets import ints2octs, str2octs
 from pyasn1.error import PyAsn1Error
 from sys import version_info
+import io
 if version_info[0:2] < (2, 7) or \
    version_info[0:2] in ( (3, 0), (3, 1) ):
     try:
@@ -104,4 +106,91 @@ class SetWithChoiceEncoderTestCase(unittest.TestCase):
         self.s.getComponentByName('status').setComponentByPosition(0, 1)
         assert encoder.encode(self.s) == ints2octs((49, 128, 1, 1, 255, 5, 0, 0, 0))
 
+class NativeSetEncoderTestCase(unittest.TestCase):
+    def setUp(self):
+        self.s = univ.Set(componentType=namedtype.NamedTypes(
+            namedtype.NamedType('place-holder', univ.Null('')),
+            namedtype.OptionalNamedType('first-name', univ.OctetString('')),
+            namedtype.DefaultedNamedType('age', univ.Integer(33)),
+            ))
+
+    def testWithOptionalAndDefaulted(self):
+        assert encoder.encode(
+            {'age': 1, 'first-name': str2octs('quick brown'), 'place-holder': None},
+            asn1Spec=self.s
+            ) == ints2octs((49, 128, 2, 1, 1, 4, 11, 113, 117, 105, 99, 107, 32, 98, 114, 111, 119, 110, 5, 0, 0, 0))
+
+    def testDefaulted(self):
+        assert encoder.encode(
+            {'age': 33, 'place-holder': None}, asn1Spec=self.s
+            ) == ints2octs((49, 128, 5, 0, 0, 0))
+
+    def testSetOf(self):
+        assert encoder.encode(
+            [str2octs('b'), str2octs('a')],
+            asn1Spec=univ.SetOf(componentType=univ.OctetString())
+            ) == ints2octs((49, 128, 4, 1, 97, 4, 1, 98, 0, 0))
+
+class StreamEncoderTestCase(unittest.TestCase):
+    def setUp(self):
+        self.s = univ.Sequence(componentType=namedtype.NamedTypes(
+            namedtype.NamedType('id', univ.Integer()),
+            namedtype.NamedType('blob', univ.OctetString()),
+            ))
+        self.data = ints2octs(range(256)) * 10
+
+    def testFileObject(self):
+        out = io.BytesIO()
+        size = encoder.encode.encodeStream(
+            {'id': 1, 'blob': io.BytesIO(self.data)}, out, asn1Spec=self.s
+            )
+        assert out.getvalue() == encoder.encode(
+            {'id': 1, 'blob': self.data}, asn1Spec=self.s
+            )
+        assert size == len(out.getvalue())
+
+    def testIterator(self):
+        out = io.BytesIO()
+        encoder.encode.encodeStream(
+            {'id': 1, 'blob': iter([self.data[:7], self.data[7:1500], self.data[1500:]])},
+            out, asn1Spec=self.s
+            )
+        assert out.getvalue() == encoder.encode(
+            {'id': 1, 'blob': self.data}, asn1Spec=self.s
+            )
+
+    def testBitString(self):
+        substrate = encoder.encode(
+            iter([self.data]), asn1Spec=univ.BitString()
+            )
+        value, rest = decoder.decode(substrate, asn1Spec=univ.BitString())
+        assert not rest
+        assert len(value) == len(self.data) * 8
+        assert value[:16] == univ.BitString((0,)*15 + (1,))
+
+    def testShortPayload(self):
+        for data in (self.data[:0], self.data[:5], self.data[:1000],
+                     self.data[:1001]):
+            assert encoder.encode(
+                io.BytesIO(data), asn1Spec=univ.OctetString()
+                ) == encoder.encode(univ.OctetString(data)), 'form mismatch'
+            assert encoder.encode(
+                iter([data[:3], data[3:]]), asn1Spec=univ.OctetString()
+                ) == encoder.encode(univ.OctetString(data)), 'form mismatch'
+
+    def testShortBitString(self):
+        assert encoder.encode(
+            iter([self.data[:5]]), asn1Spec=univ.BitString()
+            ) == encoder.encode(univ.BitString("'0001020304'H"))
+
+    def testDefMode(self):
+        try:
+            encoder.encode(
+                io.BytesIO(self.data), defMode=1, asn1Spec=univ.OctetString()
+                )
+        except PyAsn1Error:
+            pass
+        else:
+            assert 0, 'streamed value encoded in definite length mode'
+
 if __name__ == '__main__': unittest.main()
@@ -1,5 +1,7 @@
 from pyasn1.type import univ
 from pyasn1.codec.der import decoder
+from pyasn1.codec.ber import decoder as ber_decoder
+from pyasn1.compat.octets import ints2octs, null
 from pyasn1.error import PyAsn1Error
 from sys import version_info
 if version_info[0:2] < (2, 7) or \
@@ -11,6 +13,13 @@ if version_info[0:2] < (2, 7) or \
 else:
     import unittest
 
+class BooleanDecoderTestCase(unittest.TestCase):
+    def testNative(self):
+        plan = ber_decoder.DecodePlan(univ.Boolean(), decoder.decode, native=True)
+        assert decoder.decode(
+            ints2octs((1, 1, 255)), asn1Spec=plan
+            ) == (True, null)
+
 class OctetStringDecoderTestCase(unittest.TestCase):
     def testShortMode(self):
         assert decoder.decode(
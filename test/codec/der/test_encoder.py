@@ -41,4 +41,12 @@ class SetWithChoiceEncoderTestCase(unittest.TestCase):
         self.s.getComponentByName('status').setComponentByPosition(0, 'ann')
         assert encoder.encode(self.s) == ints2octs((49, 7, 4, 3, 97, 110, 110, 5, 0))
 
+class SetOfComponentSourceTestCase(unittest.TestCase):
+    def testSorted(self):
+        assert encoder.encode(
+            univ.SetOf(componentType=univ.Integer()).setComponentSource(
+                [3, 1, univ.Integer(2)]
+                )
+            ) == ints2octs((49, 9, 2, 1, 1, 2, 1, 2, 2, 1, 3))
+
 if __name__ == '__main__': unittest.main()
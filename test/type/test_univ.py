@@ -1,8 +1,8 @@
-from pyasn1.type import univ, tag, constraint, namedtype, namedval, error
+from pyasn1.type import univ, tag, constraint, namedtype, namedval, base, error
 from pyasn1.compat.octets import str2octs, ints2octs
 from pyasn1.error import PyAsn1Error
 from sys import version_info
-import math
+import math, pickle
 if version_info[0:2] < (2, 7) or \
    version_info[0:2] in ( (3, 0), (3, 1) ):
     try:
@@ -121,6 +121,42 @@ class BitStringTestCase(unittest.TestCase):
         assert self.b.clone("'A98A'H")[0] == 1
         assert self.b.clone("'A98A'H")[1] == 0
         assert self.b.clone("'A98A'H")[2] == 1
+        assert tuple(self.b.clone("'A9'H")) == (1,0,1,0,1,0,0,1)
+    def testSlice(self):
+        assert self.b.clone("'A98A'H")[3:9] == (0,1,0,0,1,1)
+        assert self.b.clone("'A98A'H")[-2:] == (1,0)
+        assert self.b.clone("'A98A'H")[::4] == (1,1,1,1)
+        assert self.b.clone("'A98A'H")[9:3] == ()
+    def testAdd(self):
+        assert self.b.clone('Urgent') + (1,0) == (0,1,1,0)
+        assert (1,0) + self.b.clone('Urgent') == (1,0,0,1)
+        assert self.b.clone((1,)) * 3 == (1,1,1)
+    def testCmp(self):
+        assert self.b.clone((0,1)) < (1,)
+        assert self.b.clone((1,0)) > (1,)
+        assert self.b.clone((1,0)) >= self.b.clone((1,0))
+        assert self.b.clone((1,0)) != (1,0,0)
+    def testHash(self):
+        assert hash(self.b.clone((1,0,1))) == hash((1,0,1))
+    def testPacked(self):
+        assert self.b.clone("'1010100110'B").asInteger() == 678
+        assert self.b.clone("'1010100110'B").asOctets() == ints2octs((169, 128))
+        assert self.b.clone(univ.PackedBits(678, 10)) == self.b.clone("'1010100110'B")
+    def testNonBinary(self):
+        try:
+            self.b.clone((1,2))
+        except PyAsn1Error:
+            pass
+        else:
+            assert 0, 'non-binary BitString initializer tolerated'
+    def testNonHexadecimal(self):
+        for v in ("'0xA9'H", "'A_9'H", "' A9'H", "'a9\\n'H", "'-A9'H"):
+            try:
+                self.b.clone(v)
+            except PyAsn1Error:
+                pass
+            else:
+                assert 0, 'non-hexadecimal BitString initializer %s tolerated' % v
         
 class OctetStringTestCase(unittest.TestCase):
     def testInit(self):
@@ -170,6 +206,43 @@ class OctetStringTestCase(unittest.TestCase):
             tag.Tag(tag.tagClassUniversal, tag.tagFormatSimple, 0x04)
             )
 
+class OctetStringViewTestCase(unittest.TestCase):
+    def setUp(self):
+        self.s = univ.OctetString(memoryview(str2octs('quick brown fox')))
+
+    def testInit(self):
+        assert self.s == str2octs('quick brown fox'), '__init__() fails'
+    def testAsOctets(self):
+        assert self.s.asOctets() == str2octs('quick brown fox'), 'asOctets() fails'
+    def testStr(self):
+        assert str(self.s) == 'quick brown fox', '__str__() fails'
+    def testHash(self):
+        assert hash(self.s) == hash(univ.OctetString('quick brown fox')), '__hash__() fails'
+    def testLen(self):
+        assert len(self.s) == 15, '__len__() fails'
+    def testSlice(self):
+        assert self.s[6:11] == str2octs('brown'), '__getitem__() fails'
+    def testCmp(self):
+        assert self.s < str2octs('zzz') and self.s > univ.OctetString('abc'), 'cmp fails'
+    def testAdd(self):
+        assert self.s + '!' == str2octs('quick brown fox!'), '__add__() fails'
+    def testRepr(self):
+        assert eval(repr(self.s), { 'OctetString': univ.OctetString}) == self.s, 'repr() fails'
+    def testAsBuffer(self):
+        assert isinstance(self.s.asBuffer(), memoryview), 'asBuffer() fails'
+    def testSliceView(self):
+        s = univ.OctetString('quick brown fox')[6:11]
+        assert isinstance(s.asBuffer(), memoryview), 'slice copied'
+        assert s == str2octs('brown'), 'slice fails'
+        assert hash(s) == hash(univ.OctetString('brown')), 'slice hash fails'
+        assert univ.OctetString('quick brown fox')[::6] == str2octs('qbf'), 'step slice fails'
+    def testWritableBufferHash(self):
+        s = univ.OctetString(memoryview(bytearray(str2octs('quick brown fox'))))
+        assert hash(s) == hash(univ.OctetString('quick brown fox')), '__hash__() fails'
+    def testPickle(self):
+        s = pickle.loads(pickle.dumps(self.s))
+        assert isinstance(s.asBuffer(), bytes) and s == self.s, 'pickle fails'
+
 class Null(unittest.TestCase):
     def testStr(self): assert str(univ.Null('')) == '', 'str() fails'
     def testRepr(self):
@@ -481,6 +554,11 @@ class Sequence(unittest.TestCase):
     def testSetComponents(self):
         assert self.s1.clone().setComponents(name='a', nick='b', age=1) == \
             self.s1.setComponentByPosition(0, 'a').setComponentByPosition(1, 'b').setComponentByPosition(2, 1)
+    def testPickleSpec(self):
+        s = pickle.loads(pickle.dumps(self.s1))
+        assert s.isSameTypeWith(self.s1), 'spec pickle fails'
+        assert s.getComponentType().getTypeByPosition(0)._value == str2octs(''), 'spec pickle fails'
+        assert pickle.loads(pickle.dumps(univ.Integer()))._value is base.noValue, 'noValue pickle fails'
 
 class SetOf(unittest.TestCase):
     def setUp(self):